@@ -1,35 +1,71 @@
+import io
+import os
+import sys
 import streamlit as st
-import numpy as np
-import tensorflow as tf
 from PIL import Image
 
-# Load the trained model
-model = tf.keras.models.load_model("cnn_model.keras")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:  # model_registry.py lives one level up
+    sys.path.append(REPO_ROOT)
+from model_registry import model_metrics
+
+from batch_classify import CLASS_NAMES, classify_stream, load_model, iter_zip_bytes, registry_name
+from calibration import CalibratedModel, load_temperature
+
+# Load the trained model (once per process, warmed up with a blank image).
+# CNN_RUNTIME=tflite / tflite-int8 / onnx serves an export from export_model.py without TensorFlow.
+runtime = os.getenv("CNN_RUNTIME", "keras")
+model = load_model(runtime=runtime)
 
 # CIFAR-10 class labels
-class_names = ['airplane', 'automobile', 'bird', 'cat', 'deer',
-               'dog', 'frog', 'horse', 'ship', 'truck']
+class_names = CLASS_NAMES
 
 st.title("Image Classifier: CIFAR-10 Categories")
-st.write("Upload an image and let the CNN classify it.")
+st.write("Upload one or more images (or a zip of images) and let the CNN classify them.")
+
+batch_size = st.sidebar.slider("Batch size", 1, 512, 128)
+top_k = st.sidebar.slider("Top-k", 1, len(class_names), 3)
+use_tta = st.sidebar.checkbox("Test-time augmentation (flips + crops)", value=False)
+
+# Calibrated probabilities: temperature fit offline by `python calibration.py fit` (1.0 if never fit)
+temperature = load_temperature(runtime, tta=use_tta)
+scorer = CalibratedModel(model, temperature=temperature, tta=use_tta)
+
+# Upload images
+uploaded_files = st.file_uploader("Choose images...", type=["jpg", "jpeg", "png", "zip"],
+                                  accept_multiple_files=True)
 
-# Upload image
-uploaded_file = st.file_uploader("Choose an image...", type=["jpg", "jpeg", "png"])
+if uploaded_files:
+    sources = []
+    for f in uploaded_files:
+        if f.name.lower().endswith(".zip"):
+            sources.extend(iter_zip_bytes(f.getvalue(), f.name))
+        else:
+            sources.append((f.name, f.getvalue()))
 
-if uploaded_file is not None:
-    # Show the uploaded image
-    image = Image.open(uploaded_file).convert("RGB")
-    st.image(image, caption="Uploaded Image", use_column_width=True)
+    # Decode/resize in parallel, one forward pass per batch
+    results = list(classify_stream(scorer, sources, batch_size=batch_size, k=top_k))
 
-    # Preprocess the image
-    img = image.resize((32, 32))
-    img_array = np.array(img) / 255.0  # normalize
-    img_array = img_array.reshape((1, 32, 32, 3))  # model expects 4D input
+    if len(results) == 1 and results[0][1]:
+        # Show the uploaded image
+        name, payload = sources[0]
+        st.image(Image.open(io.BytesIO(payload)).convert("RGB"), caption="Uploaded Image", use_column_width=True)
+        predicted_class, confidence = results[0][1][0]
+        st.subheader(f"Prediction: **{predicted_class}**")
+        st.write(f"Confidence: {confidence * 100:.2f}%" + (" (calibrated)" if temperature != 1.0 else ""))
 
-    # Make prediction
-    prediction = model.predict(img_array)
-    predicted_class = class_names[np.argmax(prediction)]
-    confidence = np.max(prediction)
+    rows = []
+    for name, predictions in results:
+        row = {"image": name}
+        for i, (label, score) in enumerate(predictions, 1):
+            row[f"class_{i}"] = label
+            row[f"score_{i}"] = round(score, 4)
+        rows.append(row)
+    st.dataframe(rows, use_container_width=True)
+    skipped = sum(not predictions for _, predictions in results)
+    if skipped:
+        st.warning(f"⚠️ {skipped} file(s) could not be decoded.")
 
-    st.subheader(f"Prediction: **{predicted_class}**")
-    st.write(f"Confidence: {confidence * 100:.2f}%")
\ No newline at end of file
+with st.sidebar.expander("⚙️ Model load metrics"):
+    st.write(f"Runtime: `{runtime}`")
+    st.json(model_metrics(registry_name(runtime)))
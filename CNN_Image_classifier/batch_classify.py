@@ -0,0 +1,193 @@
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import numpy as np
+from PIL import Image
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:  # model_registry.py lives one level up
+    sys.path.append(REPO_ROOT)
+from model_registry import get_model
+
+# ----------------------------
+# Batched CIFAR-10 classification
+# ----------------------------
+# Images are decoded and resized to 32x32 on a thread pool (PIL releases the GIL while
+# decoding), stacked as uint8, converted to float32 once per batch and sent to the model
+# in a single call per batch. Sources can be files, directories or zip archives.
+#
+#   python batch_classify.py photos/ more.zip -o predictions.csv --batch-size 256 --top-k 3
+#   python batch_classify.py --benchmark --images 2048     # images/sec per batch size
+
+CLASS_NAMES = ['airplane', 'automobile', 'bird', 'cat', 'deer',
+               'dog', 'frog', 'horse', 'ship', 'truck']
+IMAGE_SIZE = (32, 32)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp")
+
+
+def load_image(source):
+    """Decode a path, file-like object or bytes into a (32, 32, 3) uint8 array."""
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        return np.asarray(image.convert("RGB").resize(IMAGE_SIZE), dtype=np.uint8)
+
+
+def _zip_images(archive, prefix):
+    for info in archive.infolist():
+        if not info.is_dir() and info.filename.lower().endswith(IMAGE_EXTENSIONS):
+            yield f"{prefix}:{info.filename}", archive.read(info)
+
+
+def iter_zip_bytes(data, name="upload.zip"):
+    """Yield (name, bytes) for every image inside an in-memory zip archive."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        yield from _zip_images(archive, name)
+
+
+def iter_sources(paths):
+    """Yield (name, source) for every image in files, directories and zip archives."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(IMAGE_EXTENSIONS):
+                        full = os.path.join(root, name)
+                        yield full, full
+        elif zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                yield from _zip_images(archive, path)
+        else:
+            yield path, path
+
+
+def to_batch(images):
+    """Stack uint8 images and scale to [0, 1] as float32 (not float64) in one step."""
+    batch = np.stack(images).astype(np.float32)
+    batch *= 1.0 / 255.0
+    return batch
+
+
+def top_k(probabilities, k=3):
+    """(indices, scores) of the k best classes per row, best first."""
+    k = min(k, probabilities.shape[1])
+    idx = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+    scores = np.take_along_axis(probabilities, idx, axis=1)
+    order = np.argsort(-scores, axis=1)
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def predict_batch(model, batch):
+    # Calling the model directly skips predict()'s per-call dataset/callback setup
+    return np.asarray(model(batch, training=False))
+
+
+def classify_stream(model, sources, batch_size=128, k=3, workers=8):
+    """Yield (name, [(class, score), ...]) for every (name, source); unreadable images get []."""
+    sources = iter(sources)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            chunk = list(islice(sources, batch_size))
+            if not chunk:
+                return
+
+            def safe_load(item):
+                try:
+                    return load_image(item[1])
+                except Exception as e:
+                    print(f"⚠️ Skipping {item[0]}: {e}", file=sys.stderr)
+                    return None
+
+            images = list(pool.map(safe_load, chunk))
+            ok = [i for i, image in enumerate(images) if image is not None]
+            results = {}
+            if ok:
+                probabilities = predict_batch(model, to_batch([images[i] for i in ok]))
+                idx, scores = top_k(probabilities, k)
+                for row, i in enumerate(ok):
+                    results[i] = [(CLASS_NAMES[c], float(s)) for c, s in zip(idx[row], scores[row])]
+            for i, (name, _) in enumerate(chunk):
+                yield name, results.get(i, [])
+
+
+def benchmark(model, n_images=1024, batch_sizes=(1, 8, 32, 128, 512), seed=0):
+    """images/sec for preprocessing + inference at each batch size, on random PNGs."""
+    rng = np.random.default_rng(seed)
+    encoded = []
+    for _ in range(min(n_images, 64)):  # decode cost is what matters, so reuse a few payloads
+        buf = io.BytesIO()
+        Image.fromarray(rng.integers(0, 256, (128, 128, 3), dtype=np.uint8)).save(buf, format="PNG")
+        encoded.append(buf.getvalue())
+    sources = [(f"img{i}", encoded[i % len(encoded)]) for i in range(n_images)]
+
+    results = []
+    for batch_size in batch_sizes:
+        for _ in classify_stream(model, sources[:batch_size], batch_size):  # warm up this shape
+            pass
+        start = time.perf_counter()
+        for _ in classify_stream(model, sources, batch_size):
+            pass
+        elapsed = time.perf_counter() - start
+        results.append({"batch_size": batch_size, "seconds": elapsed, "images_per_sec": n_images / elapsed})
+    return results
+
+
+def registry_name(runtime="keras"):
+    return "cifar10_cnn" if runtime == "keras" else f"cifar10_cnn_{runtime}"
+
+
+def load_model(path=None, runtime="keras"):
+    """The CNN from the shared registry; `runtime` selects Keras or an export (see lite_runtime.py)."""
+    from lite_runtime import runtime_loader
+    return get_model(registry_name(runtime), runtime_loader(runtime, path),
+                     warmup=lambda m: predict_batch(m, np.zeros((1, 32, 32, 3), dtype=np.float32)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk CIFAR-10 classification.")
+    parser.add_argument("inputs", nargs="*", help="Image files, directories or zip archives")
+    parser.add_argument("-o", "--output", default="predictions.csv")
+    parser.add_argument("--model", default=None, help="Model file (default depends on --runtime)")
+    parser.add_argument("--runtime", default=os.getenv("CNN_RUNTIME", "keras"),
+                        choices=["keras", "tflite", "tflite-int8", "onnx", "onnx-int8"])
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=8, help="Decode/resize threads")
+    parser.add_argument("--tta", action="store_true", help="Average flip/crop views (one pass per batch)")
+    parser.add_argument("--benchmark", action="store_true", help="Measure images/sec on synthetic images")
+    parser.add_argument("--images", type=int, default=1024, help="Images per benchmark run")
+    args = parser.parse_args()
+    if not args.inputs and not args.benchmark:
+        parser.error("give image files/directories/zips, or --benchmark")
+
+    from calibration import CalibratedModel, load_temperature
+    model = CalibratedModel(load_model(args.model, args.runtime),
+                            temperature=load_temperature(args.runtime, tta=args.tta), tta=args.tta)
+    if args.benchmark:
+        print(f"{'batch':>7}{'seconds':>10}{'images/sec':>13}")
+        for r in benchmark(model, args.images):
+            print(f"{r['batch_size']:>7}{r['seconds']:>10.2f}{r['images_per_sec']:>13.1f}")
+        return
+
+    start = time.perf_counter()
+    count = 0
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["image"] + [c for i in range(1, args.top_k + 1) for c in (f"class_{i}", f"score_{i}")])
+        for name, predictions in classify_stream(model, iter_sources(args.inputs),
+                                                 args.batch_size, args.top_k, args.workers):
+            writer.writerow([name] + [v for label, score in predictions for v in (label, f"{score:.4f}")])
+            count += bool(predictions)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Classified {count} images in {elapsed:.2f}s — {count / elapsed:.1f} images/sec → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
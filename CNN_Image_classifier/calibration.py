@@ -0,0 +1,197 @@
+import argparse
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+# ----------------------------
+# Test-time augmentation + temperature scaling
+# ----------------------------
+# TTA: every image is expanded into a few views (horizontal flip, shifted crops of a
+# reflect-padded copy), all views of a batch go through the model in ONE forward pass and
+# their log-probabilities are averaged. Calibration: a single temperature T is fit offline
+# on held-out CIFAR-10 images by minimising the negative log-likelihood of
+# softmax(log p / T) - separately with and without TTA, since averaging changes sharpness.
+#
+#   python calibration.py fit --runtime keras       # writes calibration.json
+#   python calibration.py latency --budget-ms 50    # added TTA latency vs budget
+
+CALIBRATION_PATH = "calibration.json"
+EPS = 1e-7
+
+
+def tta_views(batch, flips=True, crops=True, pad=2):
+    """(V * N, H, W, C) array of views, view-major: [identity, flip, crops...]."""
+    views = [batch]
+    if flips:
+        views.append(batch[:, :, ::-1, :])
+    if crops:
+        h, w = batch.shape[1:3]
+        padded = np.pad(batch, ((0, 0), (pad, pad), (pad, pad), (0, 0)), mode="reflect")
+        for dy, dx in ((0, 0), (0, 2 * pad), (2 * pad, 0), (2 * pad, 2 * pad)):
+            views.append(padded[:, dy:dy + h, dx:dx + w, :])
+    return np.concatenate(views, axis=0)
+
+
+def log_probs(model, batch, tta=False):
+    """Mean log-probabilities over the TTA views (or plain), from a single model call."""
+    n = len(batch)
+    x = tta_views(batch) if tta else batch
+    p = np.asarray(model(x, training=False), dtype=np.float32)
+    logp = np.log(np.clip(p, EPS, 1.0))
+    return logp.reshape(-1, n, logp.shape[-1]).mean(axis=0)
+
+
+def softmax(logits, temperature=1.0):
+    z = logits / temperature
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def nll(logits, labels, temperature):
+    p = softmax(logits, temperature)[np.arange(len(labels)), labels]
+    return float(-np.log(np.clip(p, EPS, 1.0)).mean())
+
+
+def expected_calibration_error(probabilities, labels, bins=15):
+    confidence = probabilities.max(axis=1)
+    correct = probabilities.argmax(axis=1) == labels
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    ece = 0.0
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        mask = (confidence > lo) & (confidence <= hi)
+        if mask.any():
+            ece += mask.mean() * abs(correct[mask].mean() - confidence[mask].mean())
+    return float(ece)
+
+
+def fit_temperature(logits, labels, lo=0.05, hi=10.0, iterations=60):
+    """Golden-section search on log T (the NLL is unimodal in T)."""
+    a, b = math.log(lo), math.log(hi)
+    ratio = (math.sqrt(5) - 1) / 2
+    c, d = b - ratio * (b - a), a + ratio * (b - a)
+    fc, fd = nll(logits, labels, math.exp(c)), nll(logits, labels, math.exp(d))
+    for _ in range(iterations):
+        if fc < fd:
+            b, d, fd = d, c, fc
+            c = b - ratio * (b - a)
+            fc = nll(logits, labels, math.exp(c))
+        else:
+            a, c, fc = c, d, fd
+            d = a + ratio * (b - a)
+            fd = nll(logits, labels, math.exp(d))
+    return math.exp((a + b) / 2)
+
+
+class CalibratedModel:
+    """Wraps a model (Keras or lite_runtime) to return TTA-averaged, temperature-scaled probabilities."""
+
+    def __init__(self, model, temperature=1.0, tta=False):
+        self.model = model
+        self.temperature = temperature
+        self.tta = tta
+
+    def __call__(self, batch, training=False):
+        return softmax(log_probs(self.model, np.asarray(batch, dtype=np.float32), self.tta), self.temperature)
+
+
+def load_temperature(runtime="keras", tta=False, path=CALIBRATION_PATH):
+    """Fitted temperature for (runtime, tta), or 1.0 (uncalibrated) if it was never fit."""
+    if not os.path.exists(path):
+        return 1.0
+    with open(path, encoding="utf-8") as f:
+        entry = json.load(f).get(runtime, {})
+    return entry.get("tta" if tta else "plain", {}).get("temperature", 1.0)
+
+
+def collect_logits(model, x, tta, batch_size=256):
+    return np.concatenate([log_probs(model, x[i:i + batch_size], tta) for i in range(0, len(x), batch_size)])
+
+
+def fit(runtime, samples=5000, path=CALIBRATION_PATH):
+    """Fit T on the first half of the CIFAR-10 slice, report NLL / ECE / accuracy on the second half."""
+    from batch_classify import load_model
+    from compare_runtimes import prepare_eval_data
+
+    data = np.load(prepare_eval_data(samples=samples))
+    x = data["x"][:samples].astype(np.float32) / 255.0
+    y = data["y"][:samples]
+    half = len(x) // 2
+    model = load_model(runtime=runtime)
+
+    results = {}
+    for mode, tta in (("plain", False), ("tta", True)):
+        fit_logits = collect_logits(model, x[:half], tta)
+        eval_logits = collect_logits(model, x[half:], tta)
+        t = fit_temperature(fit_logits, y[:half])
+        before, after = softmax(eval_logits), softmax(eval_logits, t)
+        results[mode] = {
+            "temperature": round(t, 4),
+            "accuracy": float((before.argmax(axis=1) == y[half:]).mean()),
+            "nll_before": nll(eval_logits, y[half:], 1.0),
+            "nll_after": nll(eval_logits, y[half:], t),
+            "ece_before": expected_calibration_error(before, y[half:]),
+            "ece_after": expected_calibration_error(after, y[half:]),
+        }
+
+    saved = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    saved[runtime] = results
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(saved, f, indent=2)
+    return results
+
+
+def latency(model, batch_sizes=(1, 32), runs=100):
+    """p50/p95 ms per call with and without TTA, for each batch size."""
+    rows = []
+    for batch_size in batch_sizes:
+        x = np.random.default_rng(0).random((batch_size, 32, 32, 3), dtype=np.float32)
+        for tta in (False, True):
+            wrapped = CalibratedModel(model, tta=tta)
+            wrapped(x)  # warm up this input shape
+            times = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                wrapped(x)
+                times.append(time.perf_counter() - start)
+            rows.append({"batch_size": batch_size, "tta": tta,
+                         "p50_ms": float(np.percentile(times, 50) * 1000),
+                         "p95_ms": float(np.percentile(times, 95) * 1000)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit temperature scaling and measure TTA latency.")
+    parser.add_argument("command", choices=["fit", "latency"])
+    parser.add_argument("--runtime", default=os.getenv("CNN_RUNTIME", "keras"))
+    parser.add_argument("--samples", type=int, default=5000, help="CIFAR-10 test images (half fit, half eval)")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Latency budget for one upload")
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        for mode, r in fit(args.runtime, args.samples).items():
+            print(f"✅ {mode:<5} T={r['temperature']:.3f}  acc={r['accuracy']:.4f}  "
+                  f"NLL {r['nll_before']:.4f} → {r['nll_after']:.4f}  ECE {r['ece_before']:.4f} → {r['ece_after']:.4f}")
+        print(f"💾 Saved to {CALIBRATION_PATH}")
+        return
+
+    from batch_classify import load_model
+    rows = latency(load_model(runtime=args.runtime))
+    print(f"{'batch':>6}{'tta':>6}{'p50 ms':>9}{'p95 ms':>9}")
+    for r in rows:
+        print(f"{r['batch_size']:>6}{'on' if r['tta'] else 'off':>6}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}")
+    single = {r["tta"]: r for r in rows if r["batch_size"] == 1}
+    added = single[True]["p95_ms"] - single[False]["p95_ms"]
+    status = "✅ within" if single[True]["p95_ms"] <= args.budget_ms else "❌ over"
+    print(f"\nTTA adds {added:.2f} ms p95 for one image ({single[True]['p95_ms']:.2f} ms) — "
+          f"{status} the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
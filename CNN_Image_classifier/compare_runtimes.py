@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import numpy as np
+
+from lite_runtime import RUNTIME_PATHS, runtime_loader
+
+# ----------------------------
+# Keras vs TFLite vs ONNX report (one subprocess per runtime)
+# ----------------------------
+#   python export_model.py --onnx && python compare_runtimes.py --samples 2000 --out report.json
+
+EVAL_DATA = "cifar10_eval.npz"
+
+
+def prepare_eval_data(path=EVAL_DATA, samples=2000):
+    if os.path.exists(path) and len(np.load(path)["y"]) >= samples:
+        return path
+    import tensorflow as tf
+    _, (x_test, y_test) = tf.keras.datasets.cifar10.load_data()
+    np.savez(path, x=x_test[:samples], y=y_test[:samples].ravel())
+    return path
+
+
+def measure(runtime, data_path, samples, batch_size=128, latency_runs=200):
+    """Runs inside the worker process."""
+    start = time.perf_counter()
+    model = runtime_loader(runtime)()
+    data = np.load(data_path)
+    x = data["x"][:samples].astype(np.float32) / 255.0
+    y = data["y"][:samples]
+    model(x[:1], training=False)
+    startup = time.perf_counter() - _PROCESS_START
+    load = time.perf_counter() - start
+
+    latencies = []
+    for i in range(latency_runs):
+        t = time.perf_counter()
+        model(x[i % len(x)][None, ...], training=False)
+        latencies.append(time.perf_counter() - t)
+
+    correct = 0
+    t = time.perf_counter()
+    for i in range(0, len(x), batch_size):
+        correct += int((np.argmax(model(x[i:i + batch_size], training=False), axis=1) == y[i:i + batch_size]).sum())
+    elapsed = time.perf_counter() - t
+
+    return {
+        "runtime": runtime,
+        "file_mb": round(os.path.getsize(RUNTIME_PATHS[runtime]) / 1e6, 2),
+        "accuracy": correct / len(x),
+        "startup_s": startup,
+        "load_s": load,
+        "latency_p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "latency_p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "images_per_sec": len(x) / elapsed,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+    }
+
+
+def run_worker(runtime, data_path, samples):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", runtime,
+                          "--data", data_path, "--samples", str(samples)],
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        print(f"❌ {runtime} failed:\n{out.stderr.strip()[-2000:]}")
+        return None
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def print_report(rows):
+    baseline = next((r for r in rows if r["runtime"] == "keras"), None)
+    print(f"\n{'runtime':<13}{'MB':>7}{'acc':>8}{'Δacc':>8}{'startup s':>11}{'p50 ms':>9}"
+          f"{'p95 ms':>9}{'img/s':>9}{'RSS MB':>9}")
+    for r in rows:
+        delta = r["accuracy"] - baseline["accuracy"] if baseline else 0.0
+        print(f"{r['runtime']:<13}{r['file_mb']:>7.2f}{r['accuracy']:>8.4f}{delta:>+8.4f}{r['startup_s']:>11.2f}"
+              f"{r['latency_p50_ms']:>9.2f}{r['latency_p95_ms']:>9.2f}{r['images_per_sec']:>9.0f}"
+              f"{r['peak_rss_mb']:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the Keras CNN with its TFLite / ONNX exports.")
+    parser.add_argument("--runtimes", nargs="+", default=list(RUNTIME_PATHS), choices=list(RUNTIME_PATHS))
+    parser.add_argument("--samples", type=int, default=2000, help="CIFAR-10 test images")
+    parser.add_argument("--data", default=EVAL_DATA)
+    parser.add_argument("--out", default=None, help="Write the report as JSON")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.data, args.samples)))
+        return
+
+    data_path = prepare_eval_data(args.data, args.samples)
+    rows = []
+    for runtime in args.runtimes:
+        if not os.path.exists(RUNTIME_PATHS[runtime]):
+            print(f"⚠️ Skipping {runtime}: {RUNTIME_PATHS[runtime]} not found (run export_model.py)")
+            continue
+        print(f"🔍 Measuring {runtime}...")
+        result = run_worker(runtime, data_path, args.samples)
+        if result:
+            rows.append(result)
+
+    print_report(rows)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
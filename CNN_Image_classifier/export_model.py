@@ -0,0 +1,93 @@
+import argparse
+
+import numpy as np
+
+from lite_runtime import RUNTIME_PATHS
+
+# ----------------------------
+# Export cnn_model.keras for lightweight serving
+# ----------------------------
+# Writes a float TFLite model, a full-integer (int8) TFLite model calibrated on CIFAR-10
+# training images, and optionally ONNX (float and statically quantized int8) through
+# tf2onnx / onnxruntime. The app picks one with CNN_RUNTIME (see lite_runtime.py).
+#
+#   python export_model.py                          # tflite + tflite-int8
+#   python export_model.py --onnx --calibration 500
+
+
+def calibration_images(n=300, seed=0):
+    """`n` random CIFAR-10 training images scaled to [0, 1] float32, as the app feeds them."""
+    import tensorflow as tf
+    (x_train, _), _ = tf.keras.datasets.cifar10.load_data()
+    idx = np.random.default_rng(seed).choice(len(x_train), n, replace=False)
+    return x_train[idx].astype(np.float32) / 255.0
+
+
+def export_tflite(model, path, calibration=None):
+    """Float TFLite, or full-integer int8 (weights, activations and I/O) when calibration images are given."""
+    import tensorflow as tf
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if calibration is not None:
+        def representative_dataset():
+            for image in calibration:
+                yield [image[None, ...]]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+    return path
+
+
+def export_onnx(model, path, int8_path=None, calibration=None):
+    import tensorflow as tf
+    try:
+        import tf2onnx
+    except ImportError:
+        # Not in requirements.txt: tf2onnx pins protobuf 3.20, the rest of the tree needs 5.x
+        raise SystemExit("❌ ONNX export needs tf2onnx: pip install tf2onnx (ideally in a separate environment)")
+    spec = [tf.TensorSpec((None, 32, 32, 3), tf.float32, name="input")]
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=13, output_path=path)
+    if int8_path and calibration is not None:
+        from onnxruntime.quantization import CalibrationDataReader, QuantType, quantize_static
+
+        class Reader(CalibrationDataReader):
+            def __init__(self):
+                self.batches = iter(calibration[i:i + 1] for i in range(len(calibration)))
+
+            def get_next(self):
+                batch = next(self.batches, None)
+                return None if batch is None else {"input": batch}
+
+        quantize_static(path, int8_path, Reader(), activation_type=QuantType.QInt8,
+                        weight_type=QuantType.QInt8)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the CIFAR-10 CNN to TFLite / ONNX.")
+    parser.add_argument("--model", default=RUNTIME_PATHS["keras"])
+    parser.add_argument("--calibration", type=int, default=300, help="CIFAR-10 images for int8 calibration")
+    parser.add_argument("--no-int8", action="store_true", help="Skip post-training quantization")
+    parser.add_argument("--onnx", action="store_true", help="Also export ONNX (needs tf2onnx)")
+    args = parser.parse_args()
+
+    import tensorflow as tf
+    model = tf.keras.models.load_model(args.model, compile=False)
+    calibration = None if args.no_int8 else calibration_images(args.calibration)
+
+    print(f"✅ {export_tflite(model, RUNTIME_PATHS['tflite'])}")
+    if calibration is not None:
+        print(f"✅ {export_tflite(model, RUNTIME_PATHS['tflite-int8'], calibration)} "
+              f"(int8, {len(calibration)} calibration images)")
+    if args.onnx:
+        export_onnx(model, RUNTIME_PATHS["onnx"],
+                    None if calibration is None else RUNTIME_PATHS["onnx-int8"], calibration)
+        print(f"✅ {RUNTIME_PATHS['onnx']}" + ("" if calibration is None else f", {RUNTIME_PATHS['onnx-int8']}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import os
+import threading
+
+import numpy as np
+
+# ----------------------------
+# Lightweight runtimes for the exported CNN
+# ----------------------------
+# TFLite and ONNX models are wrapped so they can be called like the Keras model
+# (`model(batch, training=False)` -> probabilities), which keeps batch_classify.py
+# independent of the runtime. Neither wrapper imports TensorFlow when the small
+# runtime packages (tflite-runtime / ai-edge-litert, onnxruntime) are installed.
+#
+#   CNN_RUNTIME=tflite-int8 streamlit run app.py
+
+RUNTIME_PATHS = {
+    "keras": "cnn_model.keras",
+    "tflite": "cnn_model.tflite",
+    "tflite-int8": "cnn_model_int8.tflite",
+    "onnx": "cnn_model.onnx",
+    "onnx-int8": "cnn_model_int8.onnx",
+}
+
+
+def _tflite_interpreter(path, num_threads):
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf  # full TF as a last resort
+            Interpreter = tf.lite.Interpreter
+    return Interpreter(model_path=path, num_threads=num_threads)
+
+
+class TFLiteClassifier:
+    """TFLite interpreter with the Keras call signature; handles int8 input/output quantization."""
+
+    def __init__(self, path, num_threads=None):
+        self.interpreter = _tflite_interpreter(path, num_threads or os.cpu_count())
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.batch_size = None
+        # The interpreter holds mutable tensor buffers: one call at a time
+        self._lock = threading.Lock()
+
+    def _resize(self, batch_size):
+        if batch_size != self.batch_size:
+            self.interpreter.resize_tensor_input(self.input["index"], [batch_size, 32, 32, 3])
+            self.interpreter.allocate_tensors()
+            self.input = self.interpreter.get_input_details()[0]
+            self.output = self.interpreter.get_output_details()[0]
+            self.batch_size = batch_size
+
+    def __call__(self, batch, training=False):
+        batch = np.asarray(batch, dtype=np.float32)
+        with self._lock:
+            self._resize(len(batch))
+            dtype = self.input["dtype"]
+            if dtype != np.float32:
+                scale, zero_point = self.input["quantization"]
+                info = np.iinfo(dtype)
+                batch = np.clip(np.round(batch / scale + zero_point), info.min, info.max).astype(dtype)
+            self.interpreter.set_tensor(self.input["index"], batch)
+            self.interpreter.invoke()
+            out = self.interpreter.get_tensor(self.output["index"])
+            if out.dtype != np.float32:
+                scale, zero_point = self.output["quantization"]
+                out = (out.astype(np.float32) - zero_point) * scale
+            return out
+
+
+class OnnxClassifier:
+    """onnxruntime session with the Keras call signature."""
+
+    def __init__(self, path, num_threads=None):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, batch, training=False):
+        return self.session.run(None, {self.input_name: np.asarray(batch, dtype=np.float32)})[0]
+
+
+def runtime_loader(runtime, path=None, num_threads=None):
+    """model_registry loader for `runtime` (keras, tflite, tflite-int8, onnx, onnx-int8)."""
+    if runtime not in RUNTIME_PATHS:
+        raise ValueError(f"Unknown runtime '{runtime}' (use {', '.join(RUNTIME_PATHS)})")
+    path = path or RUNTIME_PATHS[runtime]
+
+    def load():
+        if runtime.startswith("tflite"):
+            return TFLiteClassifier(path, num_threads)
+        if runtime.startswith("onnx"):
+            return OnnxClassifier(path, num_threads)
+        import tensorflow as tf
+        return tf.keras.models.load_model(path, compile=False)
+    return load
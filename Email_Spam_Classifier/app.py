@@ -1,9 +1,25 @@
+import os
+import sys
 import streamlit as st
-import joblib
 
-# Load the saved model and vectorizer
-model = joblib.load("spam_detector.pkl")
-vectorizer = joblib.load("vectorizer.pkl")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:  # model_registry.py lives one level up
+    sys.path.append(REPO_ROOT)
+from model_registry import get_model, joblib_loader, model_metrics
+
+# Load the saved model and vectorizer (once per process, not on every rerun).
+# SPAM_FEATURES=hashing switches to the vocabulary-free pipeline from train_hashing_model.py.
+def load_spam_pipeline():
+    if os.getenv("SPAM_FEATURES") == "hashing":
+        from hashing_features import HASHING_PIPELINE_PATH, split_pipeline
+        return split_pipeline(joblib_loader(HASHING_PIPELINE_PATH)())
+    return joblib_loader("spam_detector.pkl")(), joblib_loader("vectorizer.pkl")()
+
+def warmup(pipeline):
+    model, vectorizer = pipeline
+    model.predict(vectorizer.transform(["warm up"]))
+
+model, vectorizer = get_model("spam", load_spam_pipeline, warmup)
 
 st.title("📧 Spam Email Classifier")
 st.write("Enter a message below to check if it's spam or not.")
@@ -22,3 +38,6 @@ if st.button("Check"):
             st.error("🚨 It's a **SPAM** message.")
     else:
         st.warning("Please enter a message.")
+
+with st.sidebar.expander("⚙️ Model load metrics"):
+    st.json(model_metrics("spam"))
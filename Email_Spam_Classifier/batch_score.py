@@ -0,0 +1,182 @@
+import argparse
+import csv
+import json
+import mailbox
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from email.header import decode_header, make_header
+from itertools import islice
+
+import joblib
+
+# ----------------------------
+# Batch scoring for the spam classifier
+# ----------------------------
+# Streams messages from an mbox / CSV / JSONL export in chunks, vectorizes each chunk as one
+# sparse matrix and scores it in a pool of worker processes (each loads the model once).
+# Results are written as they complete, in input order, and at most `2 * workers` chunks
+# are in flight, so memory is bounded by the chunk size rather than the mailbox size.
+#
+#   python batch_score.py inbox.mbox -o predictions.csv --chunk-size 5000 --workers 4
+
+MODEL_PATH = "spam_detector.pkl"
+VECTORIZER_PATH = "vectorizer.pkl"
+HAM_LABEL = 1  # the model predicts 1 for ham, anything else is spam (see app.py)
+
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+# ---- readers: all yield (message_id, text) ----
+def _mbox_text(message):
+    subject = str(make_header(decode_header(message.get("Subject", ""))))
+    parts = []
+    for part in message.walk() if message.is_multipart() else [message]:
+        if part.get_content_type() != "text/plain":
+            continue
+        payload = part.get_payload(decode=True) or b""
+        parts.append(payload.decode(part.get_content_charset() or "utf-8", errors="replace"))
+    return f"{subject}\n" + "\n".join(parts)
+
+
+def read_mbox(path):
+    for i, message in enumerate(mailbox.mbox(path, create=False)):
+        yield message.get("Message-ID", str(i)), _mbox_text(message)
+
+
+def read_csv(path, text_column="text", id_column=None):
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            yield (row[id_column] if id_column else str(i)), row[text_column]
+
+
+def read_jsonl(path, text_column="text", id_column=None):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for i, line in enumerate(f):
+            if line.strip():
+                record = json.loads(line)
+                yield (str(record[id_column]) if id_column else str(i)), record[text_column]
+
+
+def read_messages(path, fmt=None, text_column="text", id_column=None):
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt in ("mbox", "mbx"):
+        return read_mbox(path)
+    if fmt == "csv":
+        return read_csv(path, text_column, id_column)
+    if fmt in ("jsonl", "json", "ndjson"):
+        return read_jsonl(path, text_column, id_column)
+    raise ValueError(f"Unknown input format '{fmt}' (use mbox, csv or jsonl)")
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ---- scoring (runs inside the worker processes) ----
+_model = None
+_vectorizer = None
+
+
+def _load(model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH):
+    global _model, _vectorizer
+    _model = joblib.load(model_path, mmap_mode="r")
+    _vectorizer = joblib.load(vectorizer_path, mmap_mode="r")
+
+
+def classify(model, vectorizer, texts):
+    """Vectorize `texts` as one sparse matrix and score it. Returns (labels, spam_probabilities)."""
+    X = vectorizer.transform(texts)
+    if hasattr(model, "predict_proba"):
+        proba = model.predict_proba(X)
+        classes = list(model.classes_)
+        spam_columns = [i for i, c in enumerate(classes) if c != HAM_LABEL]
+        labels = [classes[i] for i in proba.argmax(axis=1)]
+        spam_prob = [float(p) for p in proba[:, spam_columns].sum(axis=1)]
+    else:
+        labels = model.predict(X)
+        spam_prob = [None] * len(texts)
+    return ["ham" if label == HAM_LABEL else "spam" for label in labels], spam_prob
+
+
+def score_chunk(chunk):
+    """Score one chunk of (id, text). Returns (ids, labels, spam_probabilities)."""
+    if _model is None:
+        _load()
+    ids = [message_id for message_id, _ in chunk]
+    labels, spam_prob = classify(_model, _vectorizer, [text for _, text in chunk])
+    return ids, labels, spam_prob
+
+
+def score_stream(messages, chunk_size=2000, workers=None, model_path=MODEL_PATH,
+                 vectorizer_path=VECTORIZER_PATH):
+    """Yield (id, label, spam_probability) for every (id, text) in `messages`, in order."""
+    workers = workers or os.cpu_count() or 1
+    chunks = chunked(messages, chunk_size)
+
+    if workers == 1:
+        _load(model_path, vectorizer_path)
+        for chunk in chunks:
+            yield from zip(*score_chunk(chunk))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_load,
+                             initargs=(model_path, vectorizer_path)) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(score_chunk, chunk))
+            # Bound memory: never keep more than two chunks per worker queued
+            if len(in_flight) >= 2 * workers:
+                yield from zip(*in_flight.popleft().result())
+        while in_flight:
+            yield from zip(*in_flight.popleft().result())
+
+
+def score_file(input_path, output_path, fmt=None, text_column="text", id_column=None,
+               chunk_size=2000, workers=None, report_every=5.0):
+    """Score a mailbox export into a CSV of id,label,spam_probability. Returns stats."""
+    messages = read_messages(input_path, fmt, text_column, id_column)
+    start = last_report = time.perf_counter()
+    count = spam = 0
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "label", "spam_probability"])
+        for message_id, label, prob in score_stream(messages, chunk_size, workers):
+            writer.writerow([message_id, label, "" if prob is None else f"{prob:.4f}"])
+            count += 1
+            spam += label == "spam"
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                print(f"⏱️ {count} messages, {count / (now - start):.0f} msg/s")
+                last_report = now
+    elapsed = time.perf_counter() - start
+    return {"messages": count, "spam": spam, "seconds": elapsed,
+            "messages_per_sec": count / elapsed if elapsed else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch spam scoring for mailbox exports.")
+    parser.add_argument("input", help="mbox, CSV or JSONL file")
+    parser.add_argument("-o", "--output", default="predictions.csv")
+    parser.add_argument("--format", choices=["mbox", "csv", "jsonl"], default=None)
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--id-column", default=None)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    stats = score_file(args.input, args.output, args.format, args.text_column, args.id_column,
+                       args.chunk_size, args.workers)
+    print(f"✅ Scored {stats['messages']} messages ({stats['spam']} spam) in {stats['seconds']:.1f}s "
+          f"— {stats['messages_per_sec']:.0f} msg/s → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# ----------------------------
+# Feature pipeline benchmark: vectorizer.pkl + spam_detector.pkl vs. hashing pipeline
+# ----------------------------
+# Accuracy is measured on train_hashing_model.py's held-out split.
+#
+#   python benchmark_features.py spam.csv --text-column v2 --label-column v1
+
+PIPELINES = {
+    "pickled vocabulary": ("spam_detector.pkl", "vectorizer.pkl"),
+    "hashing": ("spam_hashing_pipeline.pkl", None),
+}
+
+
+def _measure(name, model_path, vectorizer_path, texts, test_texts, test_labels):
+    import joblib
+    import numpy as np
+    import psutil
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+    if vectorizer_path:
+        model, vectorizer = joblib.load(model_path), joblib.load(vectorizer_path)
+    else:
+        from hashing_features import split_pipeline
+        model, vectorizer = split_pipeline(joblib.load(model_path))
+    load_s = time.perf_counter() - start
+    rss_mb = (process.memory_info().rss - rss_before) / 1e6
+
+    single = []
+    for text in texts[:300]:
+        start = time.perf_counter()
+        model.predict(vectorizer.transform([text]))
+        single.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    X = vectorizer.transform(texts)
+    model.predict(X)
+    batch_s = time.perf_counter() - start
+
+    accuracy = None
+    if test_labels is not None:
+        test_predictions = model.predict(vectorizer.transform(test_texts))
+        accuracy = round(float((test_predictions == np.asarray(test_labels)).mean()), 4)
+
+    size_mb = sum(os.path.getsize(p) for p in (model_path, vectorizer_path) if p) / 1e6
+    return {
+        "pipeline": name,
+        "size_mb": round(size_mb, 2),
+        "load_s": round(load_s, 3),
+        "rss_mb": round(rss_mb, 1),
+        "p50_ms": round(statistics.median(single), 3),
+        "p95_ms": round(float(np.percentile(single, 95)), 3),
+        "batch_msgs_per_sec": round(len(texts) / batch_s),
+        "feature_dtype": str(X.dtype),
+        "accuracy": accuracy,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare spam feature pipelines.")
+    parser.add_argument("data", help="CSV with message text (and optionally ham/spam labels)")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--label-column", default=None)
+    parser.add_argument("--ham-value", default="ham")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Must match train_hashing_model.py")
+    args = parser.parse_args()
+
+    import pandas as pd
+    df = pd.read_csv(args.data, encoding="latin-1").dropna(subset=[args.text_column])
+    texts = df[args.text_column].astype(str).tolist()
+    test_texts = test_labels = None
+    if args.label_column:
+        from train_hashing_model import load_dataset, split_dataset
+        labeled_texts, labels = load_dataset(args.data, args.text_column, args.label_column, args.ham_value)
+        _, test_texts, _, test_labels = split_dataset(labeled_texts, labels, args.test_size)
+        test_texts, test_labels = test_texts.tolist(), test_labels.tolist()
+
+    results = []
+    for name, (model_path, vectorizer_path) in PIPELINES.items():
+        if not os.path.exists(model_path):
+            print(f"⚠️ Skipping {name}: {model_path} not found (run train_hashing_model.py first)")
+            continue
+        # One process per pipeline keeps load time and memory honest
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            results.append(pool.submit(_measure, name, model_path, vectorizer_path, texts,
+                                       test_texts, test_labels).result())
+
+    columns = ["pipeline", "size_mb", "load_s", "rss_mb", "p50_ms", "p95_ms",
+               "batch_msgs_per_sec", "feature_dtype", "accuracy"]
+    if test_labels is not None:
+        print(f"Accuracy on the {len(test_texts)} held-out messages (test_size={args.test_size})")
+    print(" | ".join(columns))
+    for r in results:
+        print(" | ".join(str(r[c]) for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import Pipeline
+
+# ----------------------------
+# Stateless hashing features for the spam classifier
+# ----------------------------
+# A fitted CountVectorizer/TfidfVectorizer pickles its whole vocabulary dict, which for a
+# large corpus is hundreds of MB that every worker has to unpickle and keep in RAM.
+# HashingVectorizer maps tokens to columns with a hash instead: nothing to fit, nothing
+# to store, and float32 sparse output halves the size of every feature matrix.
+
+HASHING_PIPELINE_PATH = "spam_hashing_pipeline.pkl"
+
+
+def make_vectorizer(n_features=2 ** 18, ngram_range=(1, 2), dtype=np.float32, tfidf=False):
+    """Hashing feature pipeline. With tfidf=True only an n_features idf vector is stored."""
+    steps = [("hashing", HashingVectorizer(
+        n_features=n_features,
+        ngram_range=ngram_range,
+        alternate_sign=False,   # keep features non-negative so MultinomialNB still works
+        norm=None if tfidf else "l2",
+        dtype=dtype,
+        lowercase=True,
+    ))]
+    if tfidf:
+        steps.append(("tfidf", TfidfTransformer(sublinear_tf=True)))
+    return Pipeline(steps)
+
+
+def split_pipeline(pipeline):
+    """(model, vectorizer) pair with the same interface app.py uses for the pickled pair."""
+    return pipeline[-1], pipeline[:-1]
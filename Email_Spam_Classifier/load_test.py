@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+
+from spam_server import create_app, load_pipeline
+
+# ----------------------------
+# Load test: per-request scoring vs. micro-batching
+# ----------------------------
+# Starts the server in-process once with max_batch_size=1 (every request pays its own
+# transform + predict, like app.py) and once with micro-batching, fires the same number of
+# concurrent requests at both and reports throughput and latency. --url tests an already
+# running server instead.
+
+SAMPLE_MESSAGES = [
+    "Congratulations! You have won a FREE ticket. Text WIN to 80086 to claim now",
+    "Hey, are we still meeting for lunch tomorrow?",
+    "URGENT! Your account has been selected for a cash prize, call 09061701461",
+    "Can you send me the notes from today's lecture?",
+    "Free entry in 2 a wkly comp to win FA Cup final tkts, text FA to 87121",
+    "I'll be home late tonight, don't wait up for dinner",
+    "You have been pre-approved for a loan. Reply YES to get your money today",
+    "Thanks for the birthday wishes, had a great day!",
+]
+
+
+async def fire(url, concurrency, requests_per_client, seed=0):
+    rng = random.Random(seed)
+    latencies = []
+
+    async def client(session):
+        for _ in range(requests_per_client):
+            payload = {"text": rng.choice(SAMPLE_MESSAGES)}
+            start = time.perf_counter()
+            async with session.post(f"{url}/predict", json=payload) as response:
+                await response.json()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        async with session.get(f"{url}/stats") as response:
+            stats = await response.json()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "req_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "avg_batch_size": stats.get("avg_batch_size"),
+    }
+
+
+async def run_local(model, vectorizer, max_batch_size, max_wait_ms, concurrency, requests_per_client):
+    runner = web.AppRunner(create_app(model, vectorizer, max_batch_size, max_wait_ms))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        return await fire(f"http://127.0.0.1:{port}", concurrency, requests_per_client)
+    finally:
+        await runner.cleanup()
+
+
+async def main_async(args):
+    if args.url:
+        print(await fire(args.url, args.concurrency, args.requests))
+        return
+
+    model, vectorizer = load_pipeline()
+    configs = [("per-request baseline", 1, 0.0), ("micro-batched", args.max_batch_size, args.max_wait_ms)]
+    print(f"{args.concurrency} clients x {args.requests} requests\n")
+    results = {}
+    for name, batch_size, wait_ms in configs:
+        results[name] = await run_local(model, vectorizer, batch_size, wait_ms,
+                                        args.concurrency, args.requests)
+        print(f"{name:<22} {results[name]}")
+    base, batched = results[configs[0][0]], results[configs[1][0]]
+    print(f"\nThroughput gain: {batched['req_per_sec'] / base['req_per_sec']:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the spam inference server.")
+    parser.add_argument("--url", default=None, help="Test a running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import time
+
+import joblib
+from aiohttp import web
+
+from batch_score import MODEL_PATH, VECTORIZER_PATH, classify
+
+# ----------------------------
+# Micro-batching inference server
+# ----------------------------
+# Concurrent requests are queued and coalesced: the batcher takes whatever is waiting, up
+# to max_batch_size, waiting at most max_wait_ms after the first request for more to arrive.
+# Each batch is one vectorizer.transform + predict_proba call, run in a thread so the event
+# loop keeps accepting requests while sklearn works.
+#
+#   python spam_server.py --port 8080 --max-batch-size 64 --max-wait-ms 5
+#   curl -X POST localhost:8080/predict -d '{"text": "WIN a FREE prize now"}'
+
+
+class MicroBatcher:
+    def __init__(self, model, vectorizer, max_batch_size=64, max_wait_ms=5.0):
+        self.model = model
+        self.vectorizer = vectorizer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = None
+        self.batches = 0
+        self.requests = 0
+        self._task = None
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, text):
+        """Queue one message and wait for its (label, spam_probability)."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Take everything already queued without waiting
+            while len(batch) < self.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                labels, probs = await loop.run_in_executor(
+                    None, classify, self.model, self.vectorizer, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, future), label, prob in zip(batch, labels, probs):
+                if not future.done():
+                    future.set_result((label, prob))
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+def create_app(model, vectorizer, max_batch_size=64, max_wait_ms=5.0):
+    batcher = MicroBatcher(model, vectorizer, max_batch_size, max_wait_ms)
+
+    async def predict(request):
+        try:
+            body = await request.json()
+        except ValueError:  # json.JSONDecodeError, undecodable bytes
+            return web.json_response({"error": "Request body must be JSON"}, status=400)
+        text = body.get("text") if isinstance(body, dict) else None
+        if not isinstance(text, str):
+            return web.json_response({"error": "'text' must be a string"}, status=400)
+        label, prob = await batcher.predict(text)
+        return web.json_response({"label": label, "spam_probability": prob})
+
+    async def stats(request):
+        return web.json_response(batcher.stats())
+
+    async def health(request):
+        return web.json_response({"status": "ok"})
+
+    async def on_startup(app):
+        await batcher.start()
+
+    async def on_cleanup(app):
+        await batcher.stop()
+
+    app = web.Application()
+    app["batcher"] = batcher
+    app.router.add_post("/predict", predict)
+    app.router.add_get("/stats", stats)
+    app.router.add_get("/health", health)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def load_pipeline(model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH):
+    model = joblib.load(model_path, mmap_mode="r")
+    vectorizer = joblib.load(vectorizer_path, mmap_mode="r")
+    classify(model, vectorizer, ["warm up"])
+    return model, vectorizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching spam classification server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    model, vectorizer = load_pipeline()
+    web.run_app(create_app(model, vectorizer, args.max_batch_size, args.max_wait_ms),
+                host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
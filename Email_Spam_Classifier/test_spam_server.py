@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("joblib")
+from aiohttp.test_utils import TestClient, TestServer
+
+from spam_server import create_app
+
+
+class Identity:
+    def transform(self, texts):
+        return texts
+
+
+class KeywordModel:
+    """Spam (0) when the text shouts WIN, ham (1) otherwise; no predict_proba."""
+
+    def predict(self, texts):
+        return [0 if "WIN" in t else 1 for t in texts]
+
+
+def post_predict(**kwargs):
+    async def go():
+        async with TestClient(TestServer(create_app(KeywordModel(), Identity(), max_wait_ms=1))) as client:
+            response = await client.post("/predict", **kwargs)
+            return response.status, await response.json()
+    return asyncio.run(go())
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"data": b"not json"},
+    {"data": b"\xff\xfe"},
+    {"json": ["a list"]},
+    {"json": {"text": 42}},
+    {"json": {}},
+])
+def test_bad_body_is_400(kwargs):
+    status, body = post_predict(**kwargs)
+    assert status == 400
+    assert "error" in body
+
+
+def test_predict():
+    assert post_predict(json={"text": "WIN a FREE prize now"}) == (200, {"label": "spam", "spam_probability": None})
@@ -0,0 +1,71 @@
+import argparse
+import os
+import time
+
+import joblib
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import train_test_split
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from hashing_features import HASHING_PIPELINE_PATH, make_vectorizer
+
+# ----------------------------
+# Retrain the spam model on hashing features
+# ----------------------------
+#   python train_hashing_model.py spam.csv --text-column v2 --label-column v1
+# Labels follow the existing model: 1 = ham, 0 = spam.
+
+RANDOM_STATE = 42
+
+
+def load_dataset(path, text_column, label_column, ham_value):
+    df = pd.read_csv(path, encoding="latin-1", usecols=[text_column, label_column]).dropna()
+    texts = df[text_column].astype(str)
+    labels = (df[label_column].astype(str).str.lower() == ham_value.lower()).astype(int)
+    return texts, labels
+
+
+def split_dataset(texts, labels, test_size=0.2):
+    """Train/test split used for training; benchmark_features.py scores on the same test part."""
+    return train_test_split(texts, labels, test_size=test_size, random_state=RANDOM_STATE, stratify=labels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the spam classifier on hashing features.")
+    parser.add_argument("data", help="CSV with message text and ham/spam labels")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--label-column", default="label")
+    parser.add_argument("--ham-value", default="ham")
+    parser.add_argument("--model", choices=["nb", "logreg"], default="nb")
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--ngram-max", type=int, default=2)
+    parser.add_argument("--tfidf", action="store_true")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("-o", "--output", default=HASHING_PIPELINE_PATH)
+    args = parser.parse_args()
+
+    texts, labels = load_dataset(args.data, args.text_column, args.label_column, args.ham_value)
+    X_train, X_test, y_train, y_test = split_dataset(texts, labels, args.test_size)
+
+    classifier = MultinomialNB(alpha=0.1) if args.model == "nb" else LogisticRegression(max_iter=1000)
+    features = make_vectorizer(args.n_features, (1, args.ngram_max), tfidf=args.tfidf)
+    pipeline = Pipeline([*features.steps, ("model", classifier)])
+
+    start = time.perf_counter()
+    pipeline.fit(X_train, y_train)
+    print(f"✅ Trained on {len(X_train)} messages in {time.perf_counter() - start:.1f}s")
+
+    predictions = pipeline.predict(X_test)
+    print(f"Accuracy: {accuracy_score(y_test, predictions):.4f}")
+    print(classification_report(y_test, predictions, target_names=["spam", "ham"]))
+
+    # Not compressed, so the arrays inside can be memory-mapped on load
+    joblib.dump(pipeline, args.output)
+    print(f"💾 Saved {args.output} ({os.path.getsize(args.output) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
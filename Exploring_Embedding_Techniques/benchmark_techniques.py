@@ -0,0 +1,194 @@
+import argparse
+import json
+import math
+import os
+import pickle
+import resource
+import subprocess
+import sys
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import numpy as np
+from scipy import sparse
+
+from similarity_search import normalize, top_k
+
+# ----------------------------
+# TF-IDF vs Word2Vec vs SBERT
+# ----------------------------
+# Load time, memory, vector size, throughput, STS Spearman and retrieval recall/MRR/nDCG
+# per technique (one subprocess each) on the labeled set in embedding_eval.json.
+#
+#   python w2v_embeddings.py convert            # once, for the word2vec technique
+#   python benchmark_techniques.py --out embedding_report.json
+
+EVAL_PATH = "embedding_eval.json"
+TECHNIQUES = ("tfidf", "word2vec", "sbert")
+SBERT_MODEL = "all-MiniLM-L6-v2"
+
+
+def load_eval(path=EVAL_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def eval_texts(data):
+    sts = [t for pair in data["sts"] for t in (pair["a"], pair["b"])]
+    retrieval = [d["text"] for d in data["retrieval"]["corpus"]] + [q["text"] for q in data["retrieval"]["queries"]]
+    return sts + retrieval
+
+
+# ---- techniques: load -> (encode(texts), info) ----
+def load_tfidf(fit_texts, **_):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer().fit(fit_texts)
+    info = {"dim": len(vectorizer.vocabulary_), "sparse": True,
+            "model_mb": len(pickle.dumps(vectorizer)) / 1e6}
+    return vectorizer.transform, info
+
+
+def load_word2vec(w2v_dir=None, **_):
+    from w2v_embeddings import W2V_DIR, W2VEmbedder
+    w2v = W2VEmbedder.load(w2v_dir or W2V_DIR)
+    return w2v.embed, {"dim": w2v.vector_size, "sparse": False, "model_mb": w2v.vectors.nbytes / 1e6}
+
+
+def load_sbert(sbert_model=SBERT_MODEL, **_):
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(sbert_model, device="cpu")
+    params = sum(p.numel() * p.element_size() for p in model.parameters())
+    encode = lambda texts: model.encode(list(texts), batch_size=64, convert_to_numpy=True)
+    return encode, {"dim": model.get_sentence_embedding_dimension(), "sparse": False, "model_mb": params / 1e6}
+
+
+LOADERS = {"tfidf": load_tfidf, "word2vec": load_word2vec, "sbert": load_sbert}
+
+
+# ---- quality metrics ----
+def pair_cosines(A, B):
+    A, B = normalize(A), normalize(B)
+    if sparse.issparse(A):
+        return np.asarray(A.multiply(B).sum(axis=1)).ravel()
+    return np.einsum("ij,ij->i", A, B)
+
+
+def sts_spearman(encode, pairs):
+    from scipy.stats import spearmanr
+    cosines = pair_cosines(encode([p["a"] for p in pairs]), encode([p["b"] for p in pairs]))
+    return float(spearmanr(cosines, [p["score"] for p in pairs]).correlation)
+
+
+def retrieval_metrics(encode, retrieval, k=10):
+    corpus = retrieval["corpus"]
+    ids = [d["id"] for d in corpus]
+    idx, _ = top_k(encode([q["text"] for q in retrieval["queries"]]),
+                   corpus=encode([d["text"] for d in corpus]), k=k)
+    recall1 = recall5 = mrr = ndcg = 0.0
+    for query, row in zip(retrieval["queries"], idx):
+        relevant = set(query["relevant"])
+        ranked = [ids[i] for i in row]
+        hits = [doc in relevant for doc in ranked]
+        recall1 += len(relevant & set(ranked[:1])) / len(relevant)
+        recall5 += len(relevant & set(ranked[:5])) / len(relevant)
+        mrr += next((1.0 / (rank + 1) for rank, hit in enumerate(hits) if hit), 0.0)
+        dcg = sum(1.0 / math.log2(rank + 2) for rank, hit in enumerate(hits) if hit)
+        ideal = sum(1.0 / math.log2(rank + 2) for rank in range(min(len(relevant), k)))
+        ndcg += dcg / ideal
+    n = len(retrieval["queries"])
+    return {"recall@1": recall1 / n, "recall@5": recall5 / n, "mrr@10": mrr / n, "ndcg@10": ndcg / n}
+
+
+# ---- one technique, inside the worker process ----
+def measure(technique, eval_path=EVAL_PATH, throughput_texts=5000, **options):
+    data = load_eval(eval_path)
+    texts = eval_texts(data)
+
+    start = time.perf_counter()
+    encode, info = LOADERS[technique](fit_texts=texts, **options)
+    encode(texts[:2])  # first call pays for lazy initialisation
+    load_s = time.perf_counter() - start
+    startup_s = time.perf_counter() - _PROCESS_START
+
+    corpus = [texts[i % len(texts)] for i in range(throughput_texts)]
+    fit_s = None
+    if technique == "tfidf":  # fitting is part of the cost of using TF-IDF on a new corpus
+        start = time.perf_counter()
+        load_tfidf(corpus)
+        fit_s = time.perf_counter() - start
+    start = time.perf_counter()
+    vectors = encode(corpus)
+    encode_s = time.perf_counter() - start
+
+    if sparse.issparse(vectors):
+        bytes_per_vector = (vectors.data.nbytes + vectors.indices.nbytes) / vectors.shape[0]
+    else:
+        bytes_per_vector = vectors.shape[1] * 4  # stored as float32
+
+    return {
+        "technique": technique,
+        **info,
+        "load_s": load_s,
+        "startup_s": startup_s,
+        "fit_s": fit_s,
+        "encode_per_sec": len(corpus) / encode_s,
+        "bytes_per_vector": bytes_per_vector,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+        "sts_spearman": sts_spearman(encode, data["sts"]),
+        **retrieval_metrics(encode, data["retrieval"]),
+    }
+
+
+def run_worker(technique, args):
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", technique, "--eval", args.eval,
+           "--throughput-texts", str(args.throughput_texts), "--sbert-model", args.sbert_model]
+    if args.w2v_dir:
+        cmd += ["--w2v-dir", args.w2v_dir]
+    out = subprocess.run(cmd, capture_output=True, text=True)
+    if out.returncode != 0:
+        print(f"❌ {technique} failed:\n{out.stderr.strip()[-2000:]}")
+        return None
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def print_report(rows):
+    print(f"\n{'technique':<10}{'dim':>8}{'model MB':>10}{'B/vec':>8}{'load s':>8}{'enc/s':>9}{'RSS MB':>8}"
+          f"{'STS ρ':>8}{'R@1':>7}{'R@5':>7}{'MRR':>7}{'nDCG':>7}")
+    for r in rows:
+        print(f"{r['technique']:<10}{r['dim']:>8}{r['model_mb']:>10.1f}{r['bytes_per_vector']:>8.0f}"
+              f"{r['load_s']:>8.2f}{r['encode_per_sec']:>9.0f}{r['peak_rss_mb']:>8.0f}{r['sts_spearman']:>8.3f}"
+              f"{r['recall@1']:>7.2f}{r['recall@5']:>7.2f}{r['mrr@10']:>7.2f}{r['ndcg@10']:>7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TF-IDF, Word2Vec and SBERT embeddings.")
+    parser.add_argument("--techniques", nargs="+", default=list(TECHNIQUES), choices=list(TECHNIQUES))
+    parser.add_argument("--eval", default=EVAL_PATH)
+    parser.add_argument("--throughput-texts", type=int, default=5000)
+    parser.add_argument("--w2v-dir", default=None)
+    parser.add_argument("--sbert-model", default=SBERT_MODEL)
+    parser.add_argument("--out", default=None, help="Write the results as JSON")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.eval, args.throughput_texts,
+                                 w2v_dir=args.w2v_dir, sbert_model=args.sbert_model)))
+        return
+
+    rows = []
+    for technique in args.techniques:
+        print(f"🔍 Measuring {technique}...")
+        result = run_worker(technique, args)
+        if result:
+            rows.append(result)
+
+    print_report(rows)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
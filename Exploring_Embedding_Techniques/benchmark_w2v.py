@@ -0,0 +1,69 @@
+import argparse
+import time
+
+import numpy as np
+
+from w2v_embeddings import W2V_DIR, W2VEmbedder, download_source
+
+# ----------------------------
+# Word2Vec: per-sentence loop vs sparse segment mean
+# ----------------------------
+# Compares load time (gensim binary parse vs memory-mapped .npy) and corpus embedding
+# throughput (the notebook's get_w2v_embedding loop vs W2VEmbedder.embed) on a seeded
+# synthetic corpus drawn from the vocabulary, and checks both give the same vectors.
+#
+#   python w2v_embeddings.py convert && python benchmark_w2v.py --sentences 100000
+
+
+def synthetic_corpus(vocab, n, min_len=5, max_len=30, oov_rate=0.1, seed=0):
+    rng = np.random.default_rng(seed)
+    words = np.asarray(vocab[:50_000])  # frequent words, like real text
+    corpus = []
+    for length in rng.integers(min_len, max_len + 1, size=n):
+        tokens = list(rng.choice(words, size=length))
+        for i in np.flatnonzero(rng.random(length) < oov_rate):
+            tokens[i] = "qzxoov"  # unknown word, skipped by both versions
+        corpus.append(" ".join(tokens))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Word2Vec sentence embedding.")
+    parser.add_argument("--dir", default=W2V_DIR)
+    parser.add_argument("--sentences", type=int, default=50_000)
+    parser.add_argument("--gensim-load", action="store_true", help="Also time the original binary parse")
+    args = parser.parse_args()
+
+    if args.gensim_load:
+        from gensim.models import KeyedVectors
+        start = time.perf_counter()
+        KeyedVectors.load_word2vec_format(download_source(), binary=True)
+        print(f"⏱️ gensim load_word2vec_format: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    w2v = W2VEmbedder.load(args.dir)
+    print(f"⏱️ memory-mapped load:          {time.perf_counter() - start:.2f}s")
+
+    vocab = [None] * len(w2v.index)
+    for word, i in w2v.index.items():
+        vocab[i] = word
+    # Keep only lowercase words so the notebook's .lower() tokenization finds them
+    corpus = synthetic_corpus([w for w in vocab if w == w.lower()], args.sentences)
+    tokens = sum(len(t.split()) for t in corpus)
+
+    start = time.perf_counter()
+    looped = w2v.embed_loop(corpus)
+    loop_s = time.perf_counter() - start
+    start = time.perf_counter()
+    vectorized = w2v.embed(corpus)
+    vec_s = time.perf_counter() - start
+
+    print(f"\n{len(corpus):,} sentences, {tokens:,} tokens")
+    print(f"{'method':<22}{'seconds':>9}{'sentences/s':>14}")
+    print(f"{'per-sentence loop':<22}{loop_s:>9.2f}{len(corpus) / loop_s:>14,.0f}")
+    print(f"{'sparse segment mean':<22}{vec_s:>9.2f}{len(corpus) / vec_s:>14,.0f}")
+    print(f"\n✅ {loop_s / vec_s:.1f}x faster, max |diff| = {np.abs(looped - vectorized).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+# ----------------------------
+# Blocked top-k cosine similarity
+# ----------------------------
+# cosine_similarity(X) builds the full N x N matrix: fine for three sentences, out of memory
+# at 100k documents. Here rows are L2-normalised once (float32, CSR stays CSR), then query
+# rows are processed in blocks: one GEMM gives a (block, N) score slab, argpartition picks
+# the k best per row and only those are kept. Peak extra memory is block_size x N x 4 bytes
+# per worker, whatever the number of queries. Blocks can run on a thread pool (BLAS and
+# argpartition release the GIL).
+#
+#   from similarity_search import top_k
+#   idx, scores = top_k(tfidf.fit_transform(texts), k=5)          # sparse, no .toarray()
+#   idx, scores = top_k(queries, corpus=embeddings, k=10, workers=4)
+#
+#   python similarity_search.py --n 100000 --dim 384 --k 10 --workers 4   # benchmark
+
+DEFAULT_BLOCK_MB = 256
+
+
+def normalize(X):
+    """Unit-length rows as float32 (zero rows stay zero). Sparse input stays CSR."""
+    if sparse.issparse(X):
+        X = sparse.csr_matrix(X, dtype=np.float32)
+        norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms).astype(np.float32) @ X
+    X = np.array(X, dtype=np.float32)  # copy: callers' arrays are not modified
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    X /= norms
+    return X
+
+
+def auto_block_size(n_corpus, max_block_mb=DEFAULT_BLOCK_MB):
+    """Rows per block so one float32 (block, n_corpus) score slab stays under max_block_mb."""
+    return max(1, int(max_block_mb * 1e6 // (4 * max(n_corpus, 1))))
+
+
+def _scores(Q, C_T):
+    """Dense float32 (block, N) scores for dense or sparse operands."""
+    S = Q @ C_T
+    if sparse.issparse(S):
+        S = S.toarray()  # only the (block, N) slab, never the input matrices
+    return np.asarray(S, dtype=np.float32)
+
+
+def _block_top_k(S, k):
+    if k < S.shape[1]:
+        idx = np.argpartition(-S, k - 1, axis=1)[:, :k]
+    else:
+        idx = np.broadcast_to(np.arange(S.shape[1]), S.shape).copy()
+    scores = np.take_along_axis(S, idx, axis=1)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def top_k(queries, corpus=None, k=10, block_size=None, workers=1, exclude_self=None, normalized=False):
+    """(indices, scores) of the k most cosine-similar corpus rows for every query row.
+
+    With corpus=None the queries are searched against themselves and, unless
+    exclude_self=False, each row's own index is left out.
+    """
+    self_search = corpus is None
+    exclude_self = self_search if exclude_self is None else exclude_self
+    Q = queries if normalized else normalize(queries)
+    C = Q if self_search else (corpus if normalized else normalize(corpus))
+    if sparse.issparse(Q) != sparse.issparse(C):  # mixed inputs: compare densely
+        Q = Q.toarray() if sparse.issparse(Q) else Q
+        C = C.toarray() if sparse.issparse(C) else C
+    C_T = C.T.tocsc() if sparse.issparse(C) else C.T
+
+    n, n_corpus = Q.shape[0], C.shape[0]
+    k = min(k, n_corpus - 1 if exclude_self else n_corpus)
+    block_size = block_size or auto_block_size(n_corpus)
+    indices = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype=np.float32)
+
+    def run(start):
+        stop = min(start + block_size, n)
+        S = _scores(Q[start:stop], C_T)
+        if exclude_self:
+            rows = np.arange(stop - start)
+            S[rows, start + rows] = -np.inf
+        indices[start:stop], scores[start:stop] = _block_top_k(S, k)
+
+    starts = range(0, n, block_size)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, starts))
+    else:
+        for start in starts:
+            run(start)
+    return indices, scores
+
+
+def brute_force_top_k(X, k, exclude_self=True):
+    """Full N x N reference, for checking top_k on small inputs."""
+    Xn = normalize(X)
+    S = _scores(Xn, Xn.T)
+    if exclude_self:
+        np.fill_diagonal(S, -np.inf)
+    return _block_top_k(S, k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark blocked top-k cosine search.")
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--block-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sparse", action="store_true", help="Random sparse TF-IDF-like input")
+    parser.add_argument("--density", type=float, default=0.001)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.sparse:
+        X = sparse.random(args.n, args.dim * 100, density=args.density, format="csr", dtype=np.float32,
+                          random_state=0)
+    else:
+        X = rng.standard_normal((args.n, args.dim), dtype=np.float32)
+
+    # Correctness on a slice small enough for the full matrix
+    small = X[:2000]
+    idx, _ = top_k(small, k=args.k, block_size=256, workers=args.workers)
+    ref, _ = brute_force_top_k(small, args.k)
+    agreement = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(idx, ref)])
+    print(f"✅ agreement with full-matrix top-{args.k} on 2,000 rows: {agreement:.4f}")
+
+    block_size = args.block_size or auto_block_size(args.n)
+    full_gb = args.n * args.n * 4 / 1e9
+    print(f"🔍 n={args.n:,} ({'sparse' if args.sparse else f'dense {args.dim}-d'}), block {block_size} rows "
+          f"→ {block_size * args.n * 4 / 1e6:.0f} MB per slab (full matrix would be {full_gb:.1f} GB)")
+    for workers in sorted({1, args.workers}):
+        start = time.perf_counter()
+        top_k(X, k=args.k, block_size=block_size, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️ workers={workers}: {elapsed:.2f}s ({args.n / elapsed:,.0f} queries/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from scipy import sparse
+
+# ----------------------------
+# Memory-mapped Word2Vec sentence embeddings
+# ----------------------------
+# KeyedVectors.load_word2vec_format re-parses the 300k x 300 binary on every kernel start.
+# `convert` does that once and writes the vectors as a plain float32 .npy (opened with
+# mmap_mode="r", so loading is near-instant and pages are shared between processes) plus
+# the vocabulary. Corpora are embedded without a per-sentence loop: every text becomes a
+# list of word ids, all ids go into one CSR matrix whose row i holds 1/len(i) at the ids
+# of text i, and a single sparse @ dense product gives every sentence mean.
+#
+#   python w2v_embeddings.py convert                   # kagglehub download -> w2v_slim300k/
+#
+#   from w2v_embeddings import W2VEmbedder
+#   w2v = W2VEmbedder.load()
+#   w2v_embeddings = w2v.embed(texts)                  # same result as get_w2v_embedding
+
+W2V_DIR = "w2v_slim300k"
+KAGGLE_DATASET = "stoicstatic/word2vecslim300k"
+BIN_NAME = "GoogleNews-vectors-negative300-SLIM.bin"
+
+
+def download_source():
+    import kagglehub
+    return os.path.join(kagglehub.dataset_download(KAGGLE_DATASET), BIN_NAME)
+
+
+def convert(bin_path=None, out_dir=W2V_DIR):
+    """Parse the word2vec binary once; write vectors.npy (float32) and vocab.json."""
+    from gensim.models import KeyedVectors
+    bin_path = bin_path or download_source()
+    kv = KeyedVectors.load_word2vec_format(bin_path, binary=True)
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "vectors.npy"), np.ascontiguousarray(kv.vectors, dtype=np.float32))
+    with open(os.path.join(out_dir, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(kv.index_to_key, f, ensure_ascii=False)
+    return out_dir
+
+
+def tokenize(text):
+    # Same tokenization as the notebook's get_w2v_embedding
+    return text.lower().split()
+
+
+class W2VEmbedder:
+    def __init__(self, vectors, vocab):
+        self.vectors = vectors
+        self.index = {word: i for i, word in enumerate(vocab)}
+        self.vector_size = vectors.shape[1]
+
+    @classmethod
+    def load(cls, directory=W2V_DIR, mmap=True):
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r" if mmap else None)
+        with open(os.path.join(directory, "vocab.json"), encoding="utf-8") as f:
+            vocab = json.load(f)
+        return cls(vectors, vocab)
+
+    def __contains__(self, word):
+        return word in self.index
+
+    def mean_matrix(self, texts):
+        """CSR (len(texts), vocab) with 1/n at the n known word ids of each text (n counted with repeats)."""
+        lookup = self.index.get
+        ids, lengths = [], []
+        for text in texts:
+            row = [i for i in map(lookup, tokenize(text)) if i is not None]
+            ids.extend(row)
+            lengths.append(len(row))
+        lengths = np.asarray(lengths, dtype=np.int64)
+        indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        # Each entry is 1/len(row); empty rows have no entries and end up as zero vectors
+        data = np.repeat(1.0 / np.maximum(lengths, 1), lengths).astype(np.float32)
+        return sparse.csr_matrix((data, np.asarray(ids, dtype=np.int64), indptr),
+                                 shape=(len(lengths), len(self.index)))
+
+    def embed(self, texts, batch_size=100_000):
+        """(len(texts), 300) float32 sentence means; rows touch only the vectors they use."""
+        texts = list(texts)
+        out = np.empty((len(texts), self.vector_size), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            out[start:start + batch_size] = self.mean_matrix(texts[start:start + batch_size]) @ self.vectors
+        return out
+
+    def embed_loop(self, texts):
+        """The notebook's per-sentence version, kept as the benchmark baseline."""
+        rows = []
+        for text in texts:
+            word_vecs = [self.vectors[self.index[w]] for w in tokenize(text) if w in self.index]
+            rows.append(np.mean(word_vecs, axis=0) if word_vecs else np.zeros(self.vector_size))
+        return np.array(rows, dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert Word2Vec to a memory-mapped format.")
+    parser.add_argument("command", choices=["convert"])
+    parser.add_argument("--bin", default=None, help=f"word2vec .bin (default: download {KAGGLE_DATASET})")
+    parser.add_argument("--out", default=W2V_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    out_dir = convert(args.bin, args.out)
+    size = sum(os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir)) / 1e6
+    print(f"✅ Converted in {time.perf_counter() - start:.1f}s → {out_dir}/ ({size:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,24 @@
+import os
+import sys
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 import tensorflow as tf
-from tensorflow.keras.models import load_model
 
-# Load trained generator model
-generator = load_model("dcgan_generator.keras")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:  # model_registry.py lives one level up
+    sys.path.append(REPO_ROOT)
+from model_registry import get_model, keras_loader, model_metrics
+
+# Load trained generator model (once per process, warmed up with one forward pass)
+generator = get_model("dcgan_generator", keras_loader("dcgan_generator.keras"),
+                      warmup=lambda g: g(tf.zeros([1, 100]), training=False))
+
+from generate import make_sampler, generate, tile
+from latent_bank import LatentBank, FrameCache, render_path
+
+# Compiled uint8 sampler, traced once per process like the generator itself
+sampler = get_model("dcgan_sampler", lambda: make_sampler(generator))
 
 st.title("🎨 DCGAN MNIST Generator")
 
@@ -17,3 +30,54 @@ if st.button("Generate Digit"):
     generated_image = (generated_image + 1.0) / 2.0
 
     st.image(generated_image.numpy(), caption="Generated Digit", width=200, clamp=True)
+
+st.subheader("Batch of digits")
+col1, col2 = st.columns(2)
+num_images = col1.number_input("Number of digits", 1, 1024, 64)
+seed = col2.number_input("Seed", 0, 2**31 - 1, 0)
+if st.button("Generate Grid"):
+    images = np.concatenate([batch for _, _, batch in generate(sampler, num_images, batch_size=256, seed=seed)])
+    st.image(tile(images), caption=f"{num_images} digits (seed {seed})", clamp=True)
+
+# ---- Latent-space explorer ----
+@st.cache_resource
+def init_bank(size=1024, seed=0):
+    return LatentBank().ensure(sampler, size, seed)
+
+
+@st.cache_resource
+def init_frame_cache():
+    return FrameCache(max_frames=4096)
+
+
+st.subheader("🧭 Latent-space explorer")
+bank = init_bank()
+frame_cache = init_frame_cache()
+
+# Bank thumbnails come straight from the memory-mapped images: no forward pass
+page = st.number_input("Bank page", 0, len(bank) // 64 - 1 if len(bank) >= 64 else 0, 0)
+st.image(tile(np.asarray(bank.images[page * 64:(page + 1) * 64]), cols=16),
+         caption=f"Bank entries {page * 64}–{min((page + 1) * 64, len(bank)) - 1}", clamp=True)
+
+keyframes_text = st.text_input("Walk through bank indices", "0, 1, 2")
+mode = st.radio("Interpolation", ["spherical", "linear"], horizontal=True)
+steps = st.slider("Frames per segment", 2, 64, 16)
+try:
+    keyframes = [int(k) for k in keyframes_text.replace(" ", "").split(",") if k]
+except ValueError:
+    keyframes = []
+keyframes = [k for k in keyframes if 0 <= k < len(bank)]
+
+if len(keyframes) >= 2:
+    # Whole path rendered in one batched call, then served from the LRU while scrubbing
+    frames = render_path(sampler, bank, keyframes, steps, mode, cache=frame_cache)
+    frame = st.slider("Frame", 0, len(frames) - 1, 0)
+    st.image(frames[frame], caption=f"Frame {frame + 1}/{len(frames)}", width=200, clamp=True)
+    with st.expander("All frames"):
+        st.image(tile(frames, cols=steps), clamp=True)
+else:
+    st.info("Enter at least two valid bank indices, e.g. `3, 17, 42`.")
+
+with st.sidebar.expander("⚙️ Model load metrics"):
+    st.json(model_metrics("dcgan_generator"))
+    st.write("Frame cache:", frame_cache.stats())
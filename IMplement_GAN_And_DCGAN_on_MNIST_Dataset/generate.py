@@ -0,0 +1,149 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:  # model_registry.py lives one level up
+    sys.path.append(REPO_ROOT)
+from model_registry import get_model, keras_loader
+
+# ----------------------------
+# Bulk DCGAN sample generation
+# ----------------------------
+# Latents come from one seeded numpy stream consumed in order, so image i is the same
+# for a given seed whatever the batch size. Each batch is one compiled generator call;
+# outputs are converted to uint8 with array ops and written straight into a memory-mapped
+# .npy (or tiled into a PNG grid) — there is no per-image Python loop.
+#
+#   python generate.py -n 60000 --batch-size 1024 --seed 0 -o synthetic.npy --save-latents
+#   python generate.py -n 64 --grid grid.png
+#   python generate.py --benchmark
+
+LATENT_DIM = 100
+IMAGE_SHAPE = (28, 28)
+GENERATOR_PATH = "dcgan_generator.keras"
+
+
+def load_generator(path=GENERATOR_PATH):
+    import tensorflow as tf
+    return get_model("dcgan_generator", keras_loader(path),
+                     warmup=lambda g: g(tf.zeros([1, LATENT_DIM]), training=False))
+
+
+def make_sampler(generator):
+    """Compiled latents -> uint8 images function; one trace serves every batch size."""
+    import tensorflow as tf
+
+    @tf.function(input_signature=[tf.TensorSpec([None, LATENT_DIM], tf.float32)])
+    def sample(z):
+        images = generator(z, training=False)[..., 0]  # tanh output in [-1, 1]
+        return tf.cast(tf.clip_by_value(tf.round((images + 1.0) * 127.5), 0.0, 255.0), tf.uint8)
+
+    return lambda z: sample(z).numpy()
+
+
+def latent_stream(seed, n, batch_size):
+    """Yield (start, latents) batches of float32 N(0, 1) vectors from a single seeded stream."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, batch_size):
+        yield start, rng.standard_normal((min(batch_size, n - start), LATENT_DIM), dtype=np.float32)
+
+
+def generate(sampler, n, batch_size=512, seed=0):
+    """Yield (start, latents, uint8 images) for `n` samples."""
+    for start, z in latent_stream(seed, n, batch_size):
+        yield start, z, sampler(z)
+
+
+def write_npy(sampler, path, n, batch_size=512, seed=0, latents_path=None):
+    """Stream `n` samples into a (n, 28, 28) uint8 .npy, optionally with their latents."""
+    images = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(n,) + IMAGE_SHAPE)
+    latents = None
+    if latents_path:
+        latents = np.lib.format.open_memmap(latents_path, mode="w+", dtype=np.float32, shape=(n, LATENT_DIM))
+    for start, z, batch in generate(sampler, n, batch_size, seed):
+        images[start:start + len(batch)] = batch
+        if latents is not None:
+            latents[start:start + len(z)] = z
+    images.flush()
+    if latents is not None:
+        latents.flush()
+    return images
+
+
+def tile(images, cols=None, pad=2):
+    """(n, h, w) uint8 -> one (rows*(h+pad)-pad, cols*(w+pad)-pad) grid via reshape/transpose."""
+    n, h, w = images.shape
+    cols = cols or int(np.ceil(np.sqrt(n)))
+    rows = int(np.ceil(n / cols))
+    grid = np.zeros((rows * cols, h + pad, w + pad), dtype=np.uint8)
+    grid[:n, :h, :w] = images
+    grid = grid.reshape(rows, cols, h + pad, w + pad).transpose(0, 2, 1, 3)
+    return grid.reshape(rows * (h + pad), cols * (w + pad))[:-pad or None, :-pad or None]
+
+
+def write_grid(sampler, path, n, batch_size=512, seed=0, cols=None):
+    from PIL import Image
+    images = np.empty((n,) + IMAGE_SHAPE, dtype=np.uint8)
+    for start, _, batch in generate(sampler, n, batch_size, seed):
+        images[start:start + len(batch)] = batch
+    Image.fromarray(tile(images, cols)).save(path)
+    return path
+
+
+def benchmark(sampler, batch_sizes=None, min_images=4096, seed=0):
+    """images/sec for each batch size (1, 2, 4 ... 4096), generation + uint8 conversion."""
+    batch_sizes = batch_sizes or [2 ** i for i in range(13)]
+    results = []
+    for batch_size in batch_sizes:
+        n = max(min_images, batch_size * 4)
+        sampler(np.zeros((batch_size, LATENT_DIM), dtype=np.float32))  # warm up this shape
+        start = time.perf_counter()
+        for _ in generate(sampler, n, batch_size, seed):
+            pass
+        elapsed = time.perf_counter() - start
+        results.append({"batch_size": batch_size, "images": n, "seconds": elapsed,
+                        "images_per_sec": n / elapsed})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate MNIST digits with the DCGAN generator.")
+    parser.add_argument("-n", "--num-images", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=None, help="uint8 .npy of shape (n, 28, 28)")
+    parser.add_argument("--save-latents", action="store_true", help="Also write <output>_latents.npy")
+    parser.add_argument("--grid", default=None, help="PNG grid of the generated digits")
+    parser.add_argument("--cols", type=int, default=None)
+    parser.add_argument("--benchmark", action="store_true", help="images/sec for batch sizes 1..4096")
+    parser.add_argument("--model", default=GENERATOR_PATH)
+    args = parser.parse_args()
+    if not (args.output or args.grid or args.benchmark):
+        parser.error("give --output, --grid or --benchmark")
+
+    sampler = make_sampler(load_generator(args.model))
+
+    if args.benchmark:
+        print(f"{'batch':>6}{'images':>8}{'seconds':>10}{'images/sec':>13}")
+        for r in benchmark(sampler):
+            print(f"{r['batch_size']:>6}{r['images']:>8}{r['seconds']:>10.2f}{r['images_per_sec']:>13.0f}")
+
+    if args.output:
+        latents_path = os.path.splitext(args.output)[0] + "_latents.npy" if args.save_latents else None
+        start = time.perf_counter()
+        write_npy(sampler, args.output, args.num_images, args.batch_size, args.seed, latents_path)
+        elapsed = time.perf_counter() - start
+        print(f"✅ {args.num_images} images → {args.output} in {elapsed:.2f}s "
+              f"({args.num_images / elapsed:.0f} images/sec, seed {args.seed})")
+
+    if args.grid:
+        write_grid(sampler, args.grid, args.num_images, args.batch_size, args.seed, args.cols)
+        print(f"✅ Grid of {args.num_images} digits → {args.grid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from generate import GENERATOR_PATH, LATENT_DIM, write_npy
+
+# ----------------------------
+# Latent bank + interpolation for the DCGAN explorer
+# ----------------------------
+# The bank is a fixed, seeded set of latents and their rendered digits, written once with
+# generate.write_npy and opened memory-mapped afterwards (browsing it costs no forward
+# passes). Interpolation paths between bank entries - linear or spherical - are rendered
+# as one batched generator call, and rendered paths are kept in an LRU so scrubbing back
+# and forth never re-renders.
+#
+#   python latent_bank.py --size 4096 --seed 0      # build / rebuild latent_bank/
+
+BANK_DIR = "latent_bank"
+
+
+class LatentBank:
+    def __init__(self, directory=BANK_DIR):
+        self.directory = directory
+        self.latents_path = os.path.join(directory, "latents.npy")
+        self.images_path = os.path.join(directory, "images.npy")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.latents = None
+        self.images = None
+
+    def _expected_meta(self, size, seed, model_path):
+        return {"size": size, "seed": seed,
+                "model_mtime": os.path.getmtime(model_path) if os.path.exists(model_path) else None}
+
+    def is_current(self, size, seed, model_path=GENERATOR_PATH):
+        if not (os.path.exists(self.meta_path) and os.path.exists(self.images_path)):
+            return False
+        with open(self.meta_path, encoding="utf-8") as f:
+            return json.load(f) == self._expected_meta(size, seed, model_path)
+
+    def build(self, sampler, size=1024, seed=0, batch_size=512, model_path=GENERATOR_PATH):
+        os.makedirs(self.directory, exist_ok=True)
+        write_npy(sampler, self.images_path, size, batch_size, seed, latents_path=self.latents_path)
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump(self._expected_meta(size, seed, model_path), f)
+        return self.open()
+
+    def open(self):
+        self.latents = np.load(self.latents_path, mmap_mode="r")
+        self.images = np.load(self.images_path, mmap_mode="r")
+        return self
+
+    def ensure(self, sampler, size=1024, seed=0, model_path=GENERATOR_PATH):
+        """Open the bank, (re)building it first if missing or made with other settings/weights."""
+        if self.is_current(size, seed, model_path):
+            return self.open()
+        print(f"🔍 Building latent bank ({size} latents, seed {seed})...")
+        return self.build(sampler, size, seed, model_path=model_path)
+
+    def __len__(self):
+        return 0 if self.latents is None else len(self.latents)
+
+
+# ---- interpolation (vectorized over all frames) ----
+def lerp(z0, z1, ts):
+    ts = np.asarray(ts, dtype=np.float32)[:, None]
+    return (1.0 - ts) * z0 + ts * z1
+
+
+def slerp(z0, z1, ts):
+    """Spherical interpolation; keeps the path near the Gaussian shell where the generator was trained."""
+    ts = np.asarray(ts, dtype=np.float32)[:, None]
+    u0, u1 = z0 / np.linalg.norm(z0), z1 / np.linalg.norm(z1)
+    omega = np.arccos(np.clip(np.dot(u0, u1), -1.0, 1.0))
+    if omega < 1e-4:  # (anti)parallel: fall back to lerp
+        return lerp(z0, z1, ts[:, 0])
+    return (np.sin((1.0 - ts) * omega) * z0 + np.sin(ts * omega) * z1) / np.sin(omega)
+
+
+INTERPOLATORS = {"linear": lerp, "spherical": slerp}
+
+
+def path_latents(latents, keyframes, steps=16, mode="spherical"):
+    """Latents walking through `keyframes` (bank indices), `steps` frames per segment."""
+    interpolate = INTERPOLATORS[mode]
+    ts = np.linspace(0.0, 1.0, steps, endpoint=False, dtype=np.float32)
+    segments = [interpolate(np.asarray(latents[a], dtype=np.float32), np.asarray(latents[b], dtype=np.float32), ts)
+                for a, b in zip(keyframes[:-1], keyframes[1:])]
+    segments.append(np.asarray(latents[keyframes[-1]], dtype=np.float32)[None, :])
+    return np.concatenate(segments).astype(np.float32)
+
+
+class FrameCache:
+    """LRU of rendered paths, bounded by total frames kept."""
+
+    def __init__(self, max_frames=4096):
+        self.max_frames = max_frames
+        self._paths = OrderedDict()
+        self._frames = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            frames = self._paths.get(key)
+            if frames is None:
+                self.misses += 1
+                return None
+            self._paths.move_to_end(key)
+            self.hits += 1
+            return frames
+
+    def put(self, key, frames):
+        with self._lock:
+            if key in self._paths:
+                self._frames -= len(self._paths.pop(key))
+            self._paths[key] = frames
+            self._frames += len(frames)
+            while self._frames > self.max_frames and len(self._paths) > 1:
+                _, evicted = self._paths.popitem(last=False)
+                self._frames -= len(evicted)
+
+    def stats(self):
+        return {"paths": len(self._paths), "frames": self._frames, "hits": self.hits, "misses": self.misses}
+
+
+def render_path(sampler, bank, keyframes, steps=16, mode="spherical", cache=None):
+    """uint8 frames (F, 28, 28) for a walk through `keyframes`, in one generator call."""
+    key = (tuple(int(k) for k in keyframes), steps, mode)
+    if cache is not None:
+        frames = cache.get(key)
+        if frames is not None:
+            return frames
+    frames = sampler(path_latents(bank.latents, keyframes, steps, mode))
+    if cache is not None:
+        cache.put(key, frames)
+    return frames
+
+
+def main():
+    from generate import load_generator, make_sampler
+
+    parser = argparse.ArgumentParser(description="Build the DCGAN latent bank.")
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--dir", default=BANK_DIR)
+    parser.add_argument("--model", default=GENERATOR_PATH)
+    args = parser.parse_args()
+
+    sampler = make_sampler(load_generator(args.model))
+    bank = LatentBank(args.dir).build(sampler, args.size, args.seed, args.batch_size, args.model)
+    print(f"✅ Latent bank with {len(bank)} entries ({LATENT_DIM}-d) → {args.dir}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,15 @@
 import os
-from langchain_community.vectorstores import FAISS
 from langchain.chains import create_history_aware_retriever, create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
+from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
-from langchain_community.document_loaders import UnstructuredPDFLoader
+from rag_tracing import StageTracer, TimedEmbeddings
+from local_embeddings import get_embeddings
+from sharded_retriever import ShardRouter, ShardedRetriever, build_shards, parse_filters
 
 
 
@@ -27,54 +26,27 @@ import os
 API_TOKEN = os.getenv("Goggle_Api_Key")
 
 # ----------------------------
-# Load PDF and Create Vector Store
-# ---------------------------- for the loading one pdf
-# try:
-#     loader = PyPDFLoader("mypdf.pdf")
-#     documents = loader.load()
-# except Exception as e:
-#     print(f"Error loading PDF. Make sure 'mypdf.pdf' is in the directory.")
-#     print(f"Error: {e}")
-#     # Create a dummy document to allow the script to run for demonstration
-#     from langchain_core.documents import Document
-#     documents = [Document(page_content="This is a dummy document. Replace mypdf.pdf with your own file to get real answers.")]
-
-# try:
+# Load PDFs and Create Vector Store
+# ----------------------------
 pdf_paths = ["Computer_Network.pdf", "Insights_on_Computer_Networks_1680315871004.pdf"]  # List your PDF files here
-#     documents = []
-#     for path in pdf_paths:
-#         loader = UnstructuredPDFLoader(path)
-#         loaded_docs = loader.load()
-#         for doc in loaded_docs:
-#             doc.metadata["source"] = path
-#         documents.extend(loaded_docs)
-# except Exception as e:
-#     print(f"Error loading PDFs. Make sure the files exist in the directory.")
-#     print(f"Error: {e}")
-#     from langchain_core.documents import Document
-#     documents = [Document(page_content="This is a dummy document. Replace PDFs with your own files to get real answers.")]
-
-# 2nd try
-documents = []
-
-for path in pdf_paths:
-    try:
-        print(f"🔍 Loading: {path}")
-        loader = UnstructuredPDFLoader(path)
-        loaded_docs = loader.load()
-        print(f"✅ Loaded {len(loaded_docs)} pages from {path}")
-        for doc in loaded_docs:
-            doc.metadata["source"] = path
-        documents.extend(loaded_docs)
-    except Exception as e:
-        print(f"❌ Failed to load {path}: {e}")
-
-splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-docs = splitter.split_documents(documents)
-
-embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-vector_store = FAISS.from_documents(docs, embedding=embeddings)
-retriever = vector_store.as_retriever(search_kwargs={"k": 5})
+
+# Per-stage timings for every turn go to rag_traces.jsonl (summarize with: python rag_tracing.py)
+session_id = "my_chat_session_123"
+tracer = StageTracer("rag_traces.jsonl", session_id=session_id)
+
+# EMBEDDING_BACKEND=google|local|onnx|onnx-int8 (see local_embeddings.py); local ones run offline
+embeddings = TimedEmbeddings(get_embeddings(), tracer=tracer)
+# Structure-aware chunks with page/section metadata (see chunker.py).
+# Each PDF gets its own persisted FAISS shard (per embedding backend); only pages that changed
+# are re-embedded. A query searches only the shards it is routed to (see sharded_retriever.py).
+# Optional tags per PDF let the user restrict a question with "tag:<name>".
+pdf_tags = {
+    "Computer_Network.pdf": ["networking", "textbook"],
+    "Insights_on_Computer_Networks_1680315871004.pdf": ["networking", "notes"],
+}
+shards_dir = f"faiss_shards_{os.getenv('EMBEDDING_BACKEND', 'google').lower()}"
+shards = build_shards(pdf_paths, embeddings, base_dir=shards_dir, tags=pdf_tags)
+retriever = ShardedRetriever(router=ShardRouter(shards, max_shards=2), embeddings=embeddings, k=5)
 
 # ----------------------------
 # Build LLM and Chains using modern LCEL
@@ -150,9 +122,8 @@ conversational_rag_chain = RunnableWithMessageHistory(
 # Chat Section
 # ----------------------------
 print("\n--- Conversational RAG Ready ---")
-print("Type your question or message. Type 'exit' to quit.\n")
-
-session_id = "my_chat_session_123"
+print("Type your question or message. Type 'exit' to quit.")
+print("Narrow the search with source:<file.pdf>, pages:<from>-<to> or tag:<name>.\n")
 
 while True:
     user_input = input("You: ")
@@ -160,9 +131,13 @@ while True:
         print("Goodbye!")
         break
 
+    # Inline filters only apply to this turn: they travel with the call, not the retriever
+    user_input, filters = parse_filters(user_input)
+
     result = conversational_rag_chain.invoke(
         {"input": user_input},
-        config={"configurable": {"session_id": session_id}}
+        config={"configurable": {"session_id": session_id}, "callbacks": [tracer],
+                "metadata": {"filters": filters}}
     )
 
     # print("\n\n--- RETRIEVED CONTEXT ---\n")
@@ -176,7 +151,9 @@ while True:
     print("\n\n--- RETRIEVED CONTEXT ---\n")
     if result.get("context"):
         for i, doc in enumerate(result["context"]):
-            print(f"Chunk {i+1} from: {doc.metadata.get('source', 'Unknown')}\n")
+            meta = doc.metadata
+            print(f"Chunk {i+1} from: {meta.get('source', 'Unknown')}, page {meta.get('page', '?')}"
+                  f" ({meta.get('section') or 'no section'})\n")
             print(doc.page_content[:500])  # Only printing first 500 chars for brevity
             print("-" * 50)
     else:
@@ -0,0 +1,117 @@
+import argparse
+import json
+import time
+
+import numpy as np
+from langchain_community.document_loaders import PyPDFLoader
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from local_embeddings import get_embeddings
+
+# ----------------------------
+# Embedding backend benchmark
+# ----------------------------
+# For every backend: chunks/sec when embedding the corpus, and retrieval quality on the
+# held-out questions in eval_questions.json (hit@k = a top-k chunk contains one of the
+# expected keywords). When the google backend is included, every other backend also
+# reports its top-k overlap with it, i.e. how close it gets to the current retrieval.
+
+def load_chunks(pdf_paths, limit=None):
+    documents = []
+    for path in pdf_paths:
+        try:
+            documents.extend(PyPDFLoader(path).load())
+        except Exception as e:
+            print(f"❌ Failed to load {path}: {e}")
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    chunks = [d.page_content for d in splitter.split_documents(documents)]
+    return chunks[:limit] if limit else chunks
+
+
+def top_k(doc_matrix, query_matrix, k):
+    doc_matrix = doc_matrix / np.linalg.norm(doc_matrix, axis=1, keepdims=True).clip(1e-12)
+    query_matrix = query_matrix / np.linalg.norm(query_matrix, axis=1, keepdims=True).clip(1e-12)
+    scores = query_matrix @ doc_matrix.T
+    k = min(k, scores.shape[1])
+    idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(scores, idx, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def hit_rate(chunks, retrieved, questions):
+    hits = 0
+    for ids, q in zip(retrieved, questions):
+        keywords = [kw.lower() for kw in q["keywords"]]
+        if any(kw in chunks[i].lower() for i in ids for kw in keywords):
+            hits += 1
+    return hits / len(questions)
+
+
+def run_backend(name, chunks, questions, batch_size, k):
+    print(f"\n🔍 {name}")
+    start = time.perf_counter()
+    embeddings = get_embeddings(name, batch_size=batch_size)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    doc_vecs = np.asarray(embeddings.embed_documents(chunks), dtype=np.float32)
+    embed_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    query_vecs = np.asarray([embeddings.embed_query(q["question"]) for q in questions], dtype=np.float32)
+    query_ms = (time.perf_counter() - start) * 1000 / len(questions)
+
+    retrieved = top_k(doc_vecs, query_vecs, k)
+    result = {
+        "backend": name,
+        "load_s": round(load_s, 3),
+        "chunks": len(chunks),
+        "chunks_per_sec": round(len(chunks) / embed_s, 1),
+        "query_ms": round(query_ms, 2),
+        "dim": int(doc_vecs.shape[1]),
+        f"hit@{k}": round(hit_rate(chunks, retrieved, questions), 3),
+    }
+    print(f"✅ {result}")
+    return result, retrieved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare embedding backends for the RAG store.")
+    parser.add_argument("--pdf", nargs="+", default=["Computer_Network.pdf"])
+    parser.add_argument("--questions", default="eval_questions.json")
+    parser.add_argument("--backends", nargs="+", default=["google", "local", "onnx", "onnx-int8"])
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--limit", type=int, default=None, help="Only embed the first N chunks")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--out", default=None, help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    chunks = load_chunks(args.pdf, args.limit)
+    with open(args.questions, encoding="utf-8") as f:
+        questions = json.load(f)
+    print(f"Loaded {len(chunks)} chunks and {len(questions)} questions")
+
+    results, retrieved = [], {}
+    for name in args.backends:
+        try:
+            result, retrieved[name] = run_backend(name, chunks, questions, args.batch_size, args.k)
+            results.append(result)
+        except Exception as e:
+            print(f"❌ {name} failed: {e}")
+
+    if "google" in retrieved:
+        for result in results:
+            overlap = [len(set(a) & set(b)) / args.k
+                       for a, b in zip(retrieved[result["backend"]], retrieved["google"])]
+            result[f"overlap@{args.k}_vs_google"] = round(float(np.mean(overlap)), 3)
+
+    print("\n--- Embedding backends ---")
+    for result in results:
+        print(result)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
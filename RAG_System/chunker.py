@@ -0,0 +1,290 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from langchain_core.documents import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.document_loaders import UnstructuredPDFLoader
+from pypdf import PdfReader, PdfWriter
+
+# ----------------------------
+# Structure-aware chunking for PDF corpora
+# ----------------------------
+# Instead of cutting every 1000 characters, the layout elements from the unstructured
+# loader (Title, NarrativeText, ListItem, Table, ...) are packed into chunks that never
+# cross a heading or a page, so each chunk carries the page number and the section it
+# belongs to. Chunks are page-local, which lets us re-chunk only the pages whose content
+# changed: a page hash (raw content stream, no text extraction) is kept per page in a
+# manifest, and only changed pages are cut out into a temporary PDF and partitioned again.
+
+SKIP_CATEGORIES = {"Header", "Footer", "PageNumber", "PageBreak"}
+
+
+def page_hashes(path):
+    """Cheap fingerprint of every page, 1-based like unstructured's page_number."""
+    reader = PdfReader(path)
+    hashes = {}
+    for number, page in enumerate(reader.pages, start=1):
+        contents = page.get_contents()
+        data = contents.get_data() if contents is not None else b""
+        hashes[number] = hashlib.sha1(data).hexdigest()
+    return hashes
+
+
+def partition_pages(path, pages, total_pages):
+    """Run the unstructured loader on `pages` only and return {page: [elements]}."""
+    pages = sorted(pages)
+    by_page = {p: [] for p in pages}
+    if not pages:
+        return by_page
+
+    if len(pages) == total_pages:
+        elements = UnstructuredPDFLoader(path, mode="elements").load()
+        page_map = {p: p for p in pages}
+    else:
+        # Cut the changed pages into a temporary PDF so unstructured only sees those
+        reader = PdfReader(path)
+        writer = PdfWriter()
+        for p in pages:
+            writer.add_page(reader.pages[p - 1])
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            writer.write(tmp)
+        try:
+            elements = UnstructuredPDFLoader(tmp.name, mode="elements").load()
+        finally:
+            os.remove(tmp.name)
+        page_map = {i: p for i, p in enumerate(pages, start=1)}
+
+    for el in elements:
+        page = page_map.get(el.metadata.get("page_number", 1))
+        if page is not None:
+            by_page[page].append(el)
+    return by_page
+
+
+def chunk_page(elements, source, page, section, max_chars=1000):
+    """Pack one page's elements into chunks. Returns (chunks, section at end of page)."""
+    splitter = RecursiveCharacterTextSplitter(chunk_size=max_chars, chunk_overlap=max_chars // 5)
+    chunks = []
+    buf, categories = [], []
+    buf_section = section
+
+    def flush():
+        if buf:
+            chunks.append({"text": "\n".join(buf), "section": buf_section,
+                           "categories": sorted(set(categories))})
+        buf.clear()
+        categories.clear()
+
+    for el in elements:
+        category = el.metadata.get("category", "NarrativeText")
+        text = el.page_content.strip()
+        if not text or category in SKIP_CATEGORIES:
+            continue
+
+        if category == "Title":
+            # A heading always opens a new chunk and becomes its section
+            flush()
+            section = buf_section = text
+            buf.append(text)
+            categories.append(category)
+            continue
+
+        if category == "Table":
+            # Tables are kept whole (split only if a single table is oversized)
+            flush()
+            for piece in splitter.split_text(text) if len(text) > max_chars else [text]:
+                chunks.append({"text": piece, "section": section, "categories": ["Table"]})
+            continue
+
+        if len(text) > max_chars:
+            flush()
+            for piece in splitter.split_text(text):
+                chunks.append({"text": piece, "section": section, "categories": [category]})
+            continue
+
+        heading_only = len(buf) == 1 and categories == ["Title"]
+        if buf and not heading_only and sum(len(t) + 1 for t in buf) + len(text) > max_chars:
+            flush()
+            buf_section = section
+        buf.append(text)
+        categories.append(category)
+    flush()
+
+    for i, chunk in enumerate(chunks):
+        chunk["id"] = f"{source}:p{page}:c{i}"
+        chunk["page"] = page
+        chunk["source"] = source
+    return chunks, section
+
+
+def chunk_document(path, previous, max_chars=1000):
+    """Re-chunk the pages of one PDF that changed since `previous` (its manifest entry).
+
+    Returns (entry, added_chunks, removed_ids). A page is re-chunked when its hash changed
+    or when the section it inherits from the page before it changed, which stops at the
+    first page that opens with its own heading.
+    """
+    hashes = page_hashes(path)
+    old_pages = {int(p): v for p, v in (previous or {}).get("pages", {}).items()}
+    removed_ids = []
+    if (previous or {}).get("max_chars") != max_chars:
+        # New chunk size: every old chunk goes, including ids the new chunking won't reuse
+        removed_ids = [c["id"] for v in old_pages.values() for c in v["chunks"]]
+        old_pages = {}
+
+    dirty = {p for p, h in hashes.items() if old_pages.get(p, {}).get("hash") != h}
+    removed_ids += [c["id"] for p, v in old_pages.items() if p not in hashes for c in v["chunks"]]
+    elements = partition_pages(path, dirty, len(hashes))
+
+    pages, added = {}, []
+    section = None
+    for p in sorted(hashes):
+        old = old_pages.get(p)
+        if p not in dirty and old is not None and old["section_in"] == section:
+            pages[p] = old
+            section = old["section_out"]
+            continue
+        if p not in elements:
+            # Unchanged page whose inherited section moved: partition it too
+            elements.update(partition_pages(path, {p}, len(hashes)))
+        chunks, section_out = chunk_page(elements[p], path, p, section, max_chars)
+        if old is not None:
+            removed_ids.extend(c["id"] for c in old["chunks"])
+        pages[p] = {"hash": hashes[p], "section_in": section,
+                    "section_out": section_out, "chunks": chunks}
+        added.extend(chunks)
+        section = section_out
+
+    return {"max_chars": max_chars, "pages": pages}, added, removed_ids
+
+
+def to_document(chunk):
+    return Document(
+        page_content=chunk["text"],
+        metadata={
+            "source": chunk["source"],
+            "page": chunk["page"],
+            "section": chunk["section"],
+            "categories": ", ".join(chunk["categories"]),
+            "chunk_id": chunk["id"],
+        },
+        id=chunk["id"],
+    )
+
+
+class ChunkIndex:
+    """Chunk manifest for a set of PDFs, persisted as JSON next to the vector store."""
+
+    def __init__(self, manifest_path="chunk_manifest.json", max_chars=1000, max_workers=None):
+        self.manifest_path = manifest_path
+        self.max_chars = max_chars
+        self.max_workers = max_workers
+        self.manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    def update(self, pdf_paths):
+        """Re-chunk what changed across all PDFs, in parallel.
+
+        Returns (added_docs, removed_ids, manifest). Nothing is written: call save(manifest)
+        once the changes are in the vector store, so a failed embedding run is redone next time.
+        """
+        paths = [p for p in pdf_paths if os.path.exists(p)]
+        for path in set(pdf_paths) - set(paths):
+            print(f"❌ Failed to load {path}: file not found")
+
+        manifest = dict(self.manifest)
+        added, removed = [], []
+        # Documents that left the corpus
+        for source in list(manifest):
+            if source not in paths:
+                entry = manifest.pop(source)
+                removed.extend(c["id"] for page in entry["pages"].values() for c in page["chunks"])
+
+        for path, result in self._run(paths):
+            if isinstance(result, Exception):
+                print(f"❌ Failed to chunk {path}: {result}")
+                continue
+            entry, new_chunks, removed_ids = result
+            manifest[path] = entry
+            added.extend(to_document(c) for c in new_chunks)
+            removed.extend(removed_ids)
+            print(f"✅ {path}: {len(entry['pages'])} pages, {len(new_chunks)} chunks re-built")
+        return added, removed, manifest
+
+    def save(self, manifest):
+        tmp = f"{self.manifest_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self.manifest_path)
+        self.manifest = manifest
+
+    def _run(self, paths):
+        """Yield (path, result or exception) for every PDF, one process per document."""
+        jobs = [(path, self.manifest.get(path), self.max_chars) for path in paths]
+        workers = self.max_workers or min(len(paths), os.cpu_count() or 1)
+        # "fork" so workers don't re-import the calling script (it has top-level code)
+        can_fork = "fork" in multiprocessing.get_all_start_methods()
+        if workers <= 1 or not can_fork:
+            for job in jobs:
+                try:
+                    yield job[0], chunk_document(*job)
+                except Exception as e:
+                    yield job[0], e
+            return
+
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("fork")) as pool:
+            futures = [(job[0], pool.submit(chunk_document, *job)) for job in jobs]
+            for path, future in futures:
+                try:
+                    yield path, future.result()
+                except Exception as e:
+                    yield path, e
+
+    def documents(self, manifest=None):
+        """All chunks of `manifest` (default: the saved one) as Documents, for a full build."""
+        manifest = self.manifest if manifest is None else manifest
+        return [to_document(c)
+                for entry in manifest.values()
+                for page in entry["pages"].values()
+                for c in page["chunks"]]
+
+
+def apply_to_store(index_dir, embeddings, added, removed, documents):
+    """Apply chunk changes to the FAISS store in index_dir (or build it from `documents`) and save it."""
+    from langchain_community.vectorstores import FAISS
+
+    if os.path.exists(os.path.join(index_dir, "index.faiss")):
+        store = FAISS.load_local(index_dir, embeddings, allow_dangerous_deserialization=True)
+        existing = set(store.index_to_docstore_id.values())
+        # Re-chunked pages reuse their chunk ids, so drop the old vectors first
+        stale = [i for i in set(removed) | {d.id for d in added} if i in existing]
+        if stale:
+            store.delete(stale)
+        if added:
+            store.add_documents(added, ids=[d.id for d in added])
+        print(f"♻️ Index updated: {len(added)} chunks added, {len(stale)} removed")
+    else:
+        store = FAISS.from_documents(documents, embedding=embeddings, ids=[d.id for d in documents])
+        print(f"🆕 Index built from {len(documents)} chunks")
+    os.makedirs(index_dir, exist_ok=True)
+    store.save_local(index_dir)
+    return store
+
+
+def load_vector_store(pdf_paths, embeddings, index_dir="faiss_index",
+                      manifest_path="chunk_manifest.json", max_chars=1000):
+    """Open the persisted FAISS store and apply only the chunks that changed."""
+    os.makedirs(index_dir, exist_ok=True)
+    chunk_index = ChunkIndex(os.path.join(index_dir, manifest_path), max_chars=max_chars)
+    added, removed, manifest = chunk_index.update(pdf_paths)
+    store = apply_to_store(index_dir, embeddings, added, removed, chunk_index.documents(manifest))
+    # Only now are the changes durable; an embedding failure above leaves the old manifest
+    chunk_index.save(manifest)
+    return store
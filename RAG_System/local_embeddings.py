@@ -0,0 +1,84 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.embeddings import Embeddings
+
+# ----------------------------
+# Local (offline) embedding backend
+# ----------------------------
+# Same model the Exploring_Embedding_Techniques notebook uses, but run inside the RAG
+# pipeline so indexing and querying need no network calls. Documents are split into
+# batches and encoded on a thread pool; both torch and onnxruntime release the GIL
+# during inference so the batches really run in parallel on the CPU.
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# int8 dynamically quantized export shipped in the model repo (runs on any AVX2 CPU)
+DEFAULT_QUANTIZED_FILE = "onnx/model_quint8_avx2.onnx"
+
+
+class LocalEmbeddings(Embeddings):
+    """sentence-transformers embeddings with CPU thread batching and optional int8 ONNX."""
+
+    def __init__(self, model_name=DEFAULT_MODEL, backend="torch", quantized=False,
+                 onnx_file=DEFAULT_QUANTIZED_FILE, batch_size=64, num_workers=None,
+                 normalize=True):
+        from sentence_transformers import SentenceTransformer
+
+        if backend not in ("torch", "onnx"):
+            raise ValueError(f"Unknown backend '{backend}', expected 'torch' or 'onnx'")
+        model_kwargs = {}
+        if backend == "onnx" and quantized:
+            model_kwargs["file_name"] = onnx_file
+
+        self.model_name = model_name
+        self.backend = backend
+        self.quantized = quantized
+        self.batch_size = batch_size
+        self.num_workers = num_workers or min(4, os.cpu_count() or 1)
+        self.normalize = normalize
+        self.model = SentenceTransformer(model_name, device="cpu", backend=backend,
+                                         model_kwargs=model_kwargs or None)
+
+    def _encode(self, texts):
+        vectors = self.model.encode(texts, batch_size=self.batch_size,
+                                    normalize_embeddings=self.normalize,
+                                    convert_to_numpy=True, show_progress_bar=False)
+        return vectors.tolist()
+
+    def embed_documents(self, texts):
+        texts = list(texts)
+        if not texts:
+            return []
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1 or self.num_workers == 1:
+            return [vec for batch in batches for vec in self._encode(batch)]
+        # map() keeps batch order, so vectors line up with the input texts
+        with ThreadPoolExecutor(max_workers=self.num_workers) as pool:
+            return [vec for result in pool.map(self._encode, batches) for vec in result]
+
+    def embed_query(self, text):
+        return self._encode([text])[0]
+
+
+def get_embeddings(backend=None, batch_size=None):
+    """Build the embeddings model for the RAG stores.
+
+    `backend` (or the EMBEDDING_BACKEND env var) is one of:
+      google     - GoogleGenerativeAIEmbeddings (remote, default)
+      local      - sentence-transformers on torch
+      onnx       - sentence-transformers on onnxruntime
+      onnx-int8  - onnxruntime with the int8 quantized export
+    """
+    backend = (backend or os.getenv("EMBEDDING_BACKEND", "google")).lower()
+    batch_size = batch_size or int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+
+    if backend == "google":
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        return GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+    if backend == "local":
+        return LocalEmbeddings(backend="torch", batch_size=batch_size)
+    if backend == "onnx":
+        return LocalEmbeddings(backend="onnx", batch_size=batch_size)
+    if backend == "onnx-int8":
+        return LocalEmbeddings(backend="onnx", quantized=True, batch_size=batch_size)
+    raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}'")
@@ -0,0 +1,315 @@
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.embeddings import Embeddings
+
+# ----------------------------
+# Stage tracing for the conversational RAG chain
+# ----------------------------
+# Every turn of the chain becomes one trace. Each stage (contextualize, embed_query,
+# faiss_search, generate) is written as a span, one JSON object per line, using the
+# OpenTelemetry span field names so the file can be replayed into an OTLP collector.
+
+# run_name that create_history_aware_retriever gives to its rephrase + retrieve branch
+CONTEXTUALIZE_CHAIN = "chat_retriever_chain"
+
+
+def _new_id(n_bytes):
+    return uuid.uuid4().hex[: n_bytes * 2]
+
+
+class StageTracer(BaseCallbackHandler):
+    """LangChain callback handler that records per-stage spans for every turn."""
+
+    def __init__(self, path="rag_traces.jsonl", session_id=None):
+        self.path = path
+        self.session_id = session_id
+        self._lock = threading.Lock()
+        self._runs = {}           # run_id -> {"name", "parent", "start", "span_id"}
+        self._turn = None         # active turn (root chain run)
+        self._pending_embed = []  # embed_query timings reported by TimedEmbeddings
+
+    # ---- helpers ----
+    def _has_ancestor(self, run_id, name):
+        while run_id is not None:
+            run = self._runs.get(run_id)
+            if run is None:
+                return False
+            if run["name"] == name:
+                return True
+            run_id = run["parent"]
+        return False
+
+    def _span(self, name, start_ns, end_ns, parent_span_id=None, **attributes):
+        span = {
+            "trace_id": self._turn["trace_id"],
+            "span_id": _new_id(8),
+            "parent_span_id": parent_span_id or self._turn["span_id"],
+            "name": name,
+            "start_time_unix_nano": start_ns,
+            "end_time_unix_nano": end_ns,
+            "duration_ms": (end_ns - start_ns) / 1e6,
+            "attributes": {k: v for k, v in attributes.items() if v is not None},
+        }
+        self._turn["spans"].append(span)
+        return span
+
+    def _start(self, run_id, parent_run_id, name):
+        with self._lock:
+            self._runs[run_id] = {
+                "name": name,
+                "parent": parent_run_id,
+                "start": time.time_ns(),
+                "span_id": _new_id(8),
+            }
+            if parent_run_id is None:
+                self._turn = {
+                    "trace_id": _new_id(16),
+                    "span_id": self._runs[run_id]["span_id"],
+                    "start": self._runs[run_id]["start"],
+                    "spans": [],
+                    "cache_hits": 0,
+                    "cache_misses": 0,
+                }
+                self._pending_embed = []
+
+    # ---- chain events ----
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+        self._start(run_id, parent_run_id, name)
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs):
+        if parent_run_id is None:
+            self._finish_turn(run_id, outputs)
+        else:
+            with self._lock:
+                self._runs.pop(run_id, None)
+
+    def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        if parent_run_id is None:
+            self._finish_turn(run_id, None, error=repr(error))
+        else:
+            with self._lock:
+                self._runs.pop(run_id, None)
+
+    # ---- LLM events: contextualize vs generate ----
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, "llm")
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, "llm")
+
+    def on_llm_end(self, response, *, run_id, parent_run_id=None, **kwargs):
+        end = time.time_ns()
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is None or self._turn is None:
+                return
+            stage = "contextualize" if self._has_ancestor(parent_run_id, CONTEXTUALIZE_CHAIN) else "generate"
+            input_tokens, output_tokens = _token_counts(response)
+            self._span(stage, run["start"], end,
+                       input_tokens=input_tokens, output_tokens=output_tokens)
+
+    def on_llm_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+    # ---- retriever events: embed_query + faiss_search ----
+    def on_retriever_start(self, serialized, query, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, "retriever")
+
+    def on_retriever_end(self, documents, *, run_id, parent_run_id=None, **kwargs):
+        end = time.time_ns()
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is None or self._turn is None:
+                return
+            retrieve = self._span("retrieve", run["start"], end,
+                                  doc_ids=[_doc_id(d) for d in documents],
+                                  sources=[d.metadata.get("source") for d in documents])
+            search_start = run["start"]
+            for start_ns, end_ns, cache_hit in self._pending_embed:
+                self._span("embed_query", start_ns, end_ns,
+                           parent_span_id=retrieve["span_id"], cache_hit=cache_hit)
+                search_start = max(search_start, end_ns)
+            self._pending_embed = []
+            # Not measured directly: from the end of the query embedding to the end of the
+            # retriever call, so shard routing and merging are included
+            self._span("faiss_search", search_start, end,
+                       parent_span_id=retrieve["span_id"], k=len(documents), derived=True)
+
+    def on_retriever_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        with self._lock:
+            self._runs.pop(run_id, None)
+            self._pending_embed = []
+
+    # ---- reported by TimedEmbeddings ----
+    def record_embed(self, start_ns, end_ns, cache_hit):
+        with self._lock:
+            self._pending_embed.append((start_ns, end_ns, cache_hit))
+            if self._turn is not None:
+                key = "cache_hits" if cache_hit else "cache_misses"
+                self._turn[key] += 1
+
+    # ---- export ----
+    def _finish_turn(self, run_id, outputs, error=None):
+        end = time.time_ns()
+        with self._lock:
+            if self._turn is None:
+                return
+            turn = self._turn
+            root = {
+                "trace_id": turn["trace_id"],
+                "span_id": turn["span_id"],
+                "parent_span_id": None,
+                "name": "turn",
+                "start_time_unix_nano": turn["start"],
+                "end_time_unix_nano": end,
+                "duration_ms": (end - turn["start"]) / 1e6,
+                "attributes": {
+                    "session_id": self.session_id,
+                    "cache_hits": turn["cache_hits"],
+                    "cache_misses": turn["cache_misses"],
+                },
+            }
+            if error:
+                root["attributes"]["error"] = error
+            spans = [root] + turn["spans"]
+            self._turn = None
+            self._runs.clear()
+            with open(self.path, "a", encoding="utf-8") as f:
+                for span in spans:
+                    f.write(json.dumps(span) + "\n")
+
+
+def _doc_id(doc):
+    doc_id = getattr(doc, "id", None)
+    if doc_id:
+        return doc_id
+    return f"{doc.metadata.get('source', 'unknown')}#{hash(doc.page_content) & 0xffffffff:08x}"
+
+
+def _token_counts(response):
+    """Pull input/output token counts from an LLMResult, whatever the provider put them in."""
+    usage = (response.llm_output or {}).get("token_usage") or (response.llm_output or {}).get("usage_metadata")
+    if usage:
+        return (usage.get("prompt_tokens", usage.get("input_tokens")),
+                usage.get("completion_tokens", usage.get("output_tokens")))
+    for generations in response.generations:
+        for gen in generations:
+            meta = getattr(getattr(gen, "message", None), "usage_metadata", None)
+            if meta:
+                return meta.get("input_tokens"), meta.get("output_tokens")
+    return None, None
+
+
+class TimedEmbeddings(Embeddings):
+    """Wraps an embeddings model to time embed_query and cache repeated queries."""
+
+    def __init__(self, inner, tracer=None, cache_size=256):
+        self.inner = inner
+        self.tracer = tracer
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def embed_documents(self, texts):
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        start = time.time_ns()
+        vector = self._cache.get(text)
+        cache_hit = vector is not None
+        if cache_hit:
+            self._cache.move_to_end(text)
+        else:
+            vector = self.inner.embed_query(text)
+            if self.cache_size:
+                self._cache[text] = vector
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        if self.tracer is not None:
+            self.tracer.record_embed(start, time.time_ns(), cache_hit)
+        return vector
+
+
+# ----------------------------
+# Summary CLI: python rag_tracing.py rag_traces.jsonl
+# ----------------------------
+def load_spans(path, session_id=None):
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                spans.append(json.loads(line))
+    if session_id is not None:
+        traces = {s["trace_id"] for s in spans
+                  if s["name"] == "turn" and s["attributes"].get("session_id") == session_id}
+        spans = [s for s in spans if s["trace_id"] in traces]
+    return spans
+
+
+def summarize(spans):
+    """Return {stage: {"count", "p50_ms", "p95_ms", ...}} over all spans."""
+    durations = defaultdict(list)
+    tokens = defaultdict(lambda: [0, 0])
+    hits = misses = 0
+    for span in spans:
+        durations[span["name"]].append(span["duration_ms"])
+        attrs = span.get("attributes", {})
+        tokens[span["name"]][0] += attrs.get("input_tokens") or 0
+        tokens[span["name"]][1] += attrs.get("output_tokens") or 0
+        if span["name"] == "turn":
+            hits += attrs.get("cache_hits", 0)
+            misses += attrs.get("cache_misses", 0)
+    summary = {}
+    for name, values in durations.items():
+        summary[name] = {
+            "count": len(values),
+            "p50_ms": float(np.percentile(values, 50)),
+            "p95_ms": float(np.percentile(values, 95)),
+            "max_ms": max(values),
+            "input_tokens": tokens[name][0],
+            "output_tokens": tokens[name][1],
+        }
+    if "turn" in summary:
+        summary["turn"]["cache_hit_rate"] = hits / (hits + misses) if hits + misses else None
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize RAG stage traces (p50/p95 per stage).")
+    parser.add_argument("path", nargs="?", default="rag_traces.jsonl")
+    parser.add_argument("--session", default=None, help="Only include turns from this session id")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"❌ No trace file at {args.path}")
+        return
+    spans = load_spans(args.path, args.session)
+    if not spans:
+        print("No turns recorded.")
+        return
+    summary = summarize(spans)
+
+    order = ["turn", "contextualize", "retrieve", "embed_query", "faiss_search", "generate"]
+    print(f"{'stage':<15}{'count':>7}{'p50 ms':>11}{'p95 ms':>11}{'max ms':>11}{'tok in':>9}{'tok out':>9}")
+    for name in order + sorted(set(summary) - set(order)):
+        if name not in summary:
+            continue
+        s = summary[name]
+        print(f"{name:<15}{s['count']:>7}{s['p50_ms']:>11.1f}{s['p95_ms']:>11.1f}{s['max_ms']:>11.1f}"
+              f"{s['input_tokens']:>9}{s['output_tokens']:>9}")
+    rate = summary.get("turn", {}).get("cache_hit_rate")
+    if rate is not None:
+        print(f"\nQuery-embedding cache hit rate: {rate * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import faiss
+import numpy as np
+from langchain_core.retrievers import BaseRetriever
+
+from chunker import ChunkIndex, apply_to_store
+
+# ----------------------------
+# Multi-corpus retrieval
+# ----------------------------
+# One FAISS sub-index (shard) per source PDF, each with its own chunk manifest, plus
+# free-form tags per source. A query is embedded once, routed to the shards that can
+# answer it and only those are searched (in parallel, FAISS releases the GIL); results
+# are merged by distance. Adding collections grows the number of shards, not the
+# amount of work per query, which is bounded by max_shards.
+
+FILTER_PATTERN = re.compile(r"\b(source|tag|pages?):(\S+)", re.IGNORECASE)
+
+
+def parse_filters(text):
+    """Pull inline filters out of a chat message.
+
+    "source:Computer_Network.pdf pages:10-20 tag:routing what is OSPF?" ->
+    ("what is OSPF?", {"source": ["Computer_Network.pdf"], "pages": (10, 20), "tags": ["routing"]})
+    """
+    filters = {}
+    for key, value in FILTER_PATTERN.findall(text):
+        key = key.lower()
+        if key == "source":
+            filters.setdefault("source", []).append(value)
+        elif key == "tag":
+            filters.setdefault("tags", []).append(value.lower())
+        else:
+            lo, _, hi = value.partition("-")
+            if lo.isdigit():
+                filters["pages"] = (int(lo), int(hi) if hi.isdigit() else int(lo))
+    return FILTER_PATTERN.sub("", text).strip(), filters
+
+
+class Shard:
+    def __init__(self, source, store, tags=(), normalize_L2=False):
+        self.source = source
+        self.store = store
+        # Must match how the store was built (apply_to_store uses the FAISS defaults)
+        self.normalize_L2 = normalize_L2
+        self.tags = {t.lower() for t in tags}
+        # Words of the file name, used to notice when the user names the document
+        stem = os.path.splitext(os.path.basename(source))[0]
+        self.name_words = {w for w in re.split(r"[\W_]+", stem.lower()) if len(w) > 3 and not w.isdigit()}
+        self.centroid = self._centroid()
+        self.pages = self._pages()
+
+    def _centroid(self):
+        n = self.store.index.ntotal
+        if n == 0:
+            return None
+        vectors = self.store.index.reconstruct_n(0, n)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True).clip(1e-12)
+        centroid = vectors.mean(axis=0)
+        return centroid / max(np.linalg.norm(centroid), 1e-12)
+
+    def _pages(self):
+        """Page number of every FAISS row, so a page range maps to the rows to search."""
+        ids = self.store.index_to_docstore_id
+        return np.array([self.store.docstore.search(ids[i]).metadata.get("page", 0)
+                         for i in range(self.store.index.ntotal)], dtype=np.int64)
+
+    def search(self, query_vector, k, pages=None):
+        """(Document, L2 distance) pairs; with pages=(lo, hi) only chunks on those pages are searched."""
+        if pages is None:
+            return self.store.similarity_search_with_score_by_vector(query_vector, k=k)
+        rows = np.flatnonzero((self.pages >= pages[0]) & (self.pages <= pages[1]))
+        if rows.size == 0:
+            return []
+        vector = np.array([query_vector], dtype=np.float32)  # a copy: normalized in place below
+        if self.normalize_L2:
+            faiss.normalize_L2(vector)
+        # Pre-filter: FAISS only scores the selected rows, however far down the full ranking they are
+        params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(rows))
+        distances, indices = self.store.index.search(vector, min(k, rows.size), params=params)
+        ids = self.store.index_to_docstore_id
+        return [(self.store.docstore.search(ids[i]), float(d))
+                for d, i in zip(distances[0], indices[0]) if i != -1]
+
+
+def source_of(chunk_id):
+    """Source path of a chunk id: "docs/a.pdf:p3:c1" -> "docs/a.pdf"."""
+    return chunk_id.rsplit(":", 2)[0]
+
+
+def build_shards(pdf_paths, embeddings, base_dir="faiss_shards", tags=None, max_chars=1000):
+    """Load (or incrementally update) one persisted FAISS store per PDF.
+
+    All PDFs are chunked in one ChunkIndex run (one process per document); the changes
+    are then split by source and applied to each shard's store.
+    """
+    tags = tags or {}
+    os.makedirs(base_dir, exist_ok=True)
+    chunk_index = ChunkIndex(os.path.join(base_dir, "chunk_manifest.json"), max_chars=max_chars)
+    added, removed, manifest = chunk_index.update(pdf_paths)
+
+    shards = []
+    for path in pdf_paths:
+        if path not in manifest:  # missing or failed to chunk, already reported
+            continue
+        index_dir = os.path.join(base_dir, re.sub(r"\W+", "_", os.path.basename(path)))
+        store = apply_to_store(index_dir, embeddings,
+                               [d for d in added if d.metadata["source"] == path],
+                               [i for i in removed if source_of(i) == path],
+                               chunk_index.documents({path: manifest[path]}))
+        shards.append(Shard(path, store, tags.get(path, ())))
+    # Every shard is saved: record the new chunking
+    chunk_index.save(manifest)
+    return shards
+
+
+class ShardRouter:
+    """Choose which shards a query should search."""
+
+    def __init__(self, shards, max_shards=2, min_similarity=0.0):
+        self.shards = shards
+        self.max_shards = max_shards
+        self.min_similarity = min_similarity
+
+    def route(self, query, query_vector, filters=None):
+        filters = filters or {}
+        candidates = self.shards
+
+        # Explicit filters always win
+        if filters.get("source"):
+            wanted = {os.path.basename(s).lower() for s in filters["source"]}
+            candidates = [s for s in candidates if os.path.basename(s.source).lower() in wanted]
+        if filters.get("tags"):
+            wanted = set(filters["tags"])
+            candidates = [s for s in candidates if s.tags & wanted]
+        if filters.get("source") or filters.get("tags"):
+            return candidates
+
+        # Documents named in the question itself
+        words = set(re.split(r"\W+", query.lower()))
+        named = [s for s in candidates if s.name_words and s.name_words <= words]
+        if named:
+            return named
+
+        # Otherwise the shards whose content centroid is closest to the query
+        q = np.asarray(query_vector, dtype=np.float32)
+        q /= max(np.linalg.norm(q), 1e-12)
+        scored = [(float(s.centroid @ q), s) for s in candidates if s.centroid is not None]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        routed = [s for score, s in scored[:self.max_shards] if score >= self.min_similarity]
+        return routed or [s for _, s in scored[:1]]
+
+
+class ShardedRetriever(BaseRetriever):
+    """LangChain retriever that searches only the routed shards and merges the hits.
+
+    Filters from parse_filters are passed per call, so one retriever can serve concurrent chats:
+        chain.invoke(inputs, config={"metadata": {"filters": filters}})
+    """
+
+    router: ShardRouter
+    embeddings: object
+    k: int = 5
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        filters = (run_manager.metadata.get("filters") if run_manager else None) or {}
+        # Embed once and reuse the vector for routing and for every shard
+        query_vector = self.embeddings.embed_query(query)
+        shards = self.router.route(query, query_vector, filters)
+        if not shards:
+            return []
+
+        pages = filters.get("pages")
+        if len(shards) == 1:
+            hits = shards[0].search(query_vector, self.k, pages)
+        else:
+            with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+                results = pool.map(lambda s: s.search(query_vector, self.k, pages), shards)
+                hits = [hit for result in results for hit in result]
+
+        # FAISS scores are L2 distances: smaller is closer
+        hits.sort(key=lambda hit: hit[1])
+        return [doc for doc, _ in hits[:self.k]]
@@ -0,0 +1,84 @@
+import hashlib
+
+import pytest
+
+chunker = pytest.importorskip("chunker")  # needs langchain and pypdf
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    """{path: {page: text}} standing in for the PDFs, so nothing is parsed."""
+    pages = {}
+
+    def page_hashes(path):
+        return {p: hashlib.sha1(text.encode()).hexdigest() for p, text in pages[path].items()}
+
+    def partition_pages(path, wanted, total_pages):
+        return {p: [chunker.Document(page_content=pages[path][p], metadata={"category": "NarrativeText"})]
+                for p in wanted}
+
+    monkeypatch.setattr(chunker, "page_hashes", page_hashes)
+    monkeypatch.setattr(chunker, "partition_pages", partition_pages)
+    return pages
+
+
+@pytest.fixture
+def make_pdf(tmp_path, pages):
+    def make(name, texts):
+        path = tmp_path / name
+        path.touch()  # update() skips paths that don't exist
+        pages[str(path)] = dict(enumerate(texts, start=1))
+        return str(path)
+    return make
+
+
+@pytest.fixture
+def open_index(tmp_path):
+    return lambda **kwargs: chunker.ChunkIndex(str(tmp_path / "chunk_manifest.json"), max_workers=1, **kwargs)
+
+
+def test_update_does_not_write_until_save(open_index, make_pdf):
+    pdf = make_pdf("a.pdf", ["page one", "page two"])
+    index = open_index()
+
+    added, removed, manifest = index.update([pdf])
+    assert [d.id for d in added] == [f"{pdf}:p1:c0", f"{pdf}:p2:c0"]
+    assert removed == []
+    assert open_index().manifest == {}
+
+    index.save(manifest)
+    assert open_index().update([pdf])[:2] == ([], [])
+
+
+def test_only_changed_pages_are_rechunked(open_index, make_pdf, pages):
+    pdf = make_pdf("a.pdf", ["page one", "page two", "page three"])
+    index = open_index()
+    index.save(index.update([pdf])[2])
+
+    pages[pdf][2] = "page two, edited"
+    added, removed, _ = index.update([pdf])
+    assert [d.page_content for d in added] == ["page two, edited"]
+    assert removed == [f"{pdf}:p2:c0"]
+
+
+def test_new_max_chars_drops_every_old_chunk(open_index, make_pdf):
+    pdf = make_pdf("a.pdf", ["page one", "page two"])
+    index = open_index()
+    index.save(index.update([pdf])[2])
+
+    added, removed, manifest = open_index(max_chars=500).update([pdf])
+    assert sorted(removed) == [f"{pdf}:p1:c0", f"{pdf}:p2:c0"]
+    assert len(added) == 2
+    assert manifest[pdf]["max_chars"] == 500
+
+
+def test_removed_pdf_drops_its_chunks(open_index, make_pdf):
+    a = make_pdf("a.pdf", ["page one"])
+    b = make_pdf("b.pdf", ["other"])
+    index = open_index()
+    index.save(index.update([a, b])[2])
+
+    added, removed, manifest = index.update([a])
+    assert added == []
+    assert removed == [f"{b}:p1:c0"]
+    assert list(manifest) == [a]
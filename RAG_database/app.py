@@ -6,10 +6,26 @@ import matplotlib.pyplot as plt
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sql_cache import QueryCache, db_data_version
+from schema_catalog import SchemaCatalog
+from sql_executor import SafeExecutor, UnsafeQueryError, QueryTimeoutError
+from result_profile import build_summary_prompt
 
 # Use secrets if deployed on Streamlit Cloud
 import os
 GEMINI_API_KEY = os.getenv("Api_key")
+DB_PATH = "employee_management.db"
+SUMMARY_TOKEN_BUDGET = 1500
+
+# Worked examples shown to the model before every question (few-shot prompting)
+FEW_SHOT_EXAMPLES = [
+    ("How many employees are in each department?",
+     "SELECT d.name, COUNT(e.id) AS employee_count FROM departments d "
+     "LEFT JOIN employees e ON e.department_id = d.id GROUP BY d.name;"),
+    ("Who was hired most recently?",
+     "SELECT first_name, last_name, hire_date FROM employees ORDER BY hire_date DESC LIMIT 1;"),
+]
 
 
 @st.cache_resource
@@ -21,18 +37,37 @@ def init_llm():
         max_tokens=500
     )
 
+@st.cache_resource
+def init_cache():
+    return QueryCache("query_cache.db")
+
+@st.cache_resource
+def init_catalog():
+    # Built once per process; refresh() re-reads it only when the schema version changes
+    return SchemaCatalog(DB_PATH)
+
+@st.cache_resource
+def init_executor():
+    # Read-only pooled connections, single SELECT only, row cap and time limit
+    return SafeExecutor(DB_PATH, row_cap=10000, timeout=5.0)
+
+@st.cache_resource
+def init_pool():
+    # Explanation and summary are independent LLM calls, so they run side by side
+    return ThreadPoolExecutor(max_workers=4)
+
 def call_llm(llm, prompt):
     return llm.invoke([HumanMessage(content=prompt)]).content.strip()
 
 def clean_sql_output(raw_sql):
     """Strip markdown formatting and extract SQL."""
     raw_sql = raw_sql.replace("```sql", "").replace("```", "").strip()
-    match = re.search(r"(SELECT|INSERT|UPDATE|DELETE).*", raw_sql, re.IGNORECASE | re.DOTALL)
+    match = re.search(r"\b(WITH|SELECT)\b.*", raw_sql, re.IGNORECASE | re.DOTALL)
     return match.group(0).strip() if match else raw_sql
 
 def setup_database():
-    if not os.path.exists("employee_management.db"):
-        conn = sqlite3.connect("employee_management.db")
+    if not os.path.exists(DB_PATH):
+        conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         cursor.execute("CREATE TABLE departments (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, location TEXT)")
         cursor.execute("CREATE TABLE jobroles (id INTEGER PRIMARY KEY AUTOINCREMENT, job_title TEXT NOT NULL, min_salary REAL, max_salary REAL)")
@@ -56,16 +91,17 @@ def setup_database():
         conn.commit()
         conn.close()
 
-def generate_sql(llm, question):
-    schema = """
-    Tables:
-    employees(id, first_name, last_name, department_id, job_title, salary, hire_date),
-    departments(id, name, location),
-    jobroles(id, job_title, min_salary, max_salary)
-    """
+def generate_sql(llm, question, examples=(), catalog=None):
+    # Only the tables relevant to this question, read from the database itself
+    catalog = catalog or SchemaCatalog(DB_PATH)
+    schema = catalog.prompt_schema(question, k=5)
+    shots = "\n".join(f"    Question: {q}\n    SQL: {sql}" for q, sql in [*FEW_SHOT_EXAMPLES, *examples])
     prompt = f"""
     Translate the following natural language question to a valid SQLite query based on this schema:
     {schema}
+    Examples:
+{shots}
+
     Question: {question}
     Only return the SQL query.
     """
@@ -78,18 +114,43 @@ def explain_sql(llm, query):
 def summarize_results(llm, question, df):
     if df.empty:
         return "No results found."
-    data = df.to_dict(orient="records")
-    prompt = f"User asked: '{question}'\nHere are the results: {data}\nSummarize this in a human-friendly sentence."
+    # Small results go in as records; large ones as a local statistical profile + sample
+    prompt = build_summary_prompt(question, df, token_budget=SUMMARY_TOKEN_BUDGET)
     return call_llm(llm, prompt)
 
-def execute_sql(query):
-    conn = sqlite3.connect("employee_management.db")
+def run_query(query, executor=None):
+    """Returns (DataFrame, error message or None)."""
+    executor = executor or init_executor()
+    try:
+        df, truncated = executor.run(query)
+        df.attrs["truncated"] = truncated
+        return df, None
+    except (UnsafeQueryError, QueryTimeoutError, sqlite3.Error) as e:
+        return pd.DataFrame(), str(e)
+
+def stream_query(executor, query, slot):
+    """Show rows in `slot` as they are fetched. Returns (DataFrame, error message or None)."""
+    chunks, table = [], None
+    error = None
     try:
-        df = pd.read_sql_query(query, conn)
-    except Exception as e:
-        df = pd.DataFrame()
-        st.error(f"SQL Error: {e}")
-    conn.close()
+        for chunk in executor.stream(query):
+            chunks.append(chunk)
+            if table is None:
+                table = slot.dataframe(chunk)
+            else:
+                table.add_rows(chunk)
+    except (UnsafeQueryError, QueryTimeoutError, sqlite3.Error) as e:
+        error = str(e)
+    if not chunks:
+        return pd.DataFrame(), error
+    df = pd.concat(chunks, ignore_index=True)
+    df.attrs["truncated"] = bool(chunks[-1].attrs.get("truncated"))
+    return df, error
+
+def execute_sql(query):
+    df, error = run_query(query)
+    if error:
+        st.error(f"SQL Error: {error}")
     return df
 
 def main():
@@ -98,32 +159,92 @@ def main():
 
     setup_database()
     llm = init_llm()
+    cache = init_cache()
+    catalog = init_catalog()
+    executor = init_executor()
+    pool = init_pool()
 
     question = st.text_input("Ask your question:", placeholder="e.g., Who earns the most salary?")
     if question:
+        # Repeated questions skip the LLM entirely; new ones only wait on generate_sql
+        cached = cache.get_sql(question)
         with st.spinner("Processing your question..."):
-            sql = generate_sql(llm, question)
-            explanation = explain_sql(llm, sql)
-            df = execute_sql(sql)
-            summary = summarize_results(llm, question, df)
+            if cached:
+                sql = cached["sql"]
+            else:
+                sql = generate_sql(llm, question, cache.similar_examples(question), catalog)
+
+        explanation = cached["explanation"] if cached else None
+        pending = {}
+        if explanation is None:
+            pending[pool.submit(explain_sql, llm, sql)] = "explanation"
 
         st.subheader("🔍 Generated SQL Query")
         st.code(sql, language="sql")
 
         st.subheader("📘 SQL Explanation")
-        st.write(explanation)
+        explanation_slot = st.empty()
+        explanation_slot.write(explanation or "⏳ Explaining the query...")
+
+        st.subheader("📊 Query Result")
+        result_slot = st.empty()
+        version = db_data_version(DB_PATH)
+        entry = cache.get_result(sql, version)
+        error = None
+        if entry is not None:
+            df = entry["df"]
+            result_slot.dataframe(df)
+        else:
+            # Rows are shown as they arrive instead of after the whole result is loaded
+            df, error = stream_query(executor, sql, result_slot)
+            if not error:
+                cache.put_result(sql, version, df)
+                cache.put_sql(question, sql)
+        if error:
+            st.error(f"SQL Error: {error}")
+        elif df.empty:
+            result_slot.write("No rows returned.")
+        elif df.attrs.get("truncated"):
+            st.warning(f"Showing the first {len(df)} rows only.")
+
+        summary = cache.get_summary(question, sql, version)
+        if summary is None:
+            pending[pool.submit(summarize_results, llm, question, df)] = "summary"
 
         if not df.empty:
-            st.subheader("📊 Query Result")
-            st.dataframe(df)
-
             # Only draw chart if there are numeric columns
             numeric_df = df.select_dtypes(include='number')
             if not numeric_df.empty and len(numeric_df.columns) >= 2:
                 st.bar_chart(numeric_df)
 
         st.subheader("✅ Summary")
-        st.success(summary)
+        summary_slot = st.empty()
+        if summary:
+            summary_slot.success(summary)
+        else:
+            summary_slot.info("⏳ Summarizing the results...")
+
+        # Fill in whichever LLM answer arrives first
+        for future in as_completed(pending):
+            if pending[future] == "explanation":
+                try:
+                    explanation = future.result()
+                except Exception as e:
+                    # The SQL itself is already cached with the result
+                    explanation_slot.error(f"Could not explain the query: {e}")
+                    continue
+                explanation_slot.write(explanation)
+                if not error:
+                    cache.put_sql(question, sql, explanation)
+            else:
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    summary_slot.error(f"Could not summarize the results: {e}")
+                    continue
+                summary_slot.success(summary)
+                if not error:
+                    cache.put_summary(question, sql, version, summary)
 
 if __name__ == "__main__":
     main()
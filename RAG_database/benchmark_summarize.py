@@ -0,0 +1,83 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from result_profile import build_summary_prompt, estimate_tokens
+
+# ----------------------------
+# Prompt size / latency: raw records vs. result profile
+# ----------------------------
+# Builds a synthetic employees-style result of N rows and compares the old
+# summarize_results prompt (every row via to_dict) with the profiled one.
+# With --live both prompts are also sent to Gemini to measure the round-trip.
+
+
+def synthetic_result(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    departments = np.array(["Engineering", "Human Resources", "Sales", "Finance", "Support"])
+    titles = np.array(["Software Engineer", "HR Manager", "Sales Executive", "Analyst", "Support Agent"])
+    return pd.DataFrame({
+        "id": np.arange(1, rows + 1),
+        "first_name": rng.choice(["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank"], rows),
+        "last_name": rng.choice(["Smith", "Brown", "Davis", "Miller", "Wilson"], rows),
+        "department": rng.choice(departments, rows),
+        "job_title": rng.choice(titles, rows),
+        "salary": rng.normal(80000, 15000, rows).round(2),
+        "hire_date": pd.to_datetime("2015-01-01")
+                     + pd.to_timedelta(rng.integers(0, 3650, rows), unit="D"),
+    })
+
+
+def raw_prompt(question, df):
+    data = df.to_dict(orient="records")
+    return f"User asked: '{question}'\nHere are the results: {data}\nSummarize this in a human-friendly sentence."
+
+
+def timed(fn, *args, repeat=3, **kwargs):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark summarize_results prompt building.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--budget", type=int, default=1500)
+    parser.add_argument("--live", action="store_true", help="Also time real Gemini calls")
+    args = parser.parse_args()
+
+    question = "What is the salary situation across departments?"
+    llm = None
+    if args.live:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        from langchain_core.messages import HumanMessage
+        llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key=os.getenv("Api_key"),
+                                     temperature=0.3, max_tokens=500)
+
+    print(f"{'rows':>8}{'raw tok':>12}{'raw ms':>9}{'prof tok':>10}{'prof ms':>9}{'shrink':>9}")
+    for rows in args.rows:
+        df = synthetic_result(rows)
+        raw, raw_ms = timed(raw_prompt, question, df)
+        profiled, prof_ms = timed(build_summary_prompt, question, df, token_budget=args.budget)
+        raw_tokens, prof_tokens = estimate_tokens(raw), estimate_tokens(profiled)
+        print(f"{rows:>8}{raw_tokens:>12}{raw_ms:>9.1f}{prof_tokens:>10}{prof_ms:>9.1f}"
+              f"{raw_tokens / prof_tokens:>8.0f}x")
+
+        if llm is not None:
+            for name, prompt in (("raw", raw), ("profiled", profiled)):
+                start = time.perf_counter()
+                try:
+                    llm.invoke([HumanMessage(content=prompt)])
+                    print(f"    {name:<9} LLM round-trip: {(time.perf_counter() - start) * 1000:.0f} ms")
+                except Exception as e:
+                    print(f"    {name:<9} LLM call failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import time
+
+import numpy as np
+
+from app import DB_PATH, setup_database, generate_sql, explain_sql, summarize_results
+from llm_backends import FakeLLM, OllamaLLM, OllamaStubServer
+from schema_catalog import SchemaCatalog
+from sql_cache import normalize_question
+from sql_executor import SafeExecutor
+
+# ----------------------------
+# Text-to-SQL evaluation harness
+# ----------------------------
+# Runs every question of gold_questions.json through the same functions the app uses
+# (generate_sql -> execute -> explain_sql / summarize_results), executes both the generated
+# and the gold SQL on a synthetically scaled copy of employee_management.db, compares
+# the result sets and reports accuracy plus per-stage latency.
+#
+#   python eval_harness.py --backend fake              # offline, deterministic
+#   python eval_harness.py --backend ollama-stub       # offline, through HTTP
+#   python eval_harness.py --backend ollama --model mistral
+#   python eval_harness.py --backend gemini
+
+FIRST_NAMES = ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Heidi", "Ivan", "Judy"]
+LAST_NAMES = ["Smith", "Brown", "Davis", "Miller", "Wilson", "Moore", "Taylor", "Clark"]
+
+
+def build_eval_db(path, employees=1000, seed=42):
+    """Copy employee_management.db to `path` and add `employees` synthetic rows."""
+    setup_database()
+    if os.path.exists(path):
+        os.remove(path)
+    src = sqlite3.connect(DB_PATH)
+    dst = sqlite3.connect(path)
+    src.backup(dst)
+    src.close()
+
+    rng = random.Random(seed)
+    departments = [row[0] for row in dst.execute("SELECT id FROM departments")]
+    roles = dst.execute("SELECT job_title, min_salary, max_salary FROM jobroles").fetchall()
+    rows = []
+    for _ in range(employees):
+        title, lo, hi = rng.choice(roles)
+        # ~5% earn above their role's band so the "above maximum" question is not empty
+        salary = round(rng.uniform(lo, hi * (1.2 if rng.random() < 0.05 else 1.0)), 2)
+        hire_date = f"{rng.randint(2015, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        rows.append((rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(departments),
+                     title, salary, hire_date))
+    dst.executemany("INSERT INTO employees (first_name, last_name, department_id, job_title, salary, hire_date) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows)
+    dst.commit()
+    dst.close()
+    return path
+
+
+def normalize_rows(df, ordered):
+    rows = [tuple(round(v, 2) if isinstance(v, float) else v for v in row)
+            for row in df.itertuples(index=False, name=None)]
+    return rows if ordered else sorted(rows, key=repr)
+
+
+def results_match(generated, expected, gold_sql):
+    if generated.shape != expected.shape:
+        return False
+    ordered = "order by" in gold_sql.lower()
+    return normalize_rows(generated, ordered) == normalize_rows(expected, ordered)
+
+
+def add_error(case, stage, error):
+    message = f"{stage}: {error}"
+    case["error"] = f"{case['error']}; {message}" if case.get("error") else message
+
+
+def evaluate(llm, gold, db_path, with_explain=True, with_summary=True):
+    executor = SafeExecutor(db_path)
+    catalog = SchemaCatalog(db_path)
+    stages = {"generate": [], "execute": [], "explain": [], "summarize": []}
+    cases = []
+
+    for item in gold:
+        case = {"question": item["question"], "gold_sql": item["sql"]}
+        start = time.perf_counter()
+        try:
+            sql = generate_sql(llm, item["question"], catalog=catalog)
+        except Exception as e:
+            case.update(correct=False, error=f"generate: {e}")
+            cases.append(case)
+            continue
+        stages["generate"].append(time.perf_counter() - start)
+        case["sql"] = sql
+
+        try:
+            expected, _ = executor.run(item["sql"])
+        except Exception as e:
+            case.update(correct=False, error=f"gold: {e}")
+            cases.append(case)
+            continue
+        start = time.perf_counter()
+        try:
+            df, _ = executor.run(sql)
+            stages["execute"].append(time.perf_counter() - start)
+            case["correct"] = results_match(df, expected, item["sql"])
+        except Exception as e:
+            df = None
+            case.update(correct=False, error=f"execute: {e}")
+
+        # Explanation and summary failures are recorded but do not change correctness
+        if with_explain:
+            start = time.perf_counter()
+            try:
+                explain_sql(llm, sql)
+                stages["explain"].append(time.perf_counter() - start)
+            except Exception as e:
+                add_error(case, "explain", e)
+        if with_summary and df is not None:
+            start = time.perf_counter()
+            try:
+                summarize_results(llm, item["question"], df)
+                stages["summarize"].append(time.perf_counter() - start)
+            except Exception as e:
+                add_error(case, "summarize", e)
+        cases.append(case)
+
+    report = {
+        "questions": len(gold),
+        "correct": sum(c["correct"] for c in cases),
+        "accuracy": sum(c["correct"] for c in cases) / len(gold) if gold else 0.0,
+        "stages": {
+            name: {
+                "count": len(values),
+                "mean_ms": statistics.mean(values) * 1000 if values else 0.0,
+                "p50_ms": float(np.percentile(values, 50)) * 1000 if values else 0.0,
+                "p95_ms": float(np.percentile(values, 95)) * 1000 if values else 0.0,
+            }
+            for name, values in stages.items()
+        },
+        "cases": cases,
+    }
+    return report
+
+
+def print_report(report):
+    print(f"\nAccuracy: {report['correct']}/{report['questions']} ({report['accuracy'] * 100:.1f}%)")
+    print(f"\n{'stage':<12}{'count':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, s in report["stages"].items():
+        print(f"{name:<12}{s['count']:>7}{s['mean_ms']:>10.1f}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}")
+    failed = [c for c in report["cases"] if not c["correct"]]
+    if failed:
+        print("\n❌ Incorrect:")
+        for c in failed:
+            print(f"  - {c['question']}\n    got: {c.get('sql')}  {c.get('error', '')}")
+    errors = [c for c in report["cases"] if c["correct"] and c.get("error")]
+    if errors:
+        print("\n⚠️ Correct, but a later stage failed:")
+        for c in errors:
+            print(f"  - {c['question']}\n    {c['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate text-to-SQL accuracy and latency.")
+    parser.add_argument("--backend", choices=["fake", "ollama-stub", "ollama", "gemini"], default="fake")
+    parser.add_argument("--model", default="mistral", help="Model name for the ollama backend")
+    parser.add_argument("--ollama-url", default="http://localhost:11434")
+    parser.add_argument("--gold", default="gold_questions.json")
+    parser.add_argument("--employees", type=int, default=1000, help="Synthetic employees to add")
+    parser.add_argument("--eval-db", default="eval_employee_management.db")
+    parser.add_argument("--fake-latency", type=float, default=0.0, help="Seconds per fake LLM call")
+    parser.add_argument("--no-explain", action="store_true")
+    parser.add_argument("--no-summary", action="store_true")
+    parser.add_argument("--out", default=None, help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    with open(args.gold, encoding="utf-8") as f:
+        gold = json.load(f)
+    gold_sql = {normalize_question(item["question"]): item["sql"] for item in gold}
+    db_path = build_eval_db(args.eval_db, employees=args.employees)
+    print(f"🗄️ Eval DB: {db_path} (+{args.employees} synthetic employees)")
+
+    def run(llm):
+        return evaluate(llm, gold, db_path, not args.no_explain, not args.no_summary)
+
+    if args.backend == "fake":
+        report = run(FakeLLM(gold_sql, latency=args.fake_latency))
+    elif args.backend == "ollama-stub":
+        with OllamaStubServer(gold_sql, latency=args.fake_latency) as stub:
+            report = run(OllamaLLM(model=args.model, base_url=stub.base_url))
+    elif args.backend == "ollama":
+        report = run(OllamaLLM(model=args.model, base_url=args.ollama_url))
+    else:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        report = run(ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key=os.getenv("Api_key"),
+                                            temperature=0.3, max_tokens=500))
+
+    report["backend"] = args.backend
+    print_report(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
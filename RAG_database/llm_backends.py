@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from sql_cache import normalize_question
+
+# ----------------------------
+# LLM stand-ins for offline evaluation
+# ----------------------------
+# Anything with `invoke(messages) -> object with .content` can replace the Gemini model
+# in app.py (call_llm only uses that). FakeLLM answers deterministically from a gold
+# set; OllamaLLM talks to an Ollama-compatible /api/generate endpoint, which can be a
+# real local Ollama or the OllamaStubServer below (so the HTTP path runs in CI too).
+
+SQL_PROMPT_MARKER = "Translate the following natural language question"
+
+
+def _prompt_text(messages):
+    if isinstance(messages, str):
+        return messages
+    last = messages[-1]
+    return getattr(last, "content", str(last))
+
+
+def fake_answer(prompt, gold_sql):
+    """Deterministic answer for the three prompt kinds app.py sends."""
+    if SQL_PROMPT_MARKER in prompt:
+        # The real question is the last "Question:" line (few-shot examples come first)
+        question = prompt[prompt.rfind("Question:") + len("Question:"):].split("\n", 1)[0]
+        sql = gold_sql.get(normalize_question(question), "SELECT 1")
+        return f"```sql\n{sql}\n```"
+    if prompt.startswith("What does this SQL query do?"):
+        return "This query reads data from the employee database and returns the matching rows."
+    return "Here is a short summary of the results."
+
+
+class FakeLLM:
+    def __init__(self, gold_sql, latency=0.0):
+        """`gold_sql` maps normalized question -> SQL; `latency` simulates model time (s)."""
+        self.gold_sql = gold_sql
+        self.latency = latency
+
+    def invoke(self, messages):
+        if self.latency:
+            time.sleep(self.latency)
+        return SimpleNamespace(content=fake_answer(_prompt_text(messages), self.gold_sql))
+
+
+class OllamaLLM:
+    def __init__(self, model="mistral", base_url="http://localhost:11434", timeout=120):
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def invoke(self, messages):
+        payload = json.dumps({"model": self.model, "prompt": _prompt_text(messages), "stream": False})
+        request = urllib.request.Request(f"{self.base_url}/api/generate", data=payload.encode(),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return SimpleNamespace(content=json.loads(response.read())["response"])
+
+
+class OllamaStubServer:
+    """Minimal Ollama-compatible HTTP server backed by fake_answer (for CI)."""
+
+    def __init__(self, gold_sql, host="127.0.0.1", port=0, latency=0.0):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path != "/api/generate":
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if stub.latency:
+                    time.sleep(stub.latency)
+                data = json.dumps({"model": body.get("model"), "done": True,
+                                   "response": fake_answer(body.get("prompt", ""), stub.gold_sql)})
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data.encode())
+
+            def log_message(self, *args):
+                pass
+
+        self.gold_sql = gold_sql
+        self.latency = latency
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
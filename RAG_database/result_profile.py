@@ -0,0 +1,134 @@
+import json
+
+import pandas as pd
+
+# ----------------------------
+# Compact result profiles for summarize_results
+# ----------------------------
+# Instead of pasting every row into the prompt, large results are described by statistics
+# computed locally with vectorized pandas (row count, per-column min/max/mean, top values,
+# one group-by summary) plus a handful of sample rows. The prompt is shrunk step by step
+# until it fits a hard token budget.
+
+DEFAULT_TOKEN_BUDGET = 1500
+SMALL_RESULT_ROWS = 20  # up to this many rows the raw records are sent as before
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token), good enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def _jsonable(value):
+    if pd.isna(value):
+        return None
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value
+
+
+def unique_columns(df):
+    """df with repeated column names suffixed (id, id_1, ...), as SELECT * over a join returns."""
+    if df.columns.is_unique:
+        return df
+    names, used = [], set()
+    for col in df.columns:
+        name, i = str(col), 0
+        while name in used:
+            i += 1
+            name = f"{col}_{i}"
+        used.add(name)
+        names.append(name)
+    return df.set_axis(names, axis=1)
+
+
+def profile_dataframe(df, top_k=5, max_groups=10):
+    df = unique_columns(df)
+    profile = {"rows": int(len(df)), "columns": {}}
+    numeric = df.select_dtypes(include="number")
+    other = df.drop(columns=numeric.columns)
+
+    if not numeric.empty:
+        stats = numeric.agg(["min", "max", "mean", "sum"])
+        nulls = numeric.isna().sum()
+        for col in numeric.columns:
+            profile["columns"][col] = {
+                "type": "number",
+                **{k: _jsonable(round(v, 2) if isinstance(v, float) else v) for k, v in stats[col].items()},
+                "nulls": int(nulls[col]),
+            }
+
+    group_col = None
+    for col in other.columns:
+        counts = other[col].value_counts(dropna=True)
+        profile["columns"][col] = {
+            "type": "text",
+            "distinct": int(len(counts)),
+            "top": {str(k): int(v) for k, v in counts.head(top_k).items()},
+            "nulls": int(other[col].isna().sum()),
+        }
+        if group_col is None and 1 < len(counts) <= max_groups:
+            group_col = col
+
+    # One group summary: the first low-cardinality text column against the numeric ones
+    if group_col is not None and not numeric.empty:
+        grouped = df.groupby(group_col)[list(numeric.columns)].agg(["count", "mean", "sum"])
+        grouped.columns = [f"{c}_{stat}" for c, stat in grouped.columns]
+        profile["groups"] = {
+            "by": group_col,
+            "values": {str(k): {c: _jsonable(v) for c, v in row.items()}
+                       for k, row in grouped.round(2).iterrows()},
+        }
+    return profile
+
+
+def _sample(df, n):
+    if n <= 0:
+        return []
+    sample = df.head(n)
+    return json.loads(sample.to_json(orient="records", date_format="iso"))
+
+
+def build_summary_prompt(question, df, token_budget=DEFAULT_TOKEN_BUDGET, sample_rows=5):
+    """Prompt for summarize_results that never exceeds `token_budget` (estimated) tokens."""
+    df = unique_columns(df)
+    if len(df) <= SMALL_RESULT_ROWS:
+        data = df.to_dict(orient="records")
+        prompt = f"User asked: '{question}'\nHere are the results: {data}\nSummarize this in a human-friendly sentence."
+        if estimate_tokens(prompt) <= token_budget:
+            return prompt
+
+    full = profile_dataframe(df, top_k=5)
+    instruction = "Summarize this in a human-friendly sentence, using the profile for totals and trends."
+    top_k, with_groups = 5, True
+    while True:
+        # Trim the precomputed profile instead of recomputing it
+        profile = {**full, "columns": {
+            col: {**info, "top": dict(list(info["top"].items())[:top_k])} if "top" in info else info
+            for col, info in full["columns"].items()
+        }}
+        if not with_groups:
+            profile.pop("groups", None)
+        prompt = (
+            f"User asked: '{question}'\n"
+            f"The query returned {len(df)} rows. Here is a statistical profile of the result:\n"
+            f"{json.dumps(profile, default=str)}\n"
+            f"First rows: {json.dumps(_sample(df, sample_rows), default=str)}\n"
+            f"{instruction}"
+        )
+        if estimate_tokens(prompt) <= token_budget:
+            return prompt
+        # Shrink in order of least useful: sample rows, top values, group summary
+        if sample_rows > 1:
+            sample_rows //= 2
+        elif top_k > 1:
+            top_k -= 2 if top_k > 2 else 1
+        elif with_groups and "groups" in profile:
+            with_groups = False
+        elif sample_rows:
+            sample_rows = 0
+        else:
+            # Very wide results: hard cut, but keep the instruction at the end
+            return prompt[: token_budget * 4 - len(instruction) - 10] + "...\n" + instruction
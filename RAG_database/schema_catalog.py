@@ -0,0 +1,154 @@
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+
+# ----------------------------
+# Schema catalog for text-to-SQL prompts
+# ----------------------------
+# The schema is read from sqlite_master / PRAGMA table_info / PRAGMA foreign_key_list
+# instead of being hard-coded, cached, and re-read only when PRAGMA schema_version moves.
+# For each question only the top-k relevant tables (plus the tables they join to) and
+# their most relevant columns go into the prompt, so prompt size stays bounded no matter
+# how many tables the database has.
+
+
+def _tokens(text):
+    """Split identifiers and questions into comparable word stems."""
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    words = re.split(r"[\W_]+", text.lower())
+    return [w[:-1] if len(w) > 3 and w.endswith("s") else w for w in words if w]
+
+
+class Table:
+    def __init__(self, name, columns, foreign_keys):
+        self.name = name
+        self.columns = columns            # [(name, type, is_pk)]
+        self.foreign_keys = foreign_keys  # [(column, ref_table, ref_column)]
+        self.name_tokens = set(_tokens(name))
+        self.column_tokens = {col: set(_tokens(col)) for col, _, _ in columns}
+
+    def all_tokens(self):
+        tokens = list(self.name_tokens)
+        for col_tokens in self.column_tokens.values():
+            tokens.extend(col_tokens)
+        return tokens
+
+
+class SchemaCatalog:
+    def __init__(self, db_path, embed_fn=None):
+        """`embed_fn(list_of_texts) -> list_of_vectors` enables embedding-based ranking."""
+        self.db_path = db_path
+        self.embed_fn = embed_fn
+        self.tables = {}
+        self.schema_version = None
+        self._idf = {}
+        self._table_vectors = {}
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+
+    def refresh(self):
+        """Re-read the schema if it changed since the last call."""
+        conn = self._connect()
+        try:
+            version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            if version == self.schema_version:
+                return False
+            names = [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+                "AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+            tables = {}
+            for name in names:
+                columns = [(row[1], row[2], bool(row[5]))
+                           for row in conn.execute(f'PRAGMA table_info("{name}")')]
+                fks = [(row[3], row[2], row[4])
+                       for row in conn.execute(f'PRAGMA foreign_key_list("{name}")')]
+                tables[name] = Table(name, columns, fks)
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.tables = tables
+            self.schema_version = version
+            df = Counter(tok for t in tables.values() for tok in set(t.all_tokens()))
+            n = max(len(tables), 1)
+            self._idf = {tok: math.log(1 + n / count) for tok, count in df.items()}
+            self._table_vectors = {}
+            if self.embed_fn is not None and tables:
+                descriptions = [f"{t.name}: {', '.join(c for c, _, _ in t.columns)}" for t in tables.values()]
+                self._table_vectors = dict(zip(tables, self.embed_fn(descriptions)))
+        return True
+
+    # ---- ranking ----
+    def _keyword_scores(self, question):
+        words = _tokens(question)
+        # Adjacent pairs too, so "job roles" also matches a table called "jobroles"
+        q = set(words) | set(_tokens(" ".join(a + b for a, b in zip(words, words[1:]))))
+        scores = {}
+        for name, table in self.tables.items():
+            # Table-name hits count double: "employees" in a question is a strong signal
+            score = 2 * sum(self._idf.get(t, 0) for t in q & table.name_tokens)
+            score += sum(self._idf.get(t, 0) for t in q & set(table.all_tokens()))
+            scores[name] = score
+        return scores
+
+    def _embedding_scores(self, question):
+        if not self._table_vectors:
+            return {}
+        q = self.embed_fn([question])[0]
+        q_norm = math.sqrt(sum(x * x for x in q)) or 1.0
+        scores = {}
+        for name, vec in self._table_vectors.items():
+            v_norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+            scores[name] = sum(a * b for a, b in zip(q, vec)) / (q_norm * v_norm)
+        return scores
+
+    def relevant_tables(self, question, k=5):
+        """Top-k tables for the question, plus tables they reference via foreign keys."""
+        self.refresh()
+        scores = self._keyword_scores(question)
+        for name, score in self._embedding_scores(question).items():
+            scores[name] = scores.get(name, 0) + 2 * score
+        ranked = [name for name, score in sorted(scores.items(), key=lambda x: -x[1]) if score > 0]
+        if not ranked:
+            ranked = list(self.tables)
+        chosen = ranked[:k]
+
+        # Join partners, so the model can still write the JOIN (bounded to k extra)
+        extra = []
+        for name in chosen:
+            for _, ref_table, _ in self.tables[name].foreign_keys:
+                if ref_table in self.tables and ref_table not in chosen and ref_table not in extra:
+                    extra.append(ref_table)
+        return chosen + extra[:k]
+
+    def _relevant_columns(self, table, question, max_columns):
+        if len(table.columns) <= max_columns:
+            return [c for c, _, _ in table.columns]
+        q = set(_tokens(question))
+        fk_columns = {col for col, _, _ in table.foreign_keys}
+        ranked = sorted(
+            table.columns,
+            key=lambda c: (not c[2], -len(q & table.column_tokens[c[0]]), c[0] not in fk_columns),
+        )
+        keep = {c for c, _, _ in ranked[:max_columns]}
+        # Keep the table's own column order in the prompt
+        return [c for c, _, _ in table.columns if c in keep]
+
+    def prompt_schema(self, question, k=5, max_columns=20):
+        """Schema text for the prompt, in the same shape the hand-written one used."""
+        names = self.relevant_tables(question, k)
+        lines, joins = [], []
+        for name in names:
+            table = self.tables[name]
+            lines.append(f"{name}({', '.join(self._relevant_columns(table, question, max_columns))})")
+            for col, ref_table, ref_col in table.foreign_keys:
+                if ref_table in names:
+                    joins.append(f"{name}.{col} -> {ref_table}.{ref_col or 'id'}")
+        text = "Tables:\n    " + ",\n    ".join(lines)
+        if joins:
+            text += "\n    Foreign keys:\n    " + "\n    ".join(joins)
+        return text
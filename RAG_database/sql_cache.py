@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# ----------------------------
+# Caches for the Text to SQL chatbot
+# ----------------------------
+# Question cache: normalized question -> generated SQL + explanation. Persisted in its own
+# SQLite file so it survives restarts and never touches the employee DB.
+# Result cache: (SQL, DB data version) -> DataFrame + summary, kept in memory. The data
+# version comes from the DB file stats, so any write to the DB invalidates old results.
+
+QUESTION_TTL_SECONDS = 7 * 24 * 3600
+STOPWORDS = {"the", "a", "an", "of", "in", "is", "are", "me", "please", "show", "list", "what", "who", "which"}
+
+
+def normalize_question(question):
+    """Lowercase, drop punctuation and collapse whitespace, so trivial rephrasings share a key."""
+    question = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(question.split())
+
+
+def question_tokens(question):
+    return {w for w in normalize_question(question).split() if w not in STOPWORDS}
+
+
+def db_data_version(db_path):
+    """Changes whenever the database (or its WAL) is written."""
+    parts = []
+    for path in (db_path, db_path + "-wal"):
+        if os.path.exists(path):
+            st = os.stat(path)
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+    return "|".join(parts)
+
+
+class QueryCache:
+    def __init__(self, path="query_cache.db", max_results=256):
+        self.path = path
+        self.max_results = max_results
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        # One connection shared by Streamlit's script threads, serialized by the lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS questions ("
+                "key TEXT PRIMARY KEY, question TEXT, sql TEXT, explanation TEXT, created REAL)"
+            )
+
+    # ---- question -> SQL + explanation ----
+    def get_sql(self, question):
+        key = normalize_question(question)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sql, explanation, created FROM questions WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[2] > QUESTION_TTL_SECONDS:
+            return None
+        return {"sql": row[0], "explanation": row[1]}
+
+    def put_sql(self, question, sql, explanation=None):
+        key = normalize_question(question)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO questions (key, question, sql, explanation, created) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET sql = excluded.sql, "
+                "explanation = COALESCE(excluded.explanation, questions.explanation), created = excluded.created",
+                (key, question, sql, explanation, time.time()),
+            )
+
+    def similar_examples(self, question, n=2):
+        """Previously answered questions that share the most words with this one (few-shot)."""
+        tokens = question_tokens(question)
+        if not tokens:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT question, sql FROM questions ORDER BY created DESC LIMIT 500"
+            ).fetchall()
+        scored = []
+        for past_question, sql in rows:
+            past = question_tokens(past_question)
+            overlap = len(tokens & past) / len(tokens | past) if past else 0
+            if overlap > 0:
+                scored.append((overlap, past_question, sql))
+        scored.sort(reverse=True)
+        return [(q, sql) for _, q, sql in scored[:n]]
+
+    # ---- (SQL, data version) -> result ----
+    @staticmethod
+    def _result_key(sql, data_version):
+        return hashlib.sha1(json.dumps([sql.strip(), data_version]).encode()).hexdigest()
+
+    def get_result(self, sql, data_version):
+        key = self._result_key(sql, data_version)
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                self._results.move_to_end(key)
+            return entry
+
+    def put_result(self, sql, data_version, df):
+        key = self._result_key(sql, data_version)
+        with self._lock:
+            self._results[key] = {"df": df, "summaries": {}}
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+
+    def get_summary(self, question, sql, data_version):
+        entry = self.get_result(sql, data_version)
+        return entry["summaries"].get(normalize_question(question)) if entry else None
+
+    def put_summary(self, question, sql, data_version, summary):
+        entry = self.get_result(sql, data_version)
+        if entry is not None:
+            entry["summaries"][normalize_question(question)] = summary
@@ -0,0 +1,146 @@
+import queue
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+
+# ----------------------------
+# Bounded, read-only execution of LLM-generated SQL
+# ----------------------------
+# - connections are opened with a mode=ro URI and kept in a small pool
+# - only a single SELECT (or WITH ... SELECT) statement is accepted, and an authorizer
+#   denies anything that would write even if the text check were fooled
+# - a LIMIT is added when the query has none, and rows are fetched in chunks up to a cap
+# - a progress handler aborts the query once it runs past the wall-clock limit
+
+DEFAULT_ROW_CAP = 10000
+DEFAULT_TIMEOUT_SECONDS = 5.0
+PROGRESS_STEPS = 10000  # SQLite VM instructions between time checks
+
+READ_ONLY_ACTIONS = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    getattr(sqlite3, "SQLITE_RECURSIVE", 33),
+}
+LIMIT_AT_END = re.compile(r"\bLIMIT\s+\d+(\s*(,|OFFSET)\s*\d+)?\s*$", re.IGNORECASE)
+
+
+class UnsafeQueryError(ValueError):
+    pass
+
+
+class QueryTimeoutError(RuntimeError):
+    pass
+
+
+def _strip_comments(sql):
+    sql = re.sub(r"/\*.*?\*/", " ", sql, flags=re.DOTALL)
+    return re.sub(r"--[^\n]*", " ", sql)
+
+
+def validate_select(sql):
+    """Return the statement without trailing ';' if it is a single read-only SELECT."""
+    statement = _strip_comments(sql).strip().rstrip(";").strip()
+    if not statement:
+        raise UnsafeQueryError("Empty query")
+    if not re.match(r"(SELECT|WITH)\b", statement, re.IGNORECASE):
+        raise UnsafeQueryError("Only SELECT queries are allowed")
+    # A ';' outside string literals means a second statement
+    if ";" in re.sub(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"", "", statement):
+        raise UnsafeQueryError("Only a single statement is allowed")
+    return statement
+
+
+def with_limit(statement, limit):
+    """Append a LIMIT when the statement has none at the top level."""
+    if LIMIT_AT_END.search(statement):
+        return statement
+    return f"{statement}\nLIMIT {limit}"
+
+
+def _authorizer(action, arg1, arg2, db_name, trigger):
+    return sqlite3.SQLITE_OK if action in READ_ONLY_ACTIONS else sqlite3.SQLITE_DENY
+
+
+class SafeExecutor:
+    def __init__(self, db_path, pool_size=4, row_cap=DEFAULT_ROW_CAP,
+                 timeout=DEFAULT_TIMEOUT_SECONDS, chunk_size=500):
+        self.db_path = db_path
+        self.row_cap = row_cap
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _open(self):
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+        conn.set_authorizer(_authorizer)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            conn.set_progress_handler(None, 0)
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def iter_rows(self, sql, chunk_size=None):
+        """Yield (columns, rows, truncated, last) with rows as plain tuples, stopping at row_cap rows."""
+        chunk_size = chunk_size or self.chunk_size
+        statement = with_limit(validate_select(sql), self.row_cap + 1)
+        deadline = time.monotonic() + self.timeout
+
+        with self.connection() as conn:
+            conn.set_progress_handler(lambda: int(time.monotonic() > deadline), PROGRESS_STEPS)
+            cursor = None
+            try:
+                cursor = conn.execute(statement)
+                columns = [d[0] for d in cursor.description]
+                fetched = 0
+                while True:
+                    rows = cursor.fetchmany(min(chunk_size, self.row_cap - fetched))
+                    fetched += len(rows)
+                    # At the cap, probe for the LIMIT row_cap+1 row to know if anything was cut off
+                    truncated = fetched >= self.row_cap and cursor.fetchone() is not None
+                    done = fetched >= self.row_cap or len(rows) < chunk_size
+                    if rows or fetched == 0:
+                        yield columns, rows, truncated, done
+                    if done:
+                        return
+            except sqlite3.DatabaseError as e:
+                if "interrupted" in str(e):
+                    raise QueryTimeoutError(f"Query exceeded {self.timeout:.0f}s and was stopped") from e
+                if "not authorized" in str(e):
+                    raise UnsafeQueryError("Query tried to do more than read data") from e
+                raise
+            finally:
+                # Also runs when the caller stops reading early, before the connection is reused
+                if cursor is not None:
+                    cursor.close()
+
+    def stream(self, sql, chunk_size=None):
+        """Yield the result as DataFrame chunks, stopping at row_cap rows.
+
+        The last chunk has attrs["truncated"] set when rows were cut off at the cap.
+        """
+        import pandas as pd
+        for columns, rows, truncated, done in self.iter_rows(sql, chunk_size):
+            chunk = pd.DataFrame.from_records(rows, columns=columns)
+            chunk.attrs["truncated"] = truncated
+            chunk.attrs["last"] = done
+            yield chunk
+
+    def run(self, sql):
+        """Whole (capped) result as one DataFrame. Returns (df, truncated)."""
+        import pandas as pd
+        chunks = list(self.stream(sql))
+        df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+        return df, bool(chunks[-1].attrs.get("truncated"))
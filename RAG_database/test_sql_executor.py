@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+from sql_executor import SafeExecutor, UnsafeQueryError, validate_select, with_limit
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "numbers.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE numbers (n INTEGER)")
+    conn.executemany("INSERT INTO numbers VALUES (?)", [(i,) for i in range(30)])
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def fetch_all(executor, sql):
+    """All rows plus the truncated flag of the last chunk, without going through pandas."""
+    rows, truncated = [], False
+    for _, chunk, truncated, _ in executor.iter_rows(sql):
+        rows.extend(chunk)
+    return rows, truncated
+
+
+@pytest.mark.parametrize("row_cap, chunk_size", [(10, 5), (10, 3), (10, 10), (12, 5)])
+def test_truncated_when_rows_exceed_cap(db_path, row_cap, chunk_size):
+    # row_cap % chunk_size == 0 used to stop before the probe row and report a complete result
+    rows, truncated = fetch_all(SafeExecutor(db_path, row_cap=row_cap, chunk_size=chunk_size),
+                                "SELECT n FROM numbers")
+    assert len(rows) == row_cap
+    assert truncated
+
+
+@pytest.mark.parametrize("row_cap, chunk_size", [(30, 5), (30, 7), (40, 5)])
+def test_not_truncated_when_rows_fit(db_path, row_cap, chunk_size):
+    rows, truncated = fetch_all(SafeExecutor(db_path, row_cap=row_cap, chunk_size=chunk_size),
+                                "SELECT n FROM numbers")
+    assert len(rows) == 30
+    assert not truncated
+
+
+def test_run_returns_dataframe(db_path):
+    pytest.importorskip("pandas")
+    df, truncated = SafeExecutor(db_path, row_cap=10, chunk_size=3).run("SELECT n FROM numbers")
+    assert list(df["n"]) == list(range(10))
+    assert truncated
+
+
+@pytest.mark.parametrize("sql", [
+    "DELETE FROM numbers",
+    "SELECT 1; DROP TABLE numbers",
+    "PRAGMA table_info(numbers)",
+    "",
+])
+def test_validate_select_rejects(sql):
+    with pytest.raises(UnsafeQueryError):
+        validate_select(sql)
+
+
+def test_validate_select_keeps_semicolons_in_literals():
+    assert validate_select("SELECT 'a;b' AS s; -- trailing") == "SELECT 'a;b' AS s"
+
+
+def test_authorizer_denies_more_than_reads(db_path):
+    executor = SafeExecutor(db_path)
+    # Passes the text check, but a pragma is not one of the read-only actions
+    with pytest.raises(UnsafeQueryError):
+        fetch_all(executor, "SELECT * FROM pragma_table_info('numbers')")
+    with executor.connection() as conn:
+        for statement in ["INSERT INTO numbers VALUES (99)", "ATTACH DATABASE ':memory:' AS scratch"]:
+            with pytest.raises(sqlite3.DatabaseError, match="not authorized"):
+                conn.execute(statement)
+    assert fetch_all(executor, "SELECT COUNT(*) FROM numbers")[0] == [(30,)]
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ("SELECT n FROM numbers", "SELECT n FROM numbers\nLIMIT 11"),
+    ("SELECT n FROM numbers LIMIT 5", "SELECT n FROM numbers LIMIT 5"),
+    ("SELECT n FROM numbers LIMIT 5 OFFSET 2", "SELECT n FROM numbers LIMIT 5 OFFSET 2"),
+    ("SELECT n FROM (SELECT n FROM numbers LIMIT 5) ORDER BY n", "SELECT n FROM (SELECT n FROM numbers LIMIT 5) ORDER BY n\nLIMIT 11"),
+])
+def test_with_limit(statement, expected):
+    assert with_limit(statement, 11) == expected
+
+
+def test_limit_is_injected_when_missing(db_path):
+    # The cap is enforced by SQLite: only row_cap + 1 rows ever leave the engine
+    executor = SafeExecutor(db_path, row_cap=10, chunk_size=100)
+    statements = []
+    with executor.connection() as conn:
+        conn.set_trace_callback(statements.append)
+    fetch_all(executor, "SELECT n FROM numbers")  # reuses the pooled connection
+    assert statements == ["SELECT n FROM numbers\nLIMIT 11"]
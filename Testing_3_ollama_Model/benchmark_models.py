@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from summarizer import OLLAMA_URL, OllamaClient
+
+# ----------------------------
+# Multi-model Ollama benchmark
+# ----------------------------
+# One runner instead of three copy-pasted notebooks and a hand-written report: the same
+# prompt set (benchmark_prompts.json, with reference facts) is sent to every model, the
+# models run in parallel, and each answer is streamed so time-to-first-token is real.
+# Per model it records TTFT, tokens/sec, total latency, server memory (/api/ps), fact
+# recall (keywords, optionally embedding similarity), misleading claims and leaked
+# <think> reasoning, and writes the comparison as Markdown + JSON.
+#
+#   python benchmark_models.py --models llama3.2 mistral deepseek-r1:1.5b
+#   python benchmark_models.py --fake                  # offline, stand_ins.FakeOllama
+
+DEFAULT_MODELS = ["llama3.2", "mistral", "deepseek-r1:1.5b"]
+THINK = re.compile(r"<think>.*?(</think>|$)", re.DOTALL | re.IGNORECASE)
+
+
+# ---- scoring ----
+def strip_reasoning(text):
+    """(answer without <think> blocks, whether any reasoning was present)."""
+    stripped = THINK.sub("", text)
+    return stripped.strip(), stripped != text
+
+
+def keyword_match(answer, fact):
+    """Every keyword group must have at least one alternative in the answer, as a whole word ("8" is not in "1987")."""
+    return all(any(re.search(rf"\b{re.escape(k)}\b", answer, re.IGNORECASE) for k in group)
+               for group in fact["keywords"])
+
+
+class SemanticMatcher:
+    """Fact counts as covered if some answer sentence is close enough in embedding space."""
+
+    def __init__(self, model_name="all-MiniLM-L6-v2", threshold=0.6):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.threshold = threshold
+
+    def __call__(self, answer, fact):
+        from extract import split_sentences
+        sentences = split_sentences(answer) or [answer]
+        vectors = self.model.encode([fact["fact"]] + sentences, normalize_embeddings=True)
+        return float((vectors[1:] @ vectors[0]).max()) >= self.threshold
+
+
+def score_answer(answer, item, semantic=None):
+    facts = item.get("facts", [])
+    matched = [f["fact"] for f in facts if keyword_match(answer, f) or (semantic is not None and semantic(answer, f))]
+    lower = answer.lower()
+    misleading = [m for m in item.get("misleading", []) if m.lower() in lower]
+    return {
+        "fact_recall": len(matched) / len(facts) if facts else 1.0,
+        "facts_matched": matched,
+        "facts_missed": [f["fact"] for f in facts if f["fact"] not in matched],
+        "misleading": misleading,
+    }
+
+
+# ---- running ----
+def loaded_model_bytes(client, model):
+    """Resident size of `model` as reported by Ollama's /api/ps, or None."""
+    try:
+        response = client.session.get(f"{client.base_url}/api/ps", timeout=10)
+        response.raise_for_status()
+    except Exception:
+        return None
+    for entry in response.json().get("models", []):
+        name = entry.get("name") or entry.get("model", "")
+        if name in (model, f"{model}:latest") or name.split(":")[0] == model:
+            return entry.get("size")
+    return None
+
+
+def tokens_per_second(result):
+    if result.get("eval_count") and result.get("eval_duration"):
+        return result["eval_count"] / (result["eval_duration"] / 1e9)
+    generation = result["seconds"] - result["ttft"]
+    return len(result["response"].split()) / generation if generation > 0 else 0.0
+
+
+def run_model(client, model, prompts, context, repeats=1, semantic=None, options=None):
+    runs = []
+    for item in prompts:
+        prompt = item["prompt"].replace("{context}", context)
+        for repeat in range(repeats):
+            try:
+                result = client.generate(model, prompt, stream=True, options=options)
+            except Exception as e:
+                runs.append({"prompt_id": item["id"], "repeat": repeat, "error": str(e)})
+                continue
+            answer, leaked = strip_reasoning(result["response"])
+            runs.append({
+                "prompt_id": item["id"],
+                "repeat": repeat,
+                "ttft_s": result["ttft"],
+                "latency_s": result["seconds"],
+                "tokens_per_sec": tokens_per_second(result),
+                "output_tokens": result.get("eval_count"),
+                "prompt_tokens": result.get("prompt_eval_count"),
+                "reasoning_leaked": leaked,
+                "answer": answer,
+                **score_answer(answer, item, semantic),
+            })
+    return {"model": model, "memory_bytes": loaded_model_bytes(client, model), "runs": runs}
+
+
+def summarize_model(result):
+    ok = [r for r in result["runs"] if "error" not in r]
+    mean = lambda key: statistics.mean(r[key] for r in ok) if ok else None
+    pct = lambda key, q: float(np.percentile([r[key] for r in ok], q)) if ok else None
+    return {
+        "model": result["model"],
+        "runs": len(result["runs"]),
+        "errors": len(result["runs"]) - len(ok),
+        "fact_recall": mean("fact_recall"),
+        "misleading_claims": sum(len(r["misleading"]) for r in ok),
+        "reasoning_leaks": sum(r["reasoning_leaked"] for r in ok),
+        "ttft_p50_s": pct("ttft_s", 50),
+        "tokens_per_sec": mean("tokens_per_sec"),
+        "latency_p50_s": pct("latency_s", 50),
+        "latency_p95_s": pct("latency_s", 95),
+        "memory_gb": None if result["memory_bytes"] is None else result["memory_bytes"] / 1e9,
+    }
+
+
+def run_benchmark(models, prompts, context, base_url=OLLAMA_URL, parallel=None, repeats=1,
+                  semantic=None, options=None):
+    client = OllamaClient(base_url, pool_size=max(len(models), 1))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=parallel or len(models)) as pool:
+        results = list(pool.map(lambda m: run_model(client, m, prompts, context, repeats, semantic, options),
+                                models))
+    client.close()
+    return {
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "base_url": base_url,
+        "wall_seconds": time.perf_counter() - start,
+        "prompts": [p["id"] for p in prompts],
+        "repeats": repeats,
+        "summary": [summarize_model(r) for r in results],
+        "results": results,
+    }
+
+
+# ---- report ----
+def _fmt(value, spec):
+    return "n/a" if value is None else format(value, spec)
+
+
+def markdown_report(report):
+    lines = [
+        "# Model Comparison Report",
+        "",
+        f"Generated {report['generated_at']} against `{report['base_url']}` — "
+        f"{len(report['prompts'])} prompts × {report['repeats']} repeat(s), wall time {report['wall_seconds']:.1f}s.",
+        "",
+        "| Model | Fact recall | Misleading | Reasoning leaks | TTFT p50 (s) | Tokens/s | "
+        "Latency p50 (s) | Latency p95 (s) | Memory (GB) | Errors |",
+        "|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for s in report["summary"]:
+        lines.append(f"| {s['model']} | {_fmt(s['fact_recall'], '.0%')} | {s['misleading_claims']} | "
+                     f"{s['reasoning_leaks']} | {_fmt(s['ttft_p50_s'], '.2f')} | {_fmt(s['tokens_per_sec'], '.1f')} | "
+                     f"{_fmt(s['latency_p50_s'], '.2f')} | {_fmt(s['latency_p95_s'], '.2f')} | "
+                     f"{_fmt(s['memory_gb'], '.2f')} | {s['errors']} |")
+
+    scored = [s for s in report["summary"] if s["fact_recall"] is not None]
+    if scored:
+        best = max(scored, key=lambda s: (s["fact_recall"], -s["misleading_claims"], -s["reasoning_leaks"]))
+        fastest = min(scored, key=lambda s: s["latency_p50_s"])
+        lines += ["", f"**Most accurate:** {best['model']} ({best['fact_recall']:.0%} of reference facts).  ",
+                  f"**Fastest:** {fastest['model']} ({fastest['latency_p50_s']:.2f}s p50)."]
+
+    for result in report["results"]:
+        lines += ["", f"## {result['model']}"]
+        for r in result["runs"]:
+            lines += ["", f"### {r['prompt_id']}" + (f" (repeat {r['repeat'] + 1})" if report["repeats"] > 1 else "")]
+            if "error" in r:
+                lines.append(f"❌ {r['error']}")
+                continue
+            lines.append(f"Recall {r['fact_recall']:.0%} · TTFT {r['ttft_s']:.2f}s · {r['tokens_per_sec']:.1f} tok/s"
+                         + (" · ⚠️ reasoning leaked" if r["reasoning_leaked"] else ""))
+            if r["facts_missed"]:
+                lines.append(f"Missed: {'; '.join(r['facts_missed'])}")
+            if r["misleading"]:
+                lines.append(f"Misleading: {'; '.join(r['misleading'])}")
+            answer = r["answer"] if len(r["answer"]) <= 1200 else r["answer"][:1200] + " …"
+            lines += ["", "> " + answer.replace("\n", "\n> ")]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark several Ollama models on the same prompts.")
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS)
+    parser.add_argument("--prompts", default="benchmark_prompts.json")
+    parser.add_argument("--html-folder", default="html_mistral_folder", help="Source of {context}")
+    parser.add_argument("--keyword", default="Messi")
+    parser.add_argument("--context-chars", type=int, default=6000, help="Cap on extracted context")
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--parallel", type=int, default=None, help="Models run at once (default: all)")
+    parser.add_argument("--embeddings", action="store_true", help="Also match facts by embedding similarity")
+    parser.add_argument("--ollama-url", default=OLLAMA_URL)
+    parser.add_argument("--fake", action="store_true", help="Use a local fake Ollama server")
+    parser.add_argument("--out", default="Model_Comparison_Report", help="Writes <out>.md and <out>.json")
+    args = parser.parse_args()
+
+    from extract import relevant_text
+
+    with open(args.prompts, encoding="utf-8") as f:
+        prompts = json.load(f)
+    files = sorted(os.path.join(args.html_folder, n) for n in os.listdir(args.html_folder) if n.endswith(".html")) \
+        if os.path.isdir(args.html_folder) else []
+    context = relevant_text(files, [args.keyword], max_chars=args.context_chars)
+    semantic = SemanticMatcher() if args.embeddings else None
+    print(f"🔍 {len(args.models)} models × {len(prompts)} prompts, context {len(context):,} chars")
+
+    def run(base_url):
+        return run_benchmark(args.models, prompts, context, base_url, args.parallel, args.repeats, semantic)
+
+    if args.fake:
+        from stand_ins import FakeOllama
+        # Different speeds per model so the report has something to rank
+        delays = {m: 0.001 * (i + 1) for i, m in enumerate(args.models)}
+        with FakeOllama(token_delay=delays) as fake:
+            report = run(fake.base_url)
+    else:
+        report = run(args.ollama_url)
+
+    with open(args.out + ".json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    with open(args.out + ".md", "w", encoding="utf-8") as f:
+        f.write(markdown_report(report))
+
+    print(f"\n{'model':<20}{'recall':>8}{'ttft s':>8}{'tok/s':>8}{'p50 s':>8}{'mem GB':>8}")
+    for s in report["summary"]:
+        print(f"{s['model']:<20}{_fmt(s['fact_recall'], '.0%'):>8}{_fmt(s['ttft_p50_s'], '.2f'):>8}"
+              f"{_fmt(s['tokens_per_sec'], '.1f'):>8}{_fmt(s['latency_p50_s'], '.2f'):>8}{_fmt(s['memory_gb'], '.2f'):>8}")
+    print(f"✅ Report → {args.out}.md, {args.out}.json")
+
+
+if __name__ == "__main__":
+    main()
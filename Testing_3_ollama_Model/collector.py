@@ -0,0 +1,310 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ----------------------------
+# Concurrent, cached HTML collection
+# ----------------------------
+# Replaces the serial collect_raw_html of the test_*.ipynb notebooks:
+#   - one pooled requests.Session shared by a bounded thread pool
+#   - robots.txt fetched once per host (through the same session) and cached
+#   - a per-host politeness delay instead of sleeping after every download
+#   - a content-addressed disk cache: bodies stored by sha256, plus a url index with
+#     ETag / Last-Modified, so re-runs send conditional requests and a 304 reuses the body
+#
+#   from collector import collect_raw_html
+#   html_pages = collect_raw_html("Messi", num_results=5, folder_name="html_mistral_folder")
+#
+#   python collector.py Messi --num-results 5 --folder html_mistral_folder
+#   python collector.py --demo          # offline, against stand_ins.LocalSite
+
+USER_AGENT = "Mozilla/5.0"
+CACHE_DIR = ".html_cache"
+
+
+def sanitize_filename(url):
+    """Create a safe filename from a URL."""
+    filename = re.sub(r'\W+', '_', url)
+    return filename[:100] + ".html"
+
+
+def make_session(pool_size=16, retries=2):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+class RobotsCache:
+    """One RobotFileParser per scheme://host, fetched once through the shared session."""
+
+    def __init__(self, session, user_agent="*", timeout=10):
+        self.session = session
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self._parsers = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, host):
+        parser = RobotFileParser(f"{host}/robots.txt")
+        try:
+            response = self.session.get(f"{host}/robots.txt", timeout=self.timeout)
+        except requests.RequestException:
+            return None  # Safer to assume not allowed
+        if response.status_code in (401, 403):
+            parser.disallow_all = True
+        elif response.status_code >= 400:
+            parser.allow_all = True  # no robots.txt: everything allowed
+        else:
+            parser.parse(response.text.splitlines())
+        return parser
+
+    def allowed(self, url):
+        parsed = urlparse(url)
+        host = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            lock = self._locks.setdefault(host, threading.Lock())
+        with lock:  # concurrent URLs on one host wait for a single robots.txt fetch
+            if host not in self._parsers:
+                self._parsers[host] = self._fetch(host)
+        parser = self._parsers[host]
+        return parser is not None and parser.can_fetch(self.user_agent, url)
+
+
+class HostThrottle:
+    """Minimum delay between requests to the same host (replaces time.sleep(1) per page)."""
+
+    def __init__(self, delay=1.0):
+        self.delay = delay
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, 0.0))
+            self._next[host] = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class DiskCache:
+    """Bodies stored once by sha256 under objects/; index.json maps url -> digest + validators."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def entry(self, url):
+        with self._lock:
+            return self.index.get(url)
+
+    def read(self, url):
+        entry = self.entry(url)
+        if entry is None:
+            return None
+        with open(self._object_path(entry["sha256"]), "rb") as f:
+            return f.read()
+
+    def validators(self, url):
+        """Conditional-request headers for a cached url."""
+        entry = self.entry(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, body, headers):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):  # identical pages from different urls are stored once
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        with self._lock:
+            self.index[url] = {"sha256": digest, "etag": headers.get("ETag"),
+                               "last_modified": headers.get("Last-Modified"),
+                               "content_type": headers.get("Content-Type"), "fetched_at": time.time()}
+        return digest
+
+    def touch(self, url):
+        with self._lock:
+            self.index[url]["fetched_at"] = time.time()
+
+    def save(self):
+        with self._lock:
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.index, f, indent=1)
+            os.replace(tmp, self.index_path)
+
+
+class Collector:
+    def __init__(self, cache_dir=CACHE_DIR, max_workers=8, host_delay=1.0, timeout=10, session=None):
+        self.session = session or make_session(pool_size=max_workers)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.robots = RobotsCache(self.session, timeout=timeout)
+        self.throttle = HostThrottle(host_delay)
+        self.cache = DiskCache(cache_dir)
+        self.stats = {"downloaded": 0, "not_modified": 0, "disallowed": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def fetch(self, url):
+        """(url, html or None, status) where status is downloaded/not_modified/disallowed/failed."""
+        if not self.robots.allowed(url):
+            print(f"❌ Not allowed by robots.txt: {url}")
+            self._count("disallowed")
+            return url, None, "disallowed"
+        self.throttle.wait(url)
+        try:
+            response = self.session.get(url, headers=self.cache.validators(url), timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"🚫 Error fetching {url}: {e}")
+            self._count("failed")
+            return url, None, "failed"
+
+        if response.status_code == 304 and self.cache.entry(url):
+            self.cache.touch(url)
+            self._count("not_modified")
+            return url, self.cache.read(url).decode("utf-8", errors="replace"), "not_modified"
+        if response.status_code != 200:
+            print(f"⚠️ Status code {response.status_code}: {url}")
+            self._count("failed")
+            return url, None, "failed"
+        self.cache.store(url, response.content, response.headers)
+        self._count("downloaded")
+        return url, response.text, "downloaded"
+
+    def fetch_all(self, urls, limit=None):
+        """Fetch unique `urls` concurrently; stop once `limit` pages succeeded. Yields fetch() results."""
+        urls = list(dict.fromkeys(urls))
+        collected = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = iter(urls)
+            in_flight = []
+            # Keep at most max_workers requests running so over-fetched urls are not all downloaded
+            for url in pending:
+                in_flight.append(pool.submit(self.fetch, url))
+                if len(in_flight) >= self.max_workers:
+                    break
+            while in_flight:
+                result = in_flight.pop(0).result()
+                if result[1] is not None:
+                    collected += 1
+                    yield result
+                if limit is not None and collected >= limit:
+                    for future in in_flight:
+                        future.cancel()
+                    break
+                url = next(pending, None)
+                if url is not None:
+                    in_flight.append(pool.submit(self.fetch, url))
+        self.cache.save()
+
+    def close(self):
+        self.cache.save()
+        self.session.close()
+
+
+def collect_urls(urls, folder_name, num_results=None, collector=None):
+    """Fetch `urls` and write each page to folder_name like the notebooks did. Returns {url: file_path}."""
+    own = collector is None
+    collector = collector or Collector()
+    os.makedirs(folder_name, exist_ok=True)
+    url_to_file = {}
+    try:
+        for url, html, status in collector.fetch_all(urls, limit=num_results):
+            file_path = os.path.join(folder_name, sanitize_filename(url))
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(html)
+            url_to_file[url] = file_path
+            print(f"✅ Saved ({status}): {file_path}")
+    finally:
+        if own:
+            collector.close()
+    print(f"\n✅ Total collected: {len(url_to_file)}/{num_results or len(urls)} {collector.stats}")
+    return url_to_file
+
+
+def collect_raw_html(query, num_results=5, folder_name="html_ollama_folder", search_fn=None, **collector_kwargs):
+    """
+    Searches Google for the query, fetches raw HTML from allowed sites concurrently
+    (reusing cached downloads) and saves them in `folder_name`.
+    """
+    if search_fn is None:
+        from googlesearch import search as search_fn
+    search_results = list(search_fn(query, num_results=30))  # over-fetch
+    return collect_urls(search_results, folder_name, num_results, Collector(**collector_kwargs))
+
+
+def demo():
+    """Run the collector twice against a local site: the second run should be all 304s."""
+    from stand_ins import LocalSite
+
+    pages = {f"/player/{i}": f"<html><body><p>Messi page {i}</p></body></html>" for i in range(6)}
+    pages["/private/secret"] = "<html>hidden</html>"
+    with LocalSite(pages, disallow=["/private"]) as site:
+        urls = [site.url(path) for path in pages]
+        cache_dir = ".html_cache_demo"
+        for run in (1, 2):
+            collector = Collector(cache_dir=cache_dir, host_delay=0.0)
+            start = time.perf_counter()
+            collect_urls(urls, "html_demo_folder", collector=collector)
+            collector.close()
+            robots_fetches = sum(1 for _, path, _ in site.requests if path == "/robots.txt")
+            print(f"🔍 Run {run}: {time.perf_counter() - start:.2f}s, stats {collector.stats}, "
+                  f"robots.txt fetched {robots_fetches}x in total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect HTML pages for a search query.")
+    parser.add_argument("query", nargs="?", default="Messi")
+    parser.add_argument("--num-results", type=int, default=5)
+    parser.add_argument("--folder", default="html_ollama_folder")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--host-delay", type=float, default=1.0, help="Seconds between requests to one host")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--demo", action="store_true", help="Offline run against a local HTTP stand-in")
+    args = parser.parse_args()
+
+    if args.demo:
+        demo()
+        return
+    collect_raw_html(args.query, args.num_results, args.folder, max_workers=args.workers,
+                     host_delay=args.host_delay, cache_dir=args.cache_dir)
+
+
+if __name__ == "__main__":
+    main()
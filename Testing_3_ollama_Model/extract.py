@@ -0,0 +1,205 @@
+import argparse
+import hashlib
+import os
+import re
+from html.parser import HTMLParser
+
+# ----------------------------
+# Local HTML -> relevant text, before anything reaches the model
+# ----------------------------
+# The notebooks sent the raw HTML of every page and asked the model to strip the tags.
+# Here pages are fed in chunks to an incremental HTMLParser that drops boilerplate
+# (scripts, navigation, footers, cookie banners, link lists) and emits text blocks as they
+# close; blocks are split into sentences and only sentences mentioning the keyword(s) are
+# kept, with `context` neighbouring sentences, de-duplicated across pages.
+#
+#   from extract import relevant_text
+#   text = relevant_text(html_pages.values(), ["Messi"])     # file paths or raw HTML
+#   all_content = "Summarize the information about Messi:\n\n" + text
+#
+#   python extract.py html_mistral_folder --keyword Messi
+
+SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form",
+             "svg", "iframe", "template", "button", "select", "figure"}
+BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "ul", "ol", "table", "tr", "td", "th",
+              "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "dd", "dt", "br", "hr", "caption"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+# Matched against whole class/id tokens, split on - and _ ("site-footer", "cookie_banner")
+BOILERPLATE = re.compile(r"(?:^|[-_])(?:nav|navbar|navbox|menu|footer|sidebar|cookie|banner|advert|ads|promo|"
+                         r"share|social|breadcrumbs?|related|newsletter|subscribe|comments?|reflist|references|"
+                         r"toc|catlinks|hatnote)(?:[-_]|$)", re.IGNORECASE)
+# Page wrappers often carry theme/feature classes; never skip them by class
+STRUCTURAL_TAGS = {"html", "body", "main", "article"}
+CHUNK_SIZE = 64 * 1024
+
+
+class BlockExtractor(HTMLParser):
+    """Incremental parser: feed() HTML pieces, collect finished text blocks from `.blocks`."""
+
+    def __init__(self, min_words=5, max_link_density=0.5):
+        super().__init__(convert_charrefs=True)
+        self.min_words = min_words
+        self.max_link_density = max_link_density
+        self.blocks = []
+        self._parts = []
+        self._link_chars = 0
+        self._in_link = 0
+        self._skip_tag = None
+        self._skip_depth = 0
+
+    def _flush(self):
+        text = " ".join(" ".join(self._parts).split())
+        link_chars, self._parts, self._link_chars = self._link_chars, [], 0
+        if len(text.split()) < self.min_words:
+            return
+        if link_chars / len(text) > self.max_link_density:  # menus, "see also" lists
+            return
+        self.blocks.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag is not None:
+            if tag == self._skip_tag and tag not in VOID_TAGS:
+                self._skip_depth += 1
+            return
+        tokens = [t for key, value in attrs if key in ("class", "id", "role") and value for t in value.split()]
+        boilerplate = tag not in STRUCTURAL_TAGS and tag not in VOID_TAGS and any(BOILERPLATE.search(t) for t in tokens)
+        if tag in SKIP_TAGS or boilerplate:
+            self._flush()
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        elif tag == "a":
+            self._in_link += 1
+
+    def handle_endtag(self, tag):
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        elif tag == "a" and self._in_link:
+            self._in_link -= 1
+
+    def handle_data(self, data):
+        if self._skip_tag is not None or not data.strip():
+            return
+        self._parts.append(data)
+        if self._in_link:
+            self._link_chars += len(data.strip())
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def take(self):
+        blocks, self.blocks = self.blocks, []
+        return blocks
+
+
+def _read_chunks(source, chunk_size=CHUNK_SIZE):
+    """Raw HTML string, or a file path read piecewise."""
+    if "<" not in source[:1000] and os.path.exists(source):
+        with open(source, encoding="utf-8", errors="replace") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+    else:
+        for i in range(0, len(source), chunk_size):
+            yield source[i:i + chunk_size]
+
+
+def iter_blocks(source, **kwargs):
+    """Yield boilerplate-free text blocks of one page as the parser reaches them."""
+    parser = BlockExtractor(**kwargs)
+    for chunk in _read_chunks(source):
+        parser.feed(chunk)
+        yield from parser.take()
+    parser.close()
+    yield from parser.take()
+
+
+_ABBREVIATIONS = "".join(rf"(?<!\b{re.escape(a)}\.)" for a in ("Mr", "Mrs", "Dr", "St", "Jr", "Sr", "No", "vs", "c", "e.g", "i.e"))
+_SENTENCE_END = re.compile(r"(?<=[.!?])" + _ABBREVIATIONS + r"[\"'”’)\]]*\s+(?=[\"“(\[]?[A-Z0-9])")
+_CITATION = re.compile(r"\[\s*(?:\d+|[a-z]|citation needed|note \d+)\s*\]")
+
+
+def split_sentences(text):
+    text = _CITATION.sub("", text)
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+
+def keyword_windows(sentences, patterns, context=1):
+    """Sentences matching any pattern, plus `context` sentences on each side (ranges merged)."""
+    hits = [i for i, s in enumerate(sentences) if any(p.search(s) for p in patterns)]
+    ranges = []
+    for i in hits:
+        lo, hi = max(i - context, 0), min(i + context, len(sentences) - 1)
+        if ranges and lo <= ranges[-1][1] + 1:  # overlapping or adjacent: extend the previous window
+            ranges[-1][1] = max(ranges[-1][1], hi)
+        else:
+            ranges.append([lo, hi])
+    return [" ".join(sentences[lo:hi + 1]) for lo, hi in ranges]
+
+
+def relevant_passages(sources, keywords, context=1, min_words=5):
+    """Yield (source, passage) for every keyword window across all pages, skipping duplicates."""
+    patterns = [re.compile(rf"\b{re.escape(k)}\b", re.IGNORECASE) for k in keywords]
+    seen = set()
+    for source in sources:
+        sentences = [s for block in iter_blocks(source, min_words=min_words) for s in split_sentences(block)]
+        for passage in keyword_windows(sentences, patterns, context):
+            digest = hashlib.sha1(" ".join(passage.lower().split()).encode()).digest()
+            if digest not in seen:
+                seen.add(digest)
+                yield source, passage
+
+
+def relevant_text(sources, keywords, context=1, max_chars=None):
+    """Passages joined into prompt-ready text, optionally capped at `max_chars`."""
+    out, size = [], 0
+    for _, passage in relevant_passages(sources, keywords, context):
+        if max_chars is not None and size + len(passage) > max_chars:
+            break
+        out.append(passage)
+        size += len(passage) + 2
+    return "\n\n".join(out)
+
+
+def source_size(source):
+    return os.path.getsize(source) if "<" not in source[:1000] and os.path.exists(source) else len(source)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract keyword passages from saved HTML pages.")
+    parser.add_argument("inputs", nargs="+", help="HTML files or folders (e.g. html_mistral_folder)")
+    parser.add_argument("--keyword", action="append", default=None, help="Repeatable; default Messi")
+    parser.add_argument("--context", type=int, default=1, help="Neighbouring sentences to keep")
+    parser.add_argument("--max-chars", type=int, default=None)
+    parser.add_argument("-o", "--output", default=None)
+    args = parser.parse_args()
+
+    files = []
+    for path in args.inputs:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".html"))
+        else:
+            files.append(path)
+    text = relevant_text(files, args.keyword or ["Messi"], args.context, args.max_chars)
+    raw = sum(source_size(f) for f in files)
+    print(f"✅ {len(files)} pages, {raw / 1e6:.2f} MB of HTML → {len(text):,} chars "
+          f"({raw / max(len(text), 1):.0f}x smaller)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print("\n" + text[:2000])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ----------------------------
+# Local HTTP stand-ins for offline runs
+# ----------------------------
+# LocalSite serves a dict of {path: html} with robots.txt, ETag and Last-Modified, and
+# counts requests, so the collector can be exercised without touching the internet:
+#
+#   with LocalSite({"/messi": "<html>...</html>"}, disallow=["/private"]) as site:
+#       collect_urls([site.url("/messi")], folder="html_test_folder")
+#
+# FakeOllama answers /api/generate (streaming NDJSON or a single JSON body) with a
+# deterministic extract of the prompt, at a configurable per-model token rate, and
+# records the peak number of concurrent requests:
+#
+#   with FakeOllama(token_delay={"mistral": 0.002}) as ollama:
+#       OllamaClient(ollama.base_url).generate("mistral", "Summarize: ...")
+
+
+class LocalSite:
+    def __init__(self, pages, disallow=(), delay=0.0, port=0):
+        self.pages = dict(pages)
+        self.disallow = list(disallow)
+        self.delay = delay
+        self.requests = []  # (method, path, status) in arrival order
+        self.last_modified = formatdate(time.time(), usegmt=True)
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=b"", headers=None):
+                site.requests.append(("GET", self.path, status))
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if site.delay:
+                    time.sleep(site.delay)
+                if self.path == "/robots.txt":
+                    rules = "".join(f"Disallow: {path}\n" for path in site.disallow)
+                    return self._send(200, f"User-agent: *\n{rules}".encode(), {"Content-Type": "text/plain"})
+                if self.path not in site.pages:
+                    return self._send(404)
+                body = site.pages[self.path].encode("utf-8")
+                etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                headers = {"ETag": etag, "Last-Modified": site.last_modified,
+                           "Content-Type": "text/html; charset=utf-8"}
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, headers=headers)
+                since = self.headers.get("If-Modified-Since")
+                if since and "If-None-Match" not in self.headers and \
+                        parsedate_to_datetime(since) >= parsedate_to_datetime(site.last_modified):
+                    return self._send(304, headers=headers)
+                self._send(200, body, headers)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    def url(self, path="/"):
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+    def update(self, path, html):
+        """Change a page (new ETag and Last-Modified), as a real site would."""
+        self.pages[path] = html
+        self.last_modified = formatdate(time.time() + 1, usegmt=True)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def fake_answer(prompt, max_words=60):
+    """The first sentences of the prompt's material (after its first blank line), up to max_words."""
+    material = prompt.split("\n\n", 1)[-1]
+    sentences = re.split(r"(?<=[.!?])\s+", " ".join(material.split()))
+    words = []
+    for sentence in sentences:
+        if len(words) >= max_words:
+            break
+        words += sentence.split()
+    return " ".join(words[:max_words]) or "No content."
+
+
+class FakeOllama:
+    def __init__(self, token_delay=0.001, first_token_delay=0.01, responder=fake_answer, model_sizes=None,
+                 port=0):
+        self.token_delay = token_delay
+        self.model_sizes = model_sizes or {}  # bytes reported by /api/ps, default 1 GB
+        self.first_token_delay = first_token_delay
+        self.responder = responder
+        self.requests = []  # (model, prompt) in arrival order
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so pooled sessions reuse connections
+
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    return self._json(200, {"models": []})
+                if self.path == "/api/ps":
+                    with fake._lock:
+                        loaded = sorted({model for model, _ in fake.requests if model})
+                    size = lambda m: fake.model_sizes.get(m, 10 ** 9)
+                    return self._json(200, {"models": [{"name": m, "model": m, "size": size(m), "size_vram": 0}
+                                                       for m in loaded]})
+                self._json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path != "/api/generate":
+                    return self._json(404, {"error": "not found"})
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with fake._lock:
+                    fake.active += 1
+                    fake.max_active = max(fake.max_active, fake.active)
+                    fake.requests.append((request.get("model"), request.get("prompt", "")))
+                try:
+                    self._generate(request)
+                finally:
+                    with fake._lock:
+                        fake.active -= 1
+
+            def _generate(self, request):
+                model, prompt = request.get("model", ""), request.get("prompt", "")
+                delay = fake.token_delay.get(model, 0.001) if isinstance(fake.token_delay, dict) else fake.token_delay
+                tokens = [w + " " for w in fake.responder(prompt).split()]
+                start = time.perf_counter()
+                time.sleep(fake.first_token_delay)
+                stats = {"prompt_eval_count": len(prompt.split()), "eval_count": len(tokens)}
+
+                if not request.get("stream", True):
+                    time.sleep(delay * len(tokens))
+                    elapsed = time.perf_counter() - start
+                    return self._json(200, {"model": model, "response": "".join(tokens).strip(), "done": True,
+                                            "total_duration": int(elapsed * 1e9),
+                                            "eval_duration": int(delay * len(tokens) * 1e9), **stats})
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def chunk(payload):
+                    data = (json.dumps(payload) + "\n").encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+
+                eval_start = time.perf_counter()
+                for token in tokens:
+                    chunk({"model": model, "response": token, "done": False})
+                    time.sleep(delay)
+                elapsed = time.perf_counter() - start
+                chunk({"model": model, "response": "", "done": True, "total_duration": int(elapsed * 1e9),
+                       "eval_duration": int((time.perf_counter() - eval_start) * 1e9), **stats})
+                self.wfile.write(b"0\r\n\r\n")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
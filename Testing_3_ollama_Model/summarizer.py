@@ -0,0 +1,283 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from extract import split_sentences
+
+# ----------------------------
+# Map-reduce summarization over Ollama
+# ----------------------------
+# The notebooks posted one prompt of unbounded size with "stream": False. Here the text
+# is split into chunks that fit the model context, chunk summaries are requested in
+# parallel (bounded by `parallelism`) over one pooled session, and the summaries are
+# reduced - recursively, in groups, if they still do not fit - into the final answer,
+# which can be streamed token by token. Every model call is cached on disk under
+# sha256(model, prompt), so re-running only pays for chunks that changed.
+#
+#   python summarizer.py html_mistral_folder --keyword Messi --model mistral --parallelism 4
+#   python summarizer.py html_mistral_folder --fake          # offline, stand_ins.FakeOllama
+
+OLLAMA_URL = "http://localhost:11434"
+CACHE_DIR = ".summary_cache"
+CHARS_PER_TOKEN = 4
+
+MAP_PROMPT = ("Extract every fact about {topic} from the text below as a concise summary. "
+              "Ignore unrelated content. Do not include your reasoning.\n\n{text}")
+REDUCE_PROMPT = ("Combine these partial summaries about {topic} into one concise, non-repetitive "
+                 "summary. Do not include your reasoning.\n\n{text}")
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class OllamaClient:
+    """/api/generate over a pooled keep-alive session; safe to share between threads."""
+
+    def __init__(self, base_url=OLLAMA_URL, pool_size=8, timeout=600):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def generate(self, model, prompt, stream=False, on_token=None, options=None):
+        """Returns {"response", "ttft", "seconds", "eval_count", "eval_duration", ...}."""
+        payload = {"model": model, "prompt": prompt, "stream": stream}
+        if options:
+            payload["options"] = options
+        start = time.perf_counter()
+        response = self.session.post(f"{self.base_url}/api/generate", json=payload,
+                                     stream=stream, timeout=self.timeout)
+        response.raise_for_status()
+
+        if not stream:
+            result = response.json()
+            result["seconds"] = time.perf_counter() - start
+            result["ttft"] = result["seconds"]  # nothing arrives before the whole answer
+            return result
+
+        parts, ttft, final = [], None, {}
+        for line in response.iter_lines():
+            if not line:
+                continue
+            message = json.loads(line)
+            token = message.get("response", "")
+            if token:
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                parts.append(token)
+                if on_token:
+                    on_token(token)
+            if message.get("done"):
+                final = message
+                break
+        final.update(response="".join(parts), seconds=time.perf_counter() - start,
+                     ttft=ttft if ttft is not None else time.perf_counter() - start)
+        return final
+
+    def close(self):
+        self.session.close()
+
+
+class ResultCache:
+    """Model outputs on disk, one JSON file per sha256(model, prompt)."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model, prompt):
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, model, prompt):
+        path = os.path.join(self.directory, self.key(model, prompt) + ".json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)["response"]
+            with self._lock:
+                self.hits += 1
+            return result
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, model, prompt, response):
+        path = os.path.join(self.directory, self.key(model, prompt) + ".json")
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"model": model, "response": response}, f)
+        os.replace(tmp, path)
+
+
+def _fit_sentence(sentence, max_tokens):
+    """A sentence as pieces of at most ~max_tokens, cut between words (inside a word only if it is longer)."""
+    max_chars = max((max_tokens - 1) * CHARS_PER_TOKEN, 1)
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces, current = [], ""
+    for word in sentence.split():
+        while len(word) > max_chars:  # URLs, tables flattened into one token
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_chunks(text, max_tokens=1500, overlap=1):
+    """Sentence-aligned chunks of at most ~max_tokens, repeating `overlap` sentences at each boundary.
+
+    Sentences longer than max_tokens on their own are hard-split, so no chunk exceeds the budget.
+    """
+    sentences = [piece for paragraph in text.split("\n\n") for s in split_sentences(paragraph)
+                 for piece in _fit_sentence(s, max_tokens)]
+    chunks, current, size = [], [], 0
+    for sentence in sentences:
+        tokens = estimate_tokens(sentence)
+        if current and size + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current = current[-overlap:] if overlap else []
+            size = sum(estimate_tokens(s) for s in current)
+            # Drop the overlap when it would push the next chunk past the budget
+            while current and size + tokens > max_tokens:
+                size -= estimate_tokens(current.pop(0))
+        current.append(sentence)
+        size += tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class MapReduceSummarizer:
+    def __init__(self, client, model="mistral", parallelism=4, chunk_tokens=1500, cache=None,
+                 topic="Messi", options=None):
+        self.client = client
+        self.model = model
+        self.parallelism = parallelism
+        self.chunk_tokens = chunk_tokens
+        self.cache = cache
+        self.topic = topic
+        self.options = options
+
+    def _call(self, prompt, stream=False, on_token=None):
+        if self.cache is not None:
+            cached = self.cache.get(self.model, prompt)
+            if cached is not None:
+                if on_token:
+                    on_token(cached)
+                return cached
+        result = self.client.generate(self.model, prompt, stream=stream, on_token=on_token,
+                                      options=self.options)["response"]
+        if self.cache is not None:
+            self.cache.put(self.model, prompt, result)
+        return result
+
+    def _map(self, template, texts):
+        prompts = [template.format(topic=self.topic, text=text) for text in texts]
+        with ThreadPoolExecutor(max_workers=self.parallelism) as pool:
+            return list(pool.map(self._call, prompts))
+
+    def _group(self, summaries):
+        """Pack summaries into reduce inputs that each fit one context."""
+        groups, current, size = [], [], 0
+        for summary in summaries:
+            tokens = estimate_tokens(summary)
+            if current and size + tokens > self.chunk_tokens:
+                groups.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(summary)
+            size += tokens
+        if current:
+            groups.append("\n\n".join(current))
+        return groups
+
+    def summarize(self, text, stream=False, on_token=None):
+        """Final summary of `text`; with stream=True the last reduce is streamed to on_token."""
+        chunks = split_chunks(text, self.chunk_tokens)
+        if not chunks:
+            return ""
+        if len(chunks) == 1:
+            return self._call(MAP_PROMPT.format(topic=self.topic, text=chunks[0]), stream, on_token)
+
+        summaries = self._map(MAP_PROMPT, chunks)
+        groups = self._group(summaries)
+        while len(groups) > 1:  # tree reduction until one reduce prompt fits the context
+            reduced = self._group(self._map(REDUCE_PROMPT, groups))
+            if len(reduced) >= len(groups):  # summaries stopped shrinking: reduce what is left at once
+                groups = ["\n\n".join(reduced)]
+                break
+            groups = reduced
+        return self._call(REDUCE_PROMPT.format(topic=self.topic, text=groups[0]), stream, on_token)
+
+
+def main():
+    from extract import relevant_text
+
+    parser = argparse.ArgumentParser(description="Map-reduce summarization with Ollama.")
+    parser.add_argument("inputs", nargs="+", help="HTML/text files or folders")
+    parser.add_argument("--keyword", default="Messi")
+    parser.add_argument("--model", default="mistral")
+    parser.add_argument("--ollama-url", default=OLLAMA_URL)
+    parser.add_argument("--parallelism", type=int, default=4)
+    parser.add_argument("--chunk-tokens", type=int, default=1500)
+    parser.add_argument("--no-stream", action="store_true")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--fake", action="store_true", help="Use a local fake Ollama server")
+    args = parser.parse_args()
+
+    files = []
+    for path in args.inputs:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, n) for n in os.listdir(path) if n.endswith((".html", ".txt")))
+        else:
+            files.append(path)
+    text = relevant_text(files, [args.keyword])
+
+    def run(base_url):
+        client = OllamaClient(base_url, pool_size=args.parallelism)
+        summarizer = MapReduceSummarizer(client, args.model, args.parallelism, args.chunk_tokens,
+                                         None if args.no_cache else ResultCache(), topic=args.keyword)
+        print(f"🔍 {len(split_chunks(text, args.chunk_tokens))} chunks, {args.parallelism} parallel requests")
+        start = time.perf_counter()
+        print("\nAnswer: ", end="", flush=True)
+        answer = summarizer.summarize(text, stream=not args.no_stream,
+                                      on_token=lambda t: print(t, end="", flush=True))
+        if args.no_stream:
+            print(answer, end="")
+        print(f"\n\n✅ {time.perf_counter() - start:.2f}s", end="")
+        if summarizer.cache is not None:
+            print(f" (cache {summarizer.cache.hits} hits / {summarizer.cache.misses} misses)", end="")
+        print()
+        client.close()
+
+    if args.fake:
+        from stand_ins import FakeOllama
+        with FakeOllama() as fake:
+            run(fake.base_url)
+            print(f"🔍 Fake server: {len(fake.requests)} requests, peak concurrency {fake.max_active}")
+    else:
+        run(args.ollama_url)
+
+
+if __name__ == "__main__":
+    main()
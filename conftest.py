@@ -0,0 +1,2 @@
+# load_test.py is a CLI load generator whose name happens to match pytest's *_test.py pattern
+collect_ignore = ["Email_Spam_Classifier/load_test.py"]
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+
+# ----------------------------
+# Shared model registry for the Streamlit apps
+# ----------------------------
+# Streamlit re-runs app.py on every interaction, but imported modules stay in sys.modules,
+# so anything kept here is loaded once per process instead of once per rerun. Each model
+# is warmed up with a dummy inference right after loading (the first call pays for graph
+# tracing / lazy allocation) and its load and warm-up times are kept for display.
+#
+# Apps live in their own folders, so they import this (once, at module top) with:
+#   REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+#   if REPO_ROOT not in sys.path:
+#       sys.path.append(REPO_ROOT)
+#   from model_registry import get_model, model_metrics
+
+_models = {}
+_metrics = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _lock_for(name):
+    with _registry_lock:
+        return _locks.setdefault(name, threading.Lock())
+
+
+def get_model(name, loader, warmup=None):
+    """Return the model registered as `name`, loading (and warming up) on first use.
+
+    `loader()` builds the model; `warmup(model)` runs one dummy inference.
+    """
+    if name in _models:
+        return _models[name]
+    with _lock_for(name):
+        if name in _models:  # another session loaded it while we waited
+            return _models[name]
+        start = time.perf_counter()
+        model = loader()
+        load_seconds = time.perf_counter() - start
+
+        warmup_seconds = None
+        if warmup is not None:
+            start = time.perf_counter()
+            warmup(model)
+            warmup_seconds = time.perf_counter() - start
+
+        _metrics[name] = {
+            "load_seconds": round(load_seconds, 3),
+            "first_inference_seconds": None if warmup_seconds is None else round(warmup_seconds, 3),
+            "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "pid": os.getpid(),
+        }
+        _models[name] = model
+        return model
+
+
+def model_metrics(name=None):
+    return dict(_metrics.get(name, {})) if name else {k: dict(v) for k, v in _metrics.items()}
+
+
+def clear(name=None):
+    """Forget a model (or all), e.g. after the artifact on disk was retrained."""
+    with _registry_lock:
+        for key in [name] if name else list(_models):
+            _models.pop(key, None)
+            _metrics.pop(key, None)
+
+
+# ---- loaders ----
+def joblib_loader(path, mmap=True):
+    """joblib.load with numpy arrays memory-mapped (shared page cache, faster cold start)."""
+    def load():
+        import joblib
+        return joblib.load(path, mmap_mode="r" if mmap else None)
+    return load
+
+
+def keras_loader(path):
+    """Keras model without the optimizer/training graph, which inference never needs."""
+    def load():
+        import tensorflow as tf
+        return tf.keras.models.load_model(path, compile=False)
+    return load
+
+
+def file_size_mb(path):
+    return round(os.path.getsize(path) / 1e6, 2) if os.path.exists(path) else None